@@ -0,0 +1,59 @@
+"""
+Measures the search latency of `IVFIndex` at 100k items, and its recall of
+the exact top N found by scoring every item.
+
+    python -m benchmarks.ann
+"""
+
+import time
+
+import numpy as np
+
+from recommendation_system.candidate_layer.ivf import IVFIndex
+
+ITEMS = 100000
+DIMENSIONS = 64
+CLUSTERS = 200
+QUERIES = 500
+TOP_N = 10
+
+
+def main():
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((CLUSTERS, DIMENSIONS), dtype=np.float32)
+    vectors = centers[rng.integers(0, CLUSTERS, ITEMS)] + 0.3 * rng.standard_normal(
+        (ITEMS, DIMENSIONS), dtype=np.float32
+    )
+    ids = [str(i) for i in range(ITEMS)]
+    queries = vectors[rng.integers(0, ITEMS, QUERIES)]
+
+    start = time.perf_counter()
+    index = IVFIndex.build(ids, vectors)
+    print(f"build: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    results = [index.search(query, TOP_N) for query in queries]
+    search_time = (time.perf_counter() - start) / QUERIES
+    print(f"search: {search_time * 1000:.3f}ms per query")
+
+    start = time.perf_counter()
+    exact = [np.argpartition(-(vectors @ query), TOP_N)[:TOP_N] for query in queries]
+    exact_time = (time.perf_counter() - start) / QUERIES
+    print(f"exact search: {exact_time * 1000:.3f}ms per query")
+
+    recall = np.mean(
+        [
+            len({item_id for item_id, _ in result} & {str(i) for i in truth}) / TOP_N
+            for result, truth in zip(results, exact)
+        ]
+    )
+    print(f"recall@{TOP_N}: {recall:.3f}")
+
+    start = time.perf_counter()
+    for i in range(100):
+        index.add([f"new {i}"], rng.standard_normal(DIMENSIONS, dtype=np.float32))
+    print(f"insert: {(time.perf_counter() - start) * 10:.3f}ms per item")
+
+
+if __name__ == "__main__":
+    main()
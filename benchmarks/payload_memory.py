@@ -0,0 +1,96 @@
+"""
+Compares the memory allocated by the slotted payload classes, rendered and
+frozen, with the classes as they were before `__slots__`, which keep a
+per-instance `__dict__`. Each carousel is rendered with `to_dict` and its
+dicts kept, as a broadcast does until the messages are sent.
+
+    python -m benchmarks.payload_memory
+"""
+
+import gc
+import tracemalloc
+import types
+
+from fbmessenger import elements, quick_replies
+
+CAROUSELS = 10000
+
+
+class DictPayload(object):
+    """Base of the payload classes before `__slots__` and caching."""
+
+    # not stored, the classes before caching had no such attribute
+    _rendered_at = property(lambda self: None, lambda self, value: None)
+
+    def to_dict(self):
+        return self._render()
+
+
+def unslotted(cls):
+    namespace = {
+        name: value
+        for name, value in vars(cls).items()
+        if name not in ("__slots__", "__dict__", "__weakref__")
+        and not isinstance(value, types.MemberDescriptorType)
+    }
+    return type(cls.__name__, (DictPayload,), namespace)
+
+
+def build(Text, Button, Element, QuickReply, QuickReplies):
+    carousels = []
+    for i in range(CAROUSELS):
+        buttons = [
+            Button(
+                button_type="web_url", title="View Website", url="https://tw.pycon.org"
+            ),
+            Button(button_type="postback", title="Like", payload=str(i)),
+        ]
+        element = Element(title="Talk {}".format(i), subtitle="R1", buttons=buttons)
+        qrs = QuickReplies([QuickReply(title="More", payload="MORE")])
+        carousels.append((element, Text("Hi", quick_replies=qrs)))
+    return carousels
+
+
+def measure(classes, freeze=False):
+    gc.collect()
+    tracemalloc.start()
+    carousels = build(*classes)
+    if freeze:
+        rendered = [
+            (element.freeze().to_dict(), text.freeze().to_dict())
+            for element, text in carousels
+        ]
+    else:
+        rendered = [(element.to_dict(), text.to_dict()) for element, text in carousels]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del carousels, rendered
+    return size
+
+
+def main():
+    slotted = (
+        elements.Text,
+        elements.Button,
+        elements.Element,
+        quick_replies.QuickReply,
+        quick_replies.QuickReplies,
+    )
+    with_dict = tuple(unslotted(cls) for cls in slotted)
+
+    dict_size = measure(with_dict)
+    print("{} carousels, rendered".format(CAROUSELS))
+    print("{:<18}{:>12,} bytes".format("__dict__", dict_size))
+    for name, size in (
+        ("__slots__", measure(slotted)),
+        ("__slots__ frozen", measure(slotted, freeze=True)),
+    ):
+        print(
+            "{:<18}{:>12,} bytes  {:>+6.1%}".format(
+                name, size, float(size) / dict_size - 1
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compares ranking candidates with `EmbeddingRankingModel`, one NumPy
+matrix-vector product and `argpartition`, against scoring and sorting the
+candidate dicts in pure Python. At 100k candidates most of the NumPy time
+is spent mapping the candidate dicts to matrix rows.
+
+    python -m benchmarks.ranking
+"""
+
+import random
+import time
+
+import numpy as np
+
+from recommendation_system.ranking_layer.embedding import EmbeddingRankingModel
+
+DIMENSIONS = 64
+TOP_K = 10
+REPEAT = 5
+
+
+def python_rank(candidates, embeddings, user_vector, top_k):
+    scored = [
+        (sum(a * b for a, b in zip(embeddings[c["url"]], user_vector)), c)
+        for c in candidates
+    ]
+    scored.sort(key=lambda pair: pair[0], reverse=True)
+    return [c for _, c in scored[:top_k]]
+
+
+def best_of(function):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for size in (10000, 100000):
+        ids = [f"https://tw.pycon.org/items/{i}" for i in range(size)]
+        matrix = rng.standard_normal((size, DIMENSIONS), dtype=np.float32)
+        embeddings = dict(zip(ids, matrix.tolist()))
+        user_vector = rng.standard_normal(DIMENSIONS, dtype=np.float32)
+        candidates = [{"url": item_id} for item_id in random.sample(ids, size)]
+
+        model = EmbeddingRankingModel(ids, matrix, top_k=TOP_K)
+        features = {"vectors": user_vector}
+        python_vector = user_vector.tolist()
+
+        numpy_result = model.rank(candidates, features)
+        python_result = python_rank(candidates, embeddings, python_vector, TOP_K)
+        assert [c["url"] for c in numpy_result] == [c["url"] for c in python_result]
+
+        numpy_time = best_of(lambda: model.rank(candidates, features))
+        python_time = best_of(
+            lambda: python_rank(candidates, embeddings, python_vector, TOP_K)
+        )
+        print(
+            f"{size} candidates: numpy {numpy_time * 1000:.1f}ms, "
+            f"pure python {python_time * 1000:.1f}ms "
+            f"({python_time / numpy_time:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
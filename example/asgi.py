@@ -0,0 +1,32 @@
+import os
+
+import uvicorn
+from fbmessenger.asgi import WebhookApp
+
+from main import Messenger, start_recommendation_system
+
+
+class App(WebhookApp):
+    def startup(self):
+        start_recommendation_system()
+        super(App, self).startup()
+
+
+messenger = Messenger(os.getenv("FB_PAGE_TOKEN"))
+app = App(
+    messenger,
+    verify_token=os.getenv("FB_VERIFY_TOKEN"),
+    app_secret=os.getenv("FB_APP_SECRET"),
+    workers=int(os.getenv("WEBHOOK_THREADS", "8")),
+    drain_timeout=int(os.getenv("WEBHOOK_DRAIN_TIMEOUT", "30")),
+)
+
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "asgi:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        timeout_graceful_shutdown=int(os.getenv("WEBHOOK_DRAIN_TIMEOUT", "30")),
+    )
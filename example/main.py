@@ -31,6 +31,9 @@ from fbmessenger.thread_settings import (
 from flask import Flask, request
 from google.api_core.exceptions import InvalidArgument
 from google.cloud import bigquery
+from recommendation_system.carousel import render_carousel
+from recommendation_system.experiments import experiments
+from recommendation_system.main import RecommendationSystem
 
 
 def get_button(ratio):
@@ -52,6 +55,16 @@ def get_element(btn):
     )
 
 
+def start_recommendation_system():
+    """
+    Loads the experiment definitions and the models they use before the
+    first message, and keeps reloading the definitions in the background
+    """
+    experiments.start()
+    for experiment_config in experiments.configs():
+        RecommendationSystem.preload_models(experiment_config)
+
+
 def process_message(message):
     app.logger.debug("Message received: {}".format(message))
 
@@ -116,8 +129,11 @@ class Messenger(BaseMessenger):
     def message(self, message):
         action = process_message(message)
         res = self.send(action, "RESPONSE")
-        generic_resp = self.send_generic_template("placeholder_of_payload")
-        app.logger.debug(f"Generic Response: {generic_resp}")
+        recommendations = RecommendationSystem.recommend(self.get_user_id())
+        carousel = render_carousel(recommendations)
+        if carousel is not None:
+            generic_resp = self.send_generic_template(carousel)
+            app.logger.debug(f"Generic Response: {generic_resp}")
         app.logger.debug("Response: {}".format(res))
 
     def delivery(self, message):
@@ -145,13 +161,6 @@ class Messenger(BaseMessenger):
         pass
 
     def init_bot(self):
-        self.add_whitelisted_domains("https://facebook.com/")
-        greeting = GreetingText(text="Welcome to the fbmessenger bot demo.")
-        self.set_messenger_profile(greeting.to_dict())
-
-        get_started = GetStartedButton(payload="start")
-        self.set_messenger_profile(get_started.to_dict())
-
         menu_item_1 = PersistentMenuItem(
             item_type="postback",
             title="Help",
@@ -162,10 +171,17 @@ class Messenger(BaseMessenger):
             title="Messenger Docs",
             url="https://developers.facebook.com/docs/messenger-platform",
         )
-        persistent_menu = PersistentMenu(menu_items=[menu_item_1, menu_item_2])
+        profile = MessengerProfile(
+            greetings=[GreetingText(text="Welcome to the fbmessenger bot demo.")],
+            get_started=GetStartedButton(payload="start"),
+            persistent_menus=[PersistentMenu(menu_items=[menu_item_1, menu_item_2])],
+            whitelisted_domains=["https://facebook.com/"],
+        )
 
-        res = self.set_messenger_profile(persistent_menu.to_dict())
-        app.logger.debug("Response: {}".format(res))
+        changes = self.sync_messenger_profile(
+            profile, cache=os.getenv("FB_PROFILE_CACHE", ".messenger_profile.json")
+        )
+        app.logger.debug("Updated profile fields: {}".format(sorted(changes)))
 
 
 app = Flask(__name__)
@@ -214,7 +230,7 @@ def webhook():
         except Exception as e:
             print(e)
         try:
-            messenger.send(
+            messenger.send_split(
                 {"text": reply}, "RESPONSE", notification_type="REGULAR", timeout=4
             )
         except Exception as e:
@@ -261,4 +277,5 @@ def upload_message_to_bigquery(json: dict):
 
 
 if __name__ == "__main__":
+    start_recommendation_system()
     app.run(host="0.0.0.0")
@@ -3,9 +3,16 @@ import abc
 import logging
 import hashlib
 import hmac
+import threading
 import six
 import requests
 
+from . import schema
+from .broadcast import Broadcast
+from .encoding import JSON_HEADERS, PreparedMessage
+from .profile_sync import ProfileSync
+from .splitting import split_message
+
 __version__ = "6.0.0"
 
 logger = logging.getLogger(__name__)
@@ -34,6 +41,7 @@ class MessengerClient(object):
             session
             api_version
             app_secret
+            rate_limiter
         """
 
         self.page_access_token = page_access_token
@@ -43,6 +51,7 @@ class MessengerClient(object):
             api_version=self.api_version
         )
         self.app_secret = kwargs.get("app_secret")
+        self.rate_limiter = kwargs.get("rate_limiter")
 
     @property
     def auth_args(self):
@@ -75,6 +84,17 @@ class MessengerClient(object):
         )
         return r.json()
 
+    def validate_message_types(self, messaging_type, notification_type):
+        if messaging_type not in self.MESSAGING_TYPES:
+            raise ValueError(
+                "`{}` is not a valid `messaging_type`".format(messaging_type)
+            )
+
+        if notification_type not in self.NOTIFICATION_TYPES:
+            raise ValueError(
+                "`{}` is not a valid `notification_type`".format(notification_type)
+            )
+
     def send(
         self,
         payload,
@@ -84,15 +104,20 @@ class MessengerClient(object):
         timeout=None,
         tag=None,
     ):
-        if messaging_type not in self.MESSAGING_TYPES:
-            raise ValueError(
-                "`{}` is not a valid `messaging_type`".format(messaging_type)
-            )
+        """
+        @required:
+            payload: message dict, payload object or encoded JSON bytes
+            recipient_id
+        """
+        self.validate_message_types(messaging_type, notification_type)
 
-        if notification_type not in self.NOTIFICATION_TYPES:
-            raise ValueError(
-                "`{}` is not a valid `notification_type`".format(notification_type)
+        if hasattr(payload, "to_json_bytes"):
+            payload = payload.to_json_bytes()
+        if isinstance(payload, bytes):
+            prepared = PreparedMessage(
+                payload, messaging_type, notification_type, tag=tag
             )
+            return self.send_prepared(prepared, recipient_id, timeout=timeout)
 
         body = {
             "messaging_type": messaging_type,
@@ -106,6 +131,7 @@ class MessengerClient(object):
         if tag:
             body["tag"] = tag
 
+        self.throttle()
         r = self.session.post(
             "{graph_url}/me/messages".format(graph_url=self.graph_url),
             params=self.auth_args,
@@ -114,7 +140,63 @@ class MessengerClient(object):
         )
         return r
 
+    def send_split(self, payload, recipient_id, **kwargs):
+        """
+        Sends a message which may be over the Messenger limits as several
+        messages, see `splitting.split_message`. Returns the responses.
+
+        @required:
+            payload: payload object, message dict or list of them
+            recipient_id
+        @optional:
+            Same as `send`
+        """
+        if not isinstance(payload, list):
+            payload = [payload]
+        return [
+            self.send(message, recipient_id, **kwargs)
+            for item in payload
+            for message in split_message(item)
+        ]
+
+    def prepare(
+        self,
+        payload,
+        messaging_type="RESPONSE",
+        notification_type="REGULAR",
+        tag=None,
+        validation=None,
+    ):
+        """
+        Encodes `payload` once for sending to many recipients with
+        `send_prepared`. The message is checked against the Messenger limits
+        using the `schema` mode given by `validation`, unless it is already
+        encoded or a `ParameterizedMessage`.
+        """
+        self.validate_message_types(messaging_type, notification_type)
+        if hasattr(payload, "to_dict"):
+            payload = payload.to_dict()
+        if isinstance(payload, dict):
+            payload = schema.validate(payload, validation)
+        return PreparedMessage(payload, messaging_type, notification_type, tag=tag)
+
+    def send_prepared(self, prepared, recipient_id, timeout=None, values=None):
+        """
+        @optional:
+            values: placeholder values of a prepared `ParameterizedMessage`
+        """
+        self.throttle()
+        r = self.session.post(
+            "{graph_url}/me/messages".format(graph_url=self.graph_url),
+            params=self.auth_args,
+            data=prepared.body(recipient_id, values),
+            headers=JSON_HEADERS,
+            timeout=timeout,
+        )
+        return r
+
     def send_action(self, sender_action, recipient_id, timeout=None):
+        self.throttle()
         r = self.session.post(
             "{graph_url}/me/messages".format(graph_url=self.graph_url),
             params=self.auth_args,
@@ -129,111 +211,23 @@ class MessengerClient(object):
         return r.json()
 
     def send_generic_template(self, payload, recipient_id, timeout=None):
+        """
+        @required:
+            payload: a `GenericTemplate` or its rendered dict
+            recipient_id
+        """
+        if hasattr(payload, "to_dict"):
+            payload = payload.to_dict()
+
+        self.throttle()
         r = self.session.post(
-            f"{self.graph_url}/me/messages",
+            "{graph_url}/me/messages".format(graph_url=self.graph_url),
             params=self.auth_args,
             json={
                 "recipient": {"id": recipient_id},
-                "message": {
-                    "attachment": {
-                        "type": "template",
-                        "payload": {
-                            "template_type": "generic",
-                            "elements": [
-                                {
-                                    "title": "2021 PyCon TW x PyHug Meetup",
-                                    "image_url": "https://pbs.twimg.com/media/E_Skh8MVQAUmPHm.jpg",
-                                    "subtitle": "PyHug 簡介： 歡迎來到 PyHUG。我們是一群活動於新竹周邊的 Python 程式員。 我們會定期舉辦技術討論與程式設計的聚會。非常歡迎你加入我們！",
-                                    "default_action": {
-                                        "type": "web_url",
-                                        "url": "https://www.youtube.com/watch?v=S_1WBzXFyBs&t=3752s",
-                                        "webview_height_ratio": "tall",
-                                    },
-                                    "buttons": [
-                                        {
-                                            "type": "web_url",
-                                            "url": "https://www.youtube.com/watch?v=S_1WBzXFyBs&t=3752s",
-                                            "title": "View Website",
-                                        },
-                                        {
-                                            "type": "postback",
-                                            "title": "Like",
-                                            "payload": "https://www.youtube.com/watch?v=S_1WBzXFyBs&t=3752s",
-                                        },
-                                    ],
-                                },
-                                {
-                                    "title": "#7 | FAANG 工作環境跟外面有什麼不一樣？想進入 FAANG 就要聽這集！- Kir Chou",
-                                    "image_url": "https://i.imgur.com/GrMYBUa.png",
-                                    "subtitle": "這次邀請到的來賓是正在日本 Google 工作的 Kir 跟我們分享他在兩間 FAANG 工作過的經驗。想知道 Kir 在 FAANG 擔任軟體工程師的時候怎麼使用 Python 以及在公司內部推動重要的專案？另外，聽說他沒有刷題就加入 FAANG？！Wow 懶得刷題的聽眾快來聽，這集聽到賺到！PyCast 終於回歸拉！主持人在今年大會過後忙到被 👻 抓走沒時間錄新節目QQ為了讓 PyCast 再次偉大，邀請 Apple Podcast 的聽眾動動手指給我們五星跟留言建議🙏🏼🙏🏼🙏🏼#faang #japan #swe #makepycastgreatagain",
-                                    "default_action": {
-                                        "type": "web_url",
-                                        "url": "https://open.firstory.me/story/ckxnh7hxq2s3s0966ghtw3qzq",
-                                        "webview_height_ratio": "tall",
-                                    },
-                                    "buttons": [
-                                        {
-                                            "type": "web_url",
-                                            "url": "https://open.firstory.me/story/ckxnh7hxq2s3s0966ghtw3qzq",
-                                            "title": "View Website",
-                                        },
-                                        {
-                                            "type": "postback",
-                                            "title": "Like",
-                                            "payload": "https://www.youtube.com/watch?v=S_1WBzXFyBs&t=3752s",
-                                        },
-                                    ],
-                                },
-                                {
-                                    "title": "贊助商 - Berry AI",
-                                    "image_url": "https://i.imgur.com/ktvzhsu.jpg",
-                                    "subtitle": "Berry AI 是一間位於台北的 AI 新創，致力於運用電腦視覺技術幫助速食業者蒐集數據，改善現有營運流程。技術團隊由一群充滿熱情的 AI 及軟體工程師組成，分別來自海內外知名學術機構與大型科技公司。此外，我們得到台灣上市公司飛捷科技的注資與支持，該公司擁有多年為大型企業落地工業電腦的經驗，提供穩定的資金來源與客戶關係。如今，Berry AI 已與數間全球 Top-10 速食業者展開合作，業務與團隊都迅速擴張中。欲了解更多訊息，請瀏覽 berry-ai.com。",
-                                    "default_action": {
-                                        "type": "web_url",
-                                        "url": "https://tw.pycon.org/2021/zh-hant",
-                                        "webview_height_ratio": "tall",
-                                    },
-                                    "buttons": [
-                                        {
-                                            "type": "web_url",
-                                            "url": "https://tw.pycon.org/2021/zh-hant",
-                                            "title": "View Website",
-                                        },
-                                        {
-                                            "type": "postback",
-                                            "title": "Like",
-                                            "payload": "https://www.youtube.com/watch?v=S_1WBzXFyBs&t=3752s",
-                                        },
-                                    ],
-                                },
-                                {
-                                    "title": "他媽的給我買票喔！",
-                                    "image_url": "https://i.imgur.com/WYiNl3z.png",
-                                    "subtitle": "公道價八萬一",
-                                    "default_action": {
-                                        "type": "web_url",
-                                        "url": "https://pycontw.kktix.cc/events/2021-individual",
-                                        "webview_height_ratio": "tall",
-                                    },
-                                    "buttons": [
-                                        {
-                                            "type": "web_url",
-                                            "url": "https://pycontw.kktix.cc/events/2021-individual",
-                                            "title": "View Website",
-                                        },
-                                        {
-                                            "type": "postback",
-                                            "title": "Like",
-                                            "payload": "https://www.youtube.com/watch?v=S_1WBzXFyBs&t=3752s",
-                                        },
-                                    ],
-                                },
-                            ],
-                        },
-                    }
-                },
+                "message": payload,
             },
-            timeout=3,
+            timeout=timeout,
         )
         return r.json()
 
@@ -245,6 +239,16 @@ class MessengerClient(object):
         )
         return r.json()
 
+    def get_messenger_profile(self, fields, timeout=None):
+        params = {"fields": ",".join(fields)}
+        params.update(self.auth_args)
+        r = self.session.get(
+            "{graph_url}/me/messenger_profile".format(graph_url=self.graph_url),
+            params=params,
+            timeout=timeout,
+        )
+        return r.json()
+
     def set_messenger_profile(self, data, timeout=None):
         r = self.session.post(
             "{graph_url}/me/messenger_profile".format(graph_url=self.graph_url),
@@ -331,6 +335,10 @@ class MessengerClient(object):
         )
         return r.json()
 
+    def throttle(self):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
     def generate_appsecret_proof(self):
         """
         @outputs:
@@ -346,14 +354,22 @@ class MessengerClient(object):
 class BaseMessenger(object):
     __metaclass__ = abc.ABCMeta
 
-    last_message = {}
-
-    def __init__(self, page_access_token, app_secret=None):
+    def __init__(self, page_access_token, app_secret=None, client=None):
+        self._local = threading.local()
         self.page_access_token = page_access_token
         self.app_secret = app_secret
-        self.client = MessengerClient(
-            self.page_access_token, app_secret=self.app_secret
-        )
+        if client is None:
+            client = MessengerClient(self.page_access_token, app_secret=self.app_secret)
+        self.client = client
+
+    @property
+    def last_message(self):
+        # Kept per thread so events can be handled concurrently
+        return getattr(self._local, "last_message", {})
+
+    @last_message.setter
+    def last_message(self, message):
+        self._local.last_message = message
 
     @abc.abstractmethod
     def account_linking(self, message):
@@ -418,6 +434,23 @@ class BaseMessenger(object):
             tag=tag,
         )
 
+    def send_split(
+        self,
+        payload,
+        messaging_type="RESPONSE",
+        notification_type="REGULAR",
+        timeout=None,
+        tag=None,
+    ):
+        return self.client.send_split(
+            payload,
+            self.get_user_id(),
+            messaging_type=messaging_type,
+            notification_type=notification_type,
+            timeout=timeout,
+            tag=tag,
+        )
+
     def send_generic_template(
         self,
         payload,
@@ -429,6 +462,9 @@ class BaseMessenger(object):
             timeout=timeout,
         )
 
+    def broadcast(self, payload, recipients, **kwargs):
+        return Broadcast(self.client, payload, **kwargs).run(recipients)
+
     def send_action(self, sender_action, timeout=None):
         return self.client.send_action(
             sender_action, self.get_user_id(), timeout=timeout
@@ -443,6 +479,11 @@ class BaseMessenger(object):
     def set_messenger_profile(self, data, timeout=None):
         return self.client.set_messenger_profile(data, timeout=timeout)
 
+    def sync_messenger_profile(self, profile, cache=None, force=False, timeout=None):
+        return ProfileSync(self.client, cache=cache).sync(
+            profile, force=force, timeout=timeout
+        )
+
     def delete_get_started(self, timeout=None):
         return self.client.delete_get_started(timeout=timeout)
 
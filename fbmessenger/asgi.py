@@ -0,0 +1,193 @@
+from __future__ import absolute_import
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from six.moves.urllib.parse import parse_qs
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+DEFAULT_DRAIN_TIMEOUT = 30
+DEFAULT_MAX_BODY_SIZE = 1024 * 1024
+
+SIGNATURE_HEADER = b"x-hub-signature-256"
+
+
+class WebhookApp(object):
+    """
+    ASGI application serving the Messenger webhook for a `BaseMessenger`.
+
+    Verification, parsing and dispatch run on a thread pool so the event loop
+    only moves bytes around. Webhook events are acknowledged as soon as they
+    are parsed and handled in the background; on lifespan shutdown the app
+    stops accepting events and waits for the in-flight ones to finish.
+
+    Run it with any ASGI server, e.g.
+
+        uvicorn --workers 4 myapp:app
+    """
+
+    def __init__(self, messenger, verify_token, **kwargs):
+        """
+        @required:
+            messenger
+            verify_token
+        @optional:
+            app_secret
+            path
+            workers
+            drain_timeout
+            max_body_size
+        """
+        self.messenger = messenger
+        self.verify_token = verify_token
+        self.app_secret = kwargs.get(
+            "app_secret", getattr(messenger, "app_secret", None)
+        )
+        self.path = kwargs.get("path", "/webhook")
+        self.workers = kwargs.get("workers", DEFAULT_WORKERS)
+        self.drain_timeout = kwargs.get("drain_timeout", DEFAULT_DRAIN_TIMEOUT)
+        self.max_body_size = kwargs.get("max_body_size", DEFAULT_MAX_BODY_SIZE)
+
+        self.executor = None
+        self.draining = False
+        self._pending = set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self.http(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            event = await receive()
+            if event["type"] == "lifespan.startup":
+                self.startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif event["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def startup(self):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="fbmessenger-webhook"
+            )
+        self.draining = False
+
+    async def shutdown(self):
+        self.draining = True
+        if self._pending:
+            logger.info("Draining %d pending webhook events.", len(self._pending))
+            _, not_done = await asyncio.wait(
+                list(self._pending), timeout=self.drain_timeout
+            )
+            if not_done:
+                logger.warning(
+                    "%d webhook events were still running after %ss.",
+                    len(not_done),
+                    self.drain_timeout,
+                )
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    async def http(self, scope, receive, send):
+        if scope["path"] != self.path:
+            return await self.respond(send, 404)
+        if scope["method"] == "GET":
+            return await self.verify(scope, send)
+        if scope["method"] != "POST":
+            return await self.respond(send, 405)
+        if self.draining:
+            return await self.respond(send, 503)
+
+        body = await self.read_body(receive)
+        if body is None:
+            return await self.respond(send, 413)
+
+        headers = dict(scope.get("headers") or [])
+        if self.executor is None:
+            # The server did not send lifespan events
+            self.startup()
+        loop = asyncio.get_running_loop()
+        try:
+            payload = await loop.run_in_executor(
+                self.executor, self.parse, body, headers.get(SIGNATURE_HEADER)
+            )
+        except ValueError as e:
+            logger.warning("Rejected webhook event: %s", e)
+            return await self.respond(send, 400)
+
+        self.dispatch(loop, payload)
+        await self.respond(send, 200, b"EVENT_RECEIVED")
+
+    async def verify(self, scope, send):
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        token = query.get("hub.verify_token", [""])[0]
+        if self.verify_token and hmac.compare_digest(
+            token.encode("utf8"), str(self.verify_token).encode("utf8")
+        ):
+            challenge = query.get("hub.challenge", [""])[0]
+            return await self.respond(send, 200, challenge.encode("utf8"))
+        await self.respond(send, 403)
+
+    async def read_body(self, receive):
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                return None
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    def parse(self, body, signature=None):
+        if self.app_secret is not None:
+            if not signature:
+                raise ValueError("Missing signature.")
+            expected = hmac.new(
+                str(self.app_secret).encode("utf8"), body, hashlib.sha256
+            ).hexdigest()
+            if not hmac.compare_digest(signature, b"sha256=" + expected.encode()):
+                raise ValueError("Signature does not match.")
+        payload = json.loads(body.decode("utf8"))
+        if not isinstance(payload, dict) or "entry" not in payload:
+            raise ValueError("Payload has no `entry`.")
+        return payload
+
+    def dispatch(self, loop, payload):
+        future = loop.run_in_executor(self.executor, self.handle, payload)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return future
+
+    def handle(self, payload):
+        try:
+            return self.messenger.handle(payload)
+        except Exception:
+            logger.exception("Failed to handle webhook event.")
+
+    async def respond(self, send, status, body=b""):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"text/plain"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -1,9 +1,19 @@
 from __future__ import absolute_import
 
 from .quick_replies import QuickReplies
+from .serialization import JSONSerializable
 
 
-class BaseAttachment(object):
+class BaseAttachment(JSONSerializable):
+
+    __slots__ = (
+        "attachment_type",
+        "url",
+        "is_reusable",
+        "attachment_id",
+        "quick_replies",
+    )
+
     def __init__(
         self,
         attachment_type,
@@ -40,6 +50,9 @@ class BaseAttachment(object):
 
 
 class Image(BaseAttachment):
+
+    __slots__ = ()
+
     def __init__(
         self, url=None, is_reusable=None, quick_replies=None, attachment_id=None
     ):
@@ -58,6 +71,9 @@ class Image(BaseAttachment):
 
 
 class Audio(BaseAttachment):
+
+    __slots__ = ()
+
     def __init__(
         self, url=None, is_reusable=None, quick_replies=None, attachment_id=None
     ):
@@ -76,6 +92,9 @@ class Audio(BaseAttachment):
 
 
 class Video(BaseAttachment):
+
+    __slots__ = ()
+
     def __init__(
         self, url=None, is_reusable=None, quick_replies=None, attachment_id=None
     ):
@@ -94,6 +113,9 @@ class Video(BaseAttachment):
 
 
 class File(BaseAttachment):
+
+    __slots__ = ()
+
     def __init__(
         self, url=None, is_reusable=None, quick_replies=None, attachment_id=None
     ):
@@ -0,0 +1,191 @@
+from __future__ import absolute_import
+
+import io
+import itertools
+import json
+import logging
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_BATCH_SIZE = 100
+
+BatchReport = namedtuple(
+    "BatchReport",
+    ["batch", "offset", "sent", "failed", "failures", "elapsed", "throughput"],
+)
+
+BroadcastResult = namedtuple(
+    "BroadcastResult", ["sent", "failed", "offset", "elapsed", "failed_ids"]
+)
+
+
+def read_recipients(path):
+    """Yields recipient ids from a file containing one id per line."""
+    with io.open(path, encoding="utf8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+class FileCheckpoint(object):
+    """
+    Stores the number of recipients a broadcast has gone through and the ids
+    of the recipients it failed to send to, so it can be resumed after being
+    interrupted.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _read(self):
+        try:
+            with io.open(self.path, encoding="utf8") as f:
+                return json.load(f)
+        except (IOError, OSError):
+            return {}
+
+    def load(self):
+        return self._read().get("offset", 0)
+
+    def load_failed(self):
+        return self._read().get("failed", [])
+
+    def save(self, offset, failed=()):
+        tmp_path = "{}.tmp".format(self.path)
+        with io.open(tmp_path, "w", encoding="utf8") as f:
+            f.write(json.dumps({"offset": offset, "failed": list(failed)}))
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Broadcast(object):
+    """
+    Sends one message to a stream of recipients.
+
+    The payload is encoded once, sends run concurrently and go through the
+    client's rate limiter, and progress is checkpointed after every batch.
+    Recipients can be any iterable of ids, including rows of a DB cursor,
+    in which case the first column is used. For a `ParameterizedMessage`,
+    `values` is called with each recipient row to get its placeholder values.
+
+    The checkpoint, a path or an object with the methods of `FileCheckpoint`,
+    keeps the offset and the failed recipient ids of an interrupted run. It
+    is cleared once a run reaches the end of the recipients, and the result
+    lists the ids which failed in it and in the runs it resumed, to retry.
+    """
+
+    def __init__(self, client, payload, **kwargs):
+        """
+        @required:
+            client
+            payload
+        @optional:
+            messaging_type
+            notification_type
+            tag
+            validation
+            timeout
+            concurrency
+            batch_size
+            checkpoint
+            on_batch
+            values
+        """
+        self.client = client
+        self.prepared = client.prepare(
+            payload,
+            messaging_type=kwargs.get("messaging_type", "UPDATE"),
+            notification_type=kwargs.get("notification_type", "REGULAR"),
+            tag=kwargs.get("tag"),
+            validation=kwargs.get("validation"),
+        )
+        self.timeout = kwargs.get("timeout")
+        self.concurrency = kwargs.get("concurrency", DEFAULT_CONCURRENCY)
+        self.batch_size = kwargs.get("batch_size", DEFAULT_BATCH_SIZE)
+        self.on_batch = kwargs.get("on_batch")
+        self.values = kwargs.get("values")
+
+        checkpoint = kwargs.get("checkpoint")
+        if isinstance(checkpoint, str):
+            checkpoint = FileCheckpoint(checkpoint)
+        self.checkpoint = checkpoint
+
+    def send_one(self, row):
+        recipient_id = row[0] if isinstance(row, (tuple, list)) else row
+        values = self.values(row) if self.values else None
+        try:
+            r = self.client.send_prepared(
+                self.prepared, recipient_id, timeout=self.timeout, values=values
+            )
+        except Exception as e:
+            return recipient_id, str(e)
+        if r.status_code >= 400:
+            return recipient_id, r.text
+        return recipient_id, None
+
+    def run(self, recipients):
+        offset, failed_ids = 0, []
+        if self.checkpoint:
+            offset = self.checkpoint.load()
+            failed_ids = list(self.checkpoint.load_failed())
+        recipients = itertools.islice(recipients, offset, None)
+        sent = failed = 0
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for batch in itertools.count():
+                rows = list(itertools.islice(recipients, self.batch_size))
+                if not rows:
+                    break
+
+                batch_started = time.monotonic()
+                failures = [
+                    (recipient_id, error)
+                    for recipient_id, error in executor.map(self.send_one, rows)
+                    if error is not None
+                ]
+                elapsed = time.monotonic() - batch_started
+                offset += len(rows)
+                failed_ids.extend(recipient_id for recipient_id, _ in failures)
+                if self.checkpoint:
+                    self.checkpoint.save(offset, failed_ids)
+
+                report = BatchReport(
+                    batch=batch,
+                    offset=offset,
+                    sent=len(rows) - len(failures),
+                    failed=len(failures),
+                    failures=failures,
+                    elapsed=elapsed,
+                    throughput=len(rows) / elapsed if elapsed else 0.0,
+                )
+                sent += report.sent
+                failed += report.failed
+                logger.info(
+                    "Broadcast batch %d: %d sent, %d failed, %.1f msg/s.",
+                    report.batch,
+                    report.sent,
+                    report.failed,
+                    report.throughput,
+                )
+                if self.on_batch:
+                    self.on_batch(report)
+
+        if self.checkpoint:
+            self.checkpoint.clear()
+        return BroadcastResult(
+            sent=sent,
+            failed=failed,
+            offset=offset,
+            elapsed=time.monotonic() - started,
+            failed_ids=failed_ids,
+        )
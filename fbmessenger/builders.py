@@ -0,0 +1,136 @@
+from __future__ import absolute_import
+
+import logging
+
+from . import schema
+from .error_messages import CHARACTER_LIMIT_MESSAGE
+from .templates import GenericTemplate
+
+logger = logging.getLogger(__name__)
+
+ELEMENT_FIELDS = ("title", "subtitle", "image_url", "item_url")
+
+TITLE_LIMIT = schema.ELEMENT_TITLE_MAX_LENGTH
+SUBTITLE_LIMIT = schema.ELEMENT_SUBTITLE_MAX_LENGTH
+
+
+def _records_from_columns(columns):
+    keys = list(columns)
+    return (dict(zip(keys, row)) for row in zip(*(columns[key] for key in keys)))
+
+
+def _button_dict(button):
+    return button if isinstance(button, dict) else button.to_dict()
+
+
+def build_elements(
+    records=None, columns=None, default_action_key=None, buttons=None, mode=None
+):
+    """
+    Builds generic template element dicts from rows of data in a single pass,
+    without creating `Element` objects.
+
+    @optional:
+        records: iterable of dicts using the `Element` field names
+        columns: dict of `Element` field name to a sequence of values
+        default_action_key: record key holding the url of a `web_url` default action
+        buttons: callable returning the `Button`s (or their dicts) for a record
+        mode: `schema` validation mode for the title and subtitle, by
+            default a single warning is logged per field
+    """
+    if columns is not None:
+        records = _records_from_columns(columns)
+
+    mode = mode or schema.get_default_mode()
+    validator = schema.Validator(mode)
+    validate = mode != schema.TRUSTED
+
+    elements = []
+    long_titles = long_subtitles = 0
+    for record in records or ():
+        title = record.get("title")
+        if validate and not title:
+            raise ValueError("Element {} does not have a title.".format(len(elements)))
+
+        element = {"title": title}
+        for field in ELEMENT_FIELDS[1:]:
+            value = record.get(field)
+            if value:
+                element[field] = value
+
+        if validate:
+            if mode in (schema.STRICT, schema.LENIENT):
+                element = validator.check(
+                    element, schema.ELEMENT, "elements[{}]".format(len(elements))
+                )
+            else:
+                if len(title) > TITLE_LIMIT:
+                    long_titles += 1
+                subtitle = element.get("subtitle")
+                if subtitle is not None and len(subtitle) > SUBTITLE_LIMIT:
+                    long_subtitles += 1
+
+        if default_action_key and record.get(default_action_key):
+            element["default_action"] = {
+                "type": "web_url",
+                "url": record[default_action_key],
+                "webview_height_ratio": "tall",
+            }
+        if buttons is not None:
+            record_buttons = buttons(record)
+            if record_buttons:
+                element["buttons"] = [_button_dict(b) for b in record_buttons]
+
+        elements.append(element)
+
+    if long_titles:
+        logger.warning(
+            "%d elements: %s",
+            long_titles,
+            CHARACTER_LIMIT_MESSAGE.format(field="Title", maxsize=TITLE_LIMIT),
+        )
+    if long_subtitles:
+        logger.warning(
+            "%d elements: %s",
+            long_subtitles,
+            CHARACTER_LIMIT_MESSAGE.format(field="Subtitle", maxsize=SUBTITLE_LIMIT),
+        )
+    return elements
+
+
+def paginate(elements, page_size=GenericTemplate.MAX_ELEMENTS):
+    """Splits `elements` into pages of at most `page_size` elements."""
+    return [elements[i : i + page_size] for i in range(0, len(elements), page_size)]
+
+
+def build_generic_templates(
+    records=None,
+    columns=None,
+    page_size=GenericTemplate.MAX_ELEMENTS,
+    sharable=False,
+    image_aspect_ratio=None,
+    **kwargs
+):
+    """
+    Builds the messages of one or more generic template carousels from rows of
+    data, starting a new carousel every `page_size` elements. Accepts the
+    same arguments as `build_elements`.
+    """
+    if page_size > GenericTemplate.MAX_ELEMENTS:
+        raise ValueError(
+            "You cannot have more than {} elements in the template.".format(
+                GenericTemplate.MAX_ELEMENTS
+            )
+        )
+
+    messages = []
+    for page in paginate(build_elements(records, columns, **kwargs), page_size):
+        payload = {
+            "template_type": GenericTemplate.TEMPLATE_TYPE,
+            "sharable": bool(sharable),
+            "elements": page,
+        }
+        if image_aspect_ratio:
+            payload["image_aspect_ratio"] = image_aspect_ratio
+        messages.append({"attachment": {"type": "template", "payload": payload}})
+    return messages
@@ -2,63 +2,96 @@ from __future__ import absolute_import
 
 import logging
 
-from .error_messages import CHARACTER_LIMIT_MESSAGE
+from . import schema
+from .serialization import CachedSerializable, JSONSerializable, cached_field
 
 logger = logging.getLogger(__name__)
 
-WEBVIEW_HEIGHT_RATIOS = [
-    "compact",
-    "tall",
-    "full",
-]
+WEBVIEW_HEIGHT_RATIOS = schema.WEBVIEW_HEIGHT_RATIOS
 
 
-class Text(object):
+class Text(CachedSerializable):
+
+    __slots__ = ("_text", "_quick_replies")
+
+    text = cached_field("text")
+    quick_replies = cached_field("quick_replies")
+
     def __init__(self, text, quick_replies=None):
-        self.text = text
-        self.quick_replies = quick_replies
+        self._text = text
+        self._quick_replies = quick_replies
+        self._rendered_at = None
 
-    def to_dict(self):
-        d = {"text": self.text}
+    def _children(self):
+        return (self._quick_replies,) if self._quick_replies else ()
 
-        if self.quick_replies:
-            d["quick_replies"] = self.quick_replies.to_dict()
+    def _render(self):
+        d = {"text": self._text}
+
+        if self._quick_replies:
+            d["quick_replies"] = self._quick_replies.to_dict()
 
         return d
 
 
-class DynamicText(object):
+class DynamicText(CachedSerializable):
+
+    __slots__ = ("_text", "_fallback_text", "_quick_replies")
+
+    text = cached_field("text")
+    fallback_text = cached_field("fallback_text")
+    quick_replies = cached_field("quick_replies")
+
     def __init__(self, text, fallback_text=None, quick_replies=None):
-        self.text = text
-        self.fallback_text = fallback_text
-        self.quick_replies = quick_replies
+        self._text = text
+        self._fallback_text = fallback_text
+        self._quick_replies = quick_replies
+        self._rendered_at = None
 
-    def to_dict(self):
+    def _children(self):
+        return (self._quick_replies,) if self._quick_replies else ()
+
+    def _render(self):
         dynamic_text = {
-            "text": self.text,
+            "text": self._text,
         }
 
-        if self.fallback_text:
-            dynamic_text["fallback_text"] = self.fallback_text
+        if self._fallback_text:
+            dynamic_text["fallback_text"] = self._fallback_text
 
         d = {
             "dynamic_text": dynamic_text,
         }
 
-        if self.quick_replies:
-            d["quick_replies"] = self.quick_replies.to_dict()
+        if self._quick_replies:
+            d["quick_replies"] = self._quick_replies.to_dict()
 
         return d
 
 
-class Button(object):
-    BUTTON_TYPES = [
-        "web_url",
-        "postback",
-        "phone_number",
-        "account_link",
-        "account_unlink",
-    ]
+class Button(CachedSerializable):
+
+    __slots__ = (
+        "_button_type",
+        "_title",
+        "_url",
+        "_payload",
+        "_webview_height_ratio",
+        "_messenger_extensions",
+        "_fallback_url",
+        "_share_contents",
+    )
+
+    BUTTON_TYPES = schema.BUTTON_TYPES
+
+    button_type = cached_field("button_type")
+    title = cached_field("title")
+    url = cached_field("url")
+    payload = cached_field("payload")
+    webview_height_ratio = cached_field("webview_height_ratio")
+    messenger_extensions = cached_field("messenger_extensions")
+    fallback_url = cached_field("fallback_url")
+    share_contents = cached_field("share_contents")
 
     def __init__(
         self,
@@ -72,48 +105,74 @@ class Button(object):
         share_contents=None,
     ):
 
-        if button_type not in self.BUTTON_TYPES:
-            raise ValueError("Invalid button_type provided.")
-        if webview_height_ratio and webview_height_ratio not in WEBVIEW_HEIGHT_RATIOS:
-            raise ValueError("Invalid webview_height_ratio provided.")
-        if title and len(title) > 20:
-            logger.warning(CHARACTER_LIMIT_MESSAGE.format(field="Title", maxsize=20))
-
-        self.button_type = button_type
-        self.title = title
-        self.url = url
-        self.payload = payload
-        self.webview_height_ratio = webview_height_ratio
-        self.messenger_extensions = messenger_extensions
-        self.fallback_url = fallback_url
-        self.share_contents = share_contents
-
-    def to_dict(self):
+        if not schema.trusted():
+            if button_type not in self.BUTTON_TYPES:
+                raise ValueError("Invalid button_type provided.")
+            if (
+                webview_height_ratio
+                and webview_height_ratio not in WEBVIEW_HEIGHT_RATIOS
+            ):
+                raise ValueError("Invalid webview_height_ratio provided.")
+            schema.check_length(title, schema.BUTTON_TITLE_MAX_LENGTH, "Title", logger)
+
+        self._button_type = button_type
+        self._title = title
+        self._url = url
+        self._payload = payload
+        self._webview_height_ratio = webview_height_ratio
+        self._messenger_extensions = messenger_extensions
+        self._fallback_url = fallback_url
+        self._share_contents = share_contents
+        self._rendered_at = None
+
+    def _render(self):
         d = {
-            "type": self.button_type,
+            "type": self._button_type,
         }
 
-        if self.title:
-            d["title"] = self.title
-        if self.url:
-            d["url"] = self.url
-        if self.payload:
-            d["payload"] = self.payload
-        if self.button_type == "web_url":
-            if self.webview_height_ratio:
-                d["webview_height_ratio"] = self.webview_height_ratio
-            if self.messenger_extensions:
+        if self._title:
+            d["title"] = self._title
+        if self._url:
+            d["url"] = self._url
+        if self._payload:
+            d["payload"] = self._payload
+        if self._button_type == "web_url":
+            if self._webview_height_ratio:
+                d["webview_height_ratio"] = self._webview_height_ratio
+            if self._messenger_extensions:
                 d["messenger_extensions"] = "true"
-            if self.fallback_url:
-                d["fallback_url"] = self.fallback_url
+            if self._fallback_url:
+                d["fallback_url"] = self._fallback_url
         return d
 
 
-class Element(object):
+class Element(CachedSerializable):
     """
     To be used with the generic template to create a carousel
     """
 
+    __slots__ = (
+        "_title",
+        "_item_url",
+        "_image_url",
+        "_subtitle",
+        "_buttons",
+        "_quantity",
+        "_price",
+        "_currency",
+        "_default_action",
+    )
+
+    _child_lists = ("_buttons",)
+
+    item_url = cached_field("item_url")
+    image_url = cached_field("image_url")
+    buttons = cached_field("buttons")
+    quantity = cached_field("quantity")
+    price = cached_field("price")
+    currency = cached_field("currency")
+    default_action = cached_field("default_action")
+
     def __init__(
         self,
         title,
@@ -127,21 +186,34 @@ class Element(object):
         default_action=None,
     ):
 
-        self.title = title
-        self.item_url = item_url
-        self.image_url = image_url
-        self.subtitle = subtitle
-        self.buttons = buttons
-        self.quantity = quantity
-        self.price = price
-        self.currency = currency
+        self._title = self._check_title(title)
+        self._item_url = item_url
+        self._image_url = image_url
+        self._subtitle = self._check_subtitle(subtitle)
+        self._buttons = buttons
+        self._quantity = quantity
+        self._price = price
+        self._currency = currency
 
-        if default_action:
+        if default_action and not schema.trusted():
             if default_action.title:
                 raise ValueError("The default_action button may not have a title")
             if default_action.button_type != "web_url":
                 raise ValueError("The default_action button must be of type web_url")
-        self.default_action = default_action
+        self._default_action = default_action
+        self._rendered_at = None
+
+    @staticmethod
+    def _check_title(title):
+        schema.check_length(title, schema.ELEMENT_TITLE_MAX_LENGTH, "Title", logger)
+        return title
+
+    @staticmethod
+    def _check_subtitle(subtitle):
+        schema.check_length(
+            subtitle, schema.ELEMENT_SUBTITLE_MAX_LENGTH, "Subtitle", logger
+        )
+        return subtitle
 
     @property
     def title(self):
@@ -149,9 +221,8 @@ class Element(object):
 
     @title.setter
     def title(self, title):
-        if len(title) > 80:
-            logger.warning(CHARACTER_LIMIT_MESSAGE.format(field="Title", maxsize=80))
-        self._title = title
+        self._title = self._check_title(title)
+        self._invalidate()
 
     @property
     def subtitle(self):
@@ -159,35 +230,43 @@ class Element(object):
 
     @subtitle.setter
     def subtitle(self, subtitle):
-        if subtitle is not None and len(subtitle) > 80:
-            logger.warning(CHARACTER_LIMIT_MESSAGE.format(field="Subtitle", maxsize=80))
-        self._subtitle = subtitle
+        self._subtitle = self._check_subtitle(subtitle)
+        self._invalidate()
 
-    def to_dict(self):
+    def _children(self):
+        children = [self._default_action] if self._default_action else []
+        if self._buttons:
+            children.extend(self._buttons)
+        return children
+
+    def _render(self):
         d = {
-            "title": self.title,
+            "title": self._title,
         }
-        if self.item_url:
-            d["item_url"] = self.item_url
-        if self.image_url:
-            d["image_url"] = self.image_url
-        if self.subtitle:
-            d["subtitle"] = self.subtitle
-        if self.quantity:
-            d["quantity"] = self.quantity
-        if self.price:
-            d["price"] = self.price
-        if self.currency:
-            d["currency"] = self.currency
-        if self.default_action:
-            d["default_action"] = self.default_action.to_dict()
-        if self.buttons:
-            d["buttons"] = [button.to_dict() for button in self.buttons]
+        if self._item_url:
+            d["item_url"] = self._item_url
+        if self._image_url:
+            d["image_url"] = self._image_url
+        if self._subtitle:
+            d["subtitle"] = self._subtitle
+        if self._quantity:
+            d["quantity"] = self._quantity
+        if self._price:
+            d["price"] = self._price
+        if self._currency:
+            d["currency"] = self._currency
+        if self._default_action:
+            d["default_action"] = self._default_action.to_dict()
+        if self._buttons:
+            d["buttons"] = [button.to_dict() for button in self._buttons]
 
         return d
 
 
-class Adjustment(object):
+class Adjustment(JSONSerializable):
+
+    __slots__ = ("name", "amount")
+
     def __init__(self, name=None, amount=None):
         # Optional
         self.name = name
@@ -197,7 +276,10 @@ class Adjustment(object):
         return {"name": self.name, "amount": self.amount}
 
 
-class Address(object):
+class Address(JSONSerializable):
+
+    __slots__ = ("street_1", "city", "postal_code", "state", "country", "street_2")
+
     def __init__(self, street_1, city, postal_code, state, country, street_2=""):
         # Required
         self.street_1 = street_1
@@ -219,7 +301,10 @@ class Address(object):
         }
 
 
-class Summary(object):
+class Summary(JSONSerializable):
+
+    __slots__ = ("total_cost", "subtotal", "shipping_cost", "total_tax")
+
     def __init__(self, total_cost, subtotal=None, shipping_cost=None, total_tax=None):
         # Required
         self.total_cost = total_cost
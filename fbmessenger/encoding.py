@@ -0,0 +1,105 @@
+from __future__ import absolute_import
+
+import json
+import re
+
+import six
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+RECIPIENT_PREFIX = b',"recipient":{"id":'
+
+
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+# `str.isdigit` also accepts non-ASCII digits such as "１２３"
+_ASCII_DIGITS = re.compile(r"[0-9]+\Z")
+
+
+def dumps(obj):
+    """
+    Encodes `obj` to compact UTF-8 JSON bytes, using orjson when it is
+    installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _encoder.encode(obj).encode("utf8")
+
+
+def dumps_into(obj, buffer):
+    """
+    Appends `obj` encoded as JSON to `buffer`, a `bytearray` which can be
+    cleared and reused between calls, and returns the number of bytes written.
+    """
+    start = len(buffer)
+    if orjson is not None:
+        buffer += orjson.dumps(obj)
+    else:
+        for chunk in _encoder.iterencode(obj):
+            buffer += chunk.encode("utf8")
+    return len(buffer) - start
+
+
+def encode_recipient_id(recipient_id):
+    # bool is an int subclass, but `str(True)` is not JSON
+    if type(recipient_id) in six.integer_types:
+        return str(recipient_id).encode("ascii")
+    if isinstance(recipient_id, six.string_types) and _ASCII_DIGITS.match(recipient_id):
+        return b'"' + recipient_id.encode("ascii") + b'"'
+    return dumps(recipient_id)
+
+
+class PreparedMessage(object):
+    """
+    A Send API request body encoded once, with the recipient id spliced in
+    per send. Use `MessengerClient.prepare` to build one.
+    """
+
+    def __init__(self, message, messaging_type, notification_type, tag=None):
+        """
+        @required:
+            message: dict, object with a `to_dict` method, encoded JSON bytes
+                or a `ParameterizedMessage`
+            messaging_type
+            notification_type
+        @optional:
+            tag
+        """
+        self.parameterized = None
+        if hasattr(message, "render"):
+            self.parameterized = message
+        elif hasattr(message, "to_dict"):
+            message = message.to_dict()
+        if self.parameterized is None and not isinstance(message, bytes):
+            message = dumps(message)
+
+        head = {
+            "messaging_type": messaging_type,
+            "notification_type": notification_type,
+        }
+        if tag:
+            head["tag"] = tag
+
+        self.message = message
+        self.head = dumps(head)[:-1] + b',"message":'
+        if self.parameterized is None:
+            self.prefix = self.head + message + RECIPIENT_PREFIX
+        self.suffix = b"}}"
+
+    def body(self, recipient_id, values=None):
+        if self.parameterized is not None:
+            return b"".join(
+                (
+                    self.head,
+                    self.parameterized.render(values),
+                    RECIPIENT_PREFIX,
+                    encode_recipient_id(recipient_id),
+                    self.suffix,
+                )
+            )
+        return b"".join((self.prefix, encode_recipient_id(recipient_id), self.suffix))
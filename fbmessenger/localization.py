@@ -0,0 +1,156 @@
+from __future__ import absolute_import
+
+import threading
+from collections import OrderedDict
+
+from .encoding import dumps
+from .thread_settings import DEFAULT_LOCALE
+
+
+class LocaleRegistry(object):
+    """
+    Greetings, persistent menus and messages rendered once per locale, e.g.
+
+        registry = LocaleRegistry()
+        registry.add_greeting(GreetingText("Welcome!", locale="en_US"))
+        registry.add_greeting(GreetingText("歡迎!", locale="zh_TW"))
+        registry.add_message("help", Text("How can I help?"), locale="en_US")
+        registry.add_message("help", Text("需要什麼幫忙嗎?"), locale="zh_TW")
+        client.send(registry.message("help", "zh_HK"), recipient_id)
+
+    Lookups fall back from the locale to another locale of the same language
+    and then to the default locale, and the resolved locale is cached.
+    """
+
+    def __init__(self):
+        self._greetings = {}
+        self._menus = {}
+        self._messages = {}
+        self._resolved = {}
+
+    def _add(self, table, locale, value):
+        table[locale] = value
+        self._resolved.clear()
+
+    def add_greeting(self, greeting):
+        self._add(self._greetings, greeting.locale, greeting.to_dict())
+
+    def add_menu(self, menu):
+        self._add(self._menus, menu.locale, menu.to_dict())
+
+    def add_message(self, key, message, locale=None):
+        """
+        @required:
+            key: name of the message
+            message: payload object or message dict
+        @optional:
+            locale: by default the message is used for every locale
+        """
+        if hasattr(message, "to_json_bytes"):
+            message = message.to_json_bytes()
+        elif not isinstance(message, bytes):
+            message = dumps(message)
+        self._add(self._messages.setdefault(key, {}), locale or DEFAULT_LOCALE, message)
+
+    def resolve(self, table, locale):
+        """Returns the best locale of `table` for `locale`, or None."""
+        key = (id(table), locale)
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+
+        resolved = None
+        if locale in table:
+            resolved = locale
+        elif locale:
+            language = locale.split("_")[0] + "_"
+            resolved = next(
+                (name for name in sorted(table) if name.startswith(language)), None
+            )
+        if resolved is None and DEFAULT_LOCALE in table:
+            resolved = DEFAULT_LOCALE
+        self._resolved[key] = resolved
+        return resolved
+
+    def _lookup(self, table, locale):
+        resolved = self.resolve(table, locale)
+        return table[resolved] if resolved is not None else None
+
+    def greeting(self, locale=None):
+        """Returns the rendered greeting dict for `locale`."""
+        return self._lookup(self._greetings, locale)
+
+    def menu(self, locale=None):
+        """Returns the rendered persistent menu dict for `locale`."""
+        return self._lookup(self._menus, locale)
+
+    def message(self, key, locale=None):
+        """Returns the message `key` for `locale` as encoded JSON bytes."""
+        messages = self._messages.get(key)
+        if not messages:
+            raise KeyError("Unknown message `{}`.".format(key))
+        return self._lookup(messages, locale)
+
+    @property
+    def locales(self):
+        locales = set(self._greetings) | set(self._menus)
+        for messages in self._messages.values():
+            locales.update(messages)
+        return sorted(locales)
+
+    def to_profile_dict(self):
+        """Returns the greetings and menus of every locale as profile fields."""
+        profile = {}
+        if self._greetings:
+            profile["greeting"] = [
+                self._greetings[locale] for locale in sorted(self._greetings)
+            ]
+        if self._menus:
+            profile["persistent_menu"] = [
+                self._menus[locale] for locale in sorted(self._menus)
+            ]
+        return profile
+
+
+class UserLocaleCache(object):
+    """
+    Thread safe LRU cache of the locale of users, fetched with
+    `MessengerClient.get_user_data` on a miss. Locales already known from
+    stored profile data can be added with `set`. When Graph returns an
+    error the default locale is returned without being cached.
+    """
+
+    def __init__(self, client, maxsize=10000, timeout=None):
+        self.client = client
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._locales = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set(self, recipient_id, locale):
+        with self._lock:
+            self._locales[recipient_id] = locale
+            self._locales.move_to_end(recipient_id)
+            while len(self._locales) > self.maxsize:
+                self._locales.popitem(last=False)
+
+    def get(self, recipient_id):
+        with self._lock:
+            try:
+                self._locales.move_to_end(recipient_id)
+                return self._locales[recipient_id]
+            except KeyError:
+                pass
+
+        data = self.client.get_user_data(
+            recipient_id, fields="locale", timeout=self.timeout
+        )
+        if "error" in data:
+            return DEFAULT_LOCALE
+        locale = data.get("locale") or DEFAULT_LOCALE
+        self.set(recipient_id, locale)
+        return locale
+
+    def __len__(self):
+        return len(self._locales)
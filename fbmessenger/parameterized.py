@@ -0,0 +1,112 @@
+from __future__ import absolute_import
+
+import json
+import re
+
+from . import schema
+from .encoding import dumps
+
+
+class _TemplateValidator(schema.Validator):
+    """
+    Validates a message with placeholders, never truncating a string in the
+    middle of a placeholder, and records the length limited strings which
+    contain placeholders so they can be checked again once filled in.
+    """
+
+    def __init__(self, pattern, mode=None):
+        super(_TemplateValidator, self).__init__(mode)
+        self.pattern = pattern
+        # (path, limit, length without the placeholders, placeholders)
+        self.limited = []
+
+    def truncate(self, value, limit):
+        for match in self.pattern.finditer(value):
+            if match.start() < limit < match.end():
+                limit = match.start()
+                break
+        return value[:limit]
+
+    def check(self, d, spec, path):
+        d = super(_TemplateValidator, self).check(d, spec, path)
+        lengths, _ = spec
+        for field, limit in lengths:
+            value = d.get(field)
+            if not value:
+                continue
+            placeholders = tuple(self.pattern.findall(value))
+            if placeholders:
+                self.limited.append(
+                    (
+                        "{}.{}".format(path, field),
+                        limit,
+                        len(self.pattern.sub("", value)),
+                        placeholders,
+                    )
+                )
+        return d
+
+
+class ParameterizedMessage(object):
+    """
+    A message with `{field}` placeholders in its text which is rendered and
+    validated once, then encoded per recipient by joining pre-encoded JSON
+    fragments with the escaped values, e.g.
+
+        message = ParameterizedMessage(
+            Text("Hi {first_name}, your talk in {room} starts in 10 min"),
+            fields=["first_name", "room"],
+        )
+        message.render({"first_name": "Guido", "room": "R1"})
+
+    Only the given fields are substituted, so Messenger's own `{{first_name}}`
+    placeholders in `DynamicText` are left alone.
+
+    Lenient validation never truncates a string in the middle of a
+    placeholder. In strict and warn modes `render` checks the length of the
+    strings with placeholders again once the values are filled in.
+    """
+
+    def __init__(self, message, fields, validation=None):
+        if hasattr(message, "to_dict"):
+            message = message.to_dict()
+
+        self.fields = tuple(fields)
+        if not self.fields:
+            raise ValueError("At least one field is required.")
+        pattern = re.compile(
+            r"(?<!\{)\{("
+            + "|".join(re.escape(field) for field in self.fields)
+            + r")\}(?!\})"
+        )
+
+        self._validator = _TemplateValidator(pattern, validation)
+        message = self._validator.message(message)
+        if self._validator.mode in (schema.STRICT, schema.WARN):
+            self._limited = tuple(self._validator.limited)
+        else:
+            self._limited = ()
+
+        encoded = dumps(message).decode("utf8")
+        parts = pattern.split(encoded)
+        # `split` alternates between literal fragments and field names
+        self.fragments = tuple(part.encode("utf8") for part in parts[::2])
+        self.placeholders = tuple(parts[1::2])
+
+    @staticmethod
+    def encode_value(value):
+        return json.dumps("{}".format(value), ensure_ascii=False)[1:-1].encode("utf8")
+
+    def render(self, values):
+        """Returns the message encoded as JSON bytes with `values` filled in."""
+        texts = {field: "{}".format(values[field]) for field in self.fields}
+        for path, limit, length, placeholders in self._limited:
+            length += sum(len(texts[placeholder]) for placeholder in placeholders)
+            if length > limit:
+                self._validator.over_limit(path, limit, "characters")
+        encoded = {field: self.encode_value(text) for field, text in texts.items()}
+        parts = [self.fragments[0]]
+        for placeholder, fragment in zip(self.placeholders, self.fragments[1:]):
+            parts.append(encoded[placeholder])
+            parts.append(fragment)
+        return b"".join(parts)
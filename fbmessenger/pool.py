@@ -0,0 +1,120 @@
+from __future__ import absolute_import
+
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import DEFAULT_API_VERSION, MessengerClient
+from .rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 50
+
+
+class MessengerClientPool(object):
+    """
+    `MessengerClient`s for several pages keyed by page id.
+
+    All clients share one `requests.Session`, and thereby one connection pool
+    to the Graph API, while each page keeps its own access token, auth args
+    and rate limiter.
+    """
+
+    def __init__(self, session=None, **kwargs):
+        """
+        @optional:
+            session
+            api_version
+            max_connections
+            rate
+            burst
+        """
+        if session is None:
+            max_connections = kwargs.get("max_connections", DEFAULT_MAX_CONNECTIONS)
+            session = requests.Session()
+            session.mount(
+                "https://",
+                HTTPAdapter(pool_connections=1, pool_maxsize=max_connections),
+            )
+        self.session = session
+        self.api_version = kwargs.get("api_version", DEFAULT_API_VERSION)
+        self.rate = kwargs.get("rate")
+        self.burst = kwargs.get("burst")
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def add_page(self, page_id, page_access_token, app_secret=None, **kwargs):
+        """
+        Registers a page and returns its client. `rate` and `burst` override
+        the pool defaults for this page.
+        """
+        rate = kwargs.get("rate", self.rate)
+        rate_limiter = None
+        if rate:
+            rate_limiter = RateLimiter(rate, kwargs.get("burst", self.burst))
+
+        client = MessengerClient(
+            page_access_token,
+            session=self.session,
+            api_version=self.api_version,
+            app_secret=app_secret,
+            rate_limiter=rate_limiter,
+        )
+        with self._lock:
+            self._clients[str(page_id)] = client
+        return client
+
+    def remove_page(self, page_id):
+        with self._lock:
+            return self._clients.pop(str(page_id))
+
+    def get(self, page_id):
+        try:
+            return self._clients[str(page_id)]
+        except KeyError:
+            raise KeyError("Page `{}` is not registered.".format(page_id))
+
+    __getitem__ = get
+
+    def __contains__(self, page_id):
+        return str(page_id) in self._clients
+
+    def __iter__(self):
+        return iter(list(self._clients))
+
+    def __len__(self):
+        return len(self._clients)
+
+
+class PageRouter(object):
+    """
+    Routes webhook entries to the `BaseMessenger` of the page they were sent
+    to, using `entry["id"]`. It has the same `handle` method as
+    `BaseMessenger` so it can be used wherever a messenger is expected.
+    """
+
+    def __init__(self, messengers=None):
+        self.messengers = {}
+        for page_id, messenger in (messengers or {}).items():
+            self.add(page_id, messenger)
+
+    def add(self, page_id, messenger):
+        self.messengers[str(page_id)] = messenger
+
+    def get(self, page_id):
+        return self.messengers.get(str(page_id))
+
+    def handle(self, payload):
+        results = []
+        for entry in payload["entry"]:
+            messenger = self.get(entry.get("id"))
+            if messenger is None:
+                logger.warning(
+                    "No messenger registered for page `%s`.", entry.get("id")
+                )
+                continue
+            results.append(messenger.handle(dict(payload, entry=[entry])))
+        return results
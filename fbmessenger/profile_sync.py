@@ -0,0 +1,152 @@
+from __future__ import absolute_import
+
+import hashlib
+import io
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FIELDS = ("greeting", "get_started", "persistent_menu", "whitelisted_domains")
+
+# Fields holding one entry per locale, compared independently of order
+LOCALISED_FIELDS = frozenset(["greeting", "persistent_menu"])
+
+
+def profile_hash(profile):
+    """Returns a stable hash of a messenger profile dict."""
+    encoded = json.dumps(profile, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf8")).hexdigest()
+
+
+def _normalise(field, value):
+    if not value:
+        return None
+    if field in LOCALISED_FIELDS:
+        return {item.get("locale", "default"): item for item in value}
+    if field == "whitelisted_domains":
+        return frozenset(domain.rstrip("/") for domain in value)
+    return value
+
+
+def diff_profile(current, desired):
+    """
+    Returns the fields of the `desired` profile dict which differ from the
+    `current` one, as returned by `MessengerClient.get_messenger_profile`.
+    """
+    return {
+        field: value
+        for field, value in desired.items()
+        if _normalise(field, current.get(field)) != _normalise(field, value)
+    }
+
+
+class FileProfileCache(object):
+    """
+    Stores the hash of the last profile applied to a page, so an unchanged
+    profile is not fetched again on the next deploy. Use one file per page.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        try:
+            with io.open(self.path, encoding="utf8") as f:
+                return json.load(f)["hash"]
+        except (IOError, OSError, ValueError, KeyError):
+            return None
+
+    def save(self, value):
+        tmp_path = "{}.tmp".format(self.path)
+        with io.open(tmp_path, "w", encoding="utf8") as f:
+            f.write(json.dumps({"hash": value}))
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class MemoryProfileCache(object):
+    def __init__(self):
+        self.value = None
+
+    def load(self):
+        return self.value
+
+    def save(self, value):
+        self.value = value
+
+    def clear(self):
+        self.value = None
+
+
+class ProfileSync(object):
+    """
+    Applies a `MessengerProfile` to a page with as few requests as possible.
+
+    The current profile is fetched once, and only the fields which differ are
+    sent in a single request. The hash of the applied profile is cached, so
+    syncing an unchanged profile makes no requests at all.
+    """
+
+    def __init__(self, client, cache=None):
+        """
+        @required:
+            client: `MessengerClient` of the page
+        @optional:
+            cache: path of a `FileProfileCache`, or an object with `load`
+                and `save` methods, by default the hash is kept in memory
+        """
+        if cache is None:
+            cache = MemoryProfileCache()
+        elif not hasattr(cache, "load"):
+            cache = FileProfileCache(cache)
+        self.client = client
+        self.cache = cache
+
+    def sync(self, profile, force=False, timeout=None):
+        """
+        Returns the dict of fields which were sent, empty if the page is up
+        to date.
+
+        @required:
+            profile: `MessengerProfile` or profile dict
+        @optional:
+            force: compare with the page's profile even if the cached hash
+                matches
+            timeout
+        """
+        if hasattr(profile, "to_dict"):
+            profile = profile.to_dict()
+        unknown = set(profile) - set(PROFILE_FIELDS)
+        if unknown:
+            raise ValueError(
+                "Invalid profile fields: {}.".format(", ".join(sorted(unknown)))
+            )
+
+        desired_hash = profile_hash(profile)
+        if not force and self.cache.load() == desired_hash:
+            return {}
+
+        response = self.client.get_messenger_profile(
+            [field for field in PROFILE_FIELDS if field in profile], timeout=timeout
+        )
+        if "error" in response:
+            logger.warning("Could not fetch the messenger profile: %s", response)
+            current = {}
+        else:
+            data = response.get("data") or [{}]
+            current = data[0]
+
+        changes = diff_profile(current, profile)
+        if changes:
+            response = self.client.set_messenger_profile(changes, timeout=timeout)
+            if "error" in response:
+                logger.warning("Could not update the messenger profile: %s", response)
+                return changes
+
+        self.cache.save(desired_hash)
+        return changes
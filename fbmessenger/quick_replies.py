@@ -2,56 +2,78 @@ from __future__ import absolute_import
 
 import logging
 
-from .error_messages import CHARACTER_LIMIT_MESSAGE
+from . import schema
+from .serialization import CachedSerializable, cached_field
 
 logger = logging.getLogger(__name__)
 
 
-class QuickReply(object):
+class QuickReply(CachedSerializable):
 
-    CONTENT_TYPES = ["text", "location", "user_phone_number", "user_email"]
+    __slots__ = ("_title", "_payload", "_image_url", "_content_type")
+
+    CONTENT_TYPES = schema.QUICK_REPLY_CONTENT_TYPES
+
+    title = cached_field("title")
+    payload = cached_field("payload")
+    image_url = cached_field("image_url")
+    content_type = cached_field("content_type")
 
     def __init__(self, title=None, payload=None, image_url=None, content_type=None):
 
         if content_type is None:
             content_type = "text"
-        if content_type not in self.CONTENT_TYPES:
-            raise ValueError("Invalid content_type provided.")
-        if title and len(title) > 20:
-            logger.warning(CHARACTER_LIMIT_MESSAGE.format(field="Title", maxsize=20))
-        if payload and len(payload) > 1000:
-            raise ValueError("Payload cannot be longer 1000 characters.")
-
-        self.title = title
-        self.payload = payload
-        self.image_url = image_url
-        self.content_type = content_type
-
-    def to_dict(self):
+        if not schema.trusted():
+            if content_type not in self.CONTENT_TYPES:
+                raise ValueError("Invalid content_type provided.")
+            schema.check_length(
+                title, schema.QUICK_REPLY_TITLE_MAX_LENGTH, "Title", logger
+            )
+            if payload and len(payload) > schema.PAYLOAD_MAX_LENGTH:
+                raise ValueError("Payload cannot be longer 1000 characters.")
+
+        self._title = title
+        self._payload = payload
+        self._image_url = image_url
+        self._content_type = content_type
+        self._rendered_at = None
+
+    def _render(self):
         d = {
-            "content_type": self.content_type,
+            "content_type": self._content_type,
         }
 
-        if self.title:
-            d["title"] = self.title
-        if self.payload:
-            d["payload"] = self.payload
-        if self.image_url:
-            d["image_url"] = self.image_url
+        if self._title:
+            d["title"] = self._title
+        if self._payload:
+            d["payload"] = self._payload
+        if self._image_url:
+            d["image_url"] = self._image_url
 
         return d
 
 
-class QuickReplies(object):
+class QuickReplies(CachedSerializable):
+
+    __slots__ = ("_quick_replies",)
+
+    _child_lists = ("_quick_replies",)
+
+    quick_replies = cached_field("quick_replies")
+
     def __init__(self, quick_replies):
-        if len(quick_replies) > 11:
+        if not schema.trusted() and len(quick_replies) > schema.MAX_QUICK_REPLIES:
             raise ValueError("You cannot have more than 10 quick replies.")
-        self.quick_replies = quick_replies
+        self._quick_replies = quick_replies
+        self._rendered_at = None
 
     def __bool__(self):
-        return bool(self.quick_replies)
+        return bool(self._quick_replies)
 
     __nonzero__ = __bool__
 
-    def to_dict(self):
-        return [quick_reply.to_dict() for quick_reply in self.quick_replies]
+    def _children(self):
+        return self._quick_replies
+
+    def _render(self):
+        return [quick_reply.to_dict() for quick_reply in self._quick_replies]
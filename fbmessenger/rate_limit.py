@@ -0,0 +1,41 @@
+from __future__ import absolute_import
+
+import threading
+import time
+
+
+class RateLimiter(object):
+    """
+    Thread safe token bucket allowing `rate` calls per second with bursts
+    of up to `burst` calls.
+    """
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0.")
+        self.rate = float(rate)
+        self.burst = float(burst or rate)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a call is allowed, returns the time spent waiting."""
+        delay = self._reserve()
+        if delay:
+            self.sleep(delay)
+        return delay
@@ -0,0 +1,232 @@
+"""
+Messenger Platform limits, and validators compiled from them which check a
+rendered message in a single pass.
+
+Validation modes:
+    WARN: log a warning for values over a limit or not allowed
+    STRICT: raise a `ValidationError`
+    LENIENT: truncate strings and lists which are over a limit, and log a
+    warning for values not allowed
+    TRUSTED: skip validation entirely
+
+The payload constructors check their arguments in the default mode. Values
+the Send API cannot accept raise a `ValueError` in every mode but trusted,
+and lengths over a display limit are handled with `check_length`.
+"""
+
+from __future__ import absolute_import
+
+import logging
+
+from .error_messages import CHARACTER_LIMIT_MESSAGE
+
+logger = logging.getLogger(__name__)
+
+WARN = "warn"
+STRICT = "strict"
+LENIENT = "lenient"
+TRUSTED = "trusted"
+
+MODES = frozenset([WARN, STRICT, LENIENT, TRUSTED])
+
+# https://developers.facebook.com/docs/messenger-platform/reference/buttons
+BUTTON_TYPES = frozenset(
+    ["web_url", "postback", "phone_number", "account_link", "account_unlink"]
+)
+WEBVIEW_HEIGHT_RATIOS = frozenset(["compact", "tall", "full"])
+QUICK_REPLY_CONTENT_TYPES = frozenset(
+    ["text", "location", "user_phone_number", "user_email"]
+)
+MENU_ITEM_TYPES = frozenset(["nested", "web_url", "postback"])
+SENDER_ACTIONS = frozenset(["mark_seen", "typing_on", "typing_off"])
+
+TEXT_MAX_LENGTH = 2000
+BUTTON_TEMPLATE_TEXT_MAX_LENGTH = 640
+BUTTON_TITLE_MAX_LENGTH = 20
+ELEMENT_TITLE_MAX_LENGTH = 80
+ELEMENT_SUBTITLE_MAX_LENGTH = 80
+QUICK_REPLY_TITLE_MAX_LENGTH = 20
+PAYLOAD_MAX_LENGTH = 1000
+GREETING_MAX_LENGTH = 160
+MENU_ITEM_TITLE_MAX_LENGTH = 30
+
+MAX_QUICK_REPLIES = 11
+MAX_ELEMENTS = 10
+TEMPLATE_MAX_ELEMENTS = {"generic": MAX_ELEMENTS, "list": 4, "receipt": 100}
+MAX_BUTTONS = 3
+MAX_NESTED_MENU_ITEMS = 5
+MAX_MENU_ITEMS = 3
+
+_default_mode = WARN
+
+
+class ValidationError(ValueError):
+    pass
+
+
+def set_default_mode(mode):
+    global _default_mode
+    if mode not in MODES:
+        raise ValueError("Invalid validation mode `{}`.".format(mode))
+    _default_mode = mode
+
+
+def get_default_mode():
+    return _default_mode
+
+
+def trusted():
+    """Returns whether the constructors skip their checks."""
+    return _default_mode == TRUSTED
+
+
+def check_length(value, limit, field, log):
+    """
+    Checks a constructor argument against a display limit in the default
+    mode: logs to `log` in warn mode and raises a `ValidationError` in strict
+    mode. Lenient mode leaves it to `validate` to truncate the value.
+    """
+    if value is None or len(value) <= limit or _default_mode in (LENIENT, TRUSTED):
+        return
+    message = CHARACTER_LIMIT_MESSAGE.format(field=field, maxsize=limit)
+    if _default_mode == STRICT:
+        raise ValidationError(message)
+    log.warning(message)
+
+
+def _compile(fields):
+    """
+    Splits a `{field: limit}` spec into length checks and set based enum
+    checks, so validating an object is one loop over each.
+    """
+    lengths = tuple(
+        (field, limit) for field, limit in fields.items() if isinstance(limit, int)
+    )
+    enums = tuple(
+        (field, allowed)
+        for field, allowed in fields.items()
+        if isinstance(allowed, frozenset)
+    )
+    return lengths, enums
+
+
+MESSAGE = _compile({"text": TEXT_MAX_LENGTH})
+QUICK_REPLY = _compile(
+    {
+        "content_type": QUICK_REPLY_CONTENT_TYPES,
+        "title": QUICK_REPLY_TITLE_MAX_LENGTH,
+        "payload": PAYLOAD_MAX_LENGTH,
+    }
+)
+BUTTON = _compile(
+    {
+        "type": BUTTON_TYPES,
+        "title": BUTTON_TITLE_MAX_LENGTH,
+        "payload": PAYLOAD_MAX_LENGTH,
+        "webview_height_ratio": WEBVIEW_HEIGHT_RATIOS,
+    }
+)
+ELEMENT = _compile(
+    {"title": ELEMENT_TITLE_MAX_LENGTH, "subtitle": ELEMENT_SUBTITLE_MAX_LENGTH}
+)
+BUTTON_TEMPLATE = _compile({"text": BUTTON_TEMPLATE_TEXT_MAX_LENGTH})
+
+
+class Validator(object):
+    def __init__(self, mode=None):
+        self.mode = mode or get_default_mode()
+        if self.mode not in MODES:
+            raise ValueError("Invalid validation mode `{}`.".format(self.mode))
+
+    def over_limit(self, path, limit, unit):
+        message = "{} is longer than {} {}.".format(path, limit, unit)
+        if self.mode == STRICT:
+            raise ValidationError(message)
+        if self.mode == WARN:
+            logger.warning(message)
+
+    def invalid(self, path, value):
+        message = "Invalid {} `{}`.".format(path, value)
+        if self.mode == STRICT:
+            raise ValidationError(message)
+        if self.mode != TRUSTED:
+            logger.warning(message)
+
+    def truncate(self, value, limit):
+        return value[:limit]
+
+    def check(self, d, spec, path):
+        """Returns `d`, or a truncated copy of it in lenient mode."""
+        lengths, enums = spec
+        for field, allowed in enums:
+            value = d.get(field)
+            if value is not None and value not in allowed:
+                self.invalid("{}.{}".format(path, field), value)
+        for field, limit in lengths:
+            value = d.get(field)
+            if value is not None and len(value) > limit:
+                self.over_limit("{}.{}".format(path, field), limit, "characters")
+                if self.mode == LENIENT:
+                    d = dict(d)
+                    d[field] = self.truncate(value, limit)
+        return d
+
+    def check_list(self, d, field, limit, path, validate_item):
+        items = d.get(field)
+        if not items:
+            return d
+        if len(items) > limit:
+            self.over_limit("{}.{}".format(path, field), limit, "items")
+        checked = [
+            validate_item(item, "{}.{}[{}]".format(path, field, i))
+            for i, item in enumerate(items[:limit] if self.mode == LENIENT else items)
+        ]
+        if len(checked) != len(items) or any(
+            new is not old for new, old in zip(checked, items)
+        ):
+            d = dict(d)
+            d[field] = checked
+        return d
+
+    def quick_reply(self, d, path):
+        return self.check(d, QUICK_REPLY, path)
+
+    def button(self, d, path):
+        return self.check(d, BUTTON, path)
+
+    def element(self, d, path):
+        d = self.check(d, ELEMENT, path)
+        return self.check_list(d, "buttons", MAX_BUTTONS, path, self.button)
+
+    def template(self, payload, path):
+        template_type = payload.get("template_type")
+        if template_type == "button":
+            payload = self.check(payload, BUTTON_TEMPLATE, path)
+        elements = payload.get("elements")
+        if elements and template_type != "media":
+            limit = TEMPLATE_MAX_ELEMENTS.get(template_type, len(elements))
+            payload = self.check_list(payload, "elements", limit, path, self.element)
+        return self.check_list(payload, "buttons", MAX_BUTTONS, path, self.button)
+
+    def message(self, d, path="message"):
+        if self.mode == TRUSTED:
+            return d
+        d = self.check(d, MESSAGE, path)
+        attachment = d.get("attachment")
+        if attachment and attachment.get("type") == "template":
+            attachment_path = path + ".attachment.payload"
+            payload = self.template(attachment["payload"], attachment_path)
+            if payload is not attachment["payload"]:
+                d = dict(d, attachment=dict(attachment, payload=payload))
+        return self.check_list(
+            d, "quick_replies", MAX_QUICK_REPLIES, path, self.quick_reply
+        )
+
+
+def validate(message, mode=None):
+    """
+    Validates a rendered message against the Messenger limits. Returns the
+    message, which is a truncated copy in lenient mode; the original is never
+    modified.
+    """
+    return Validator(mode).message(message)
@@ -1,5 +1,9 @@
-class SenderAction(object):
-    SENDER_ACTIONS = ["mark_seen", "typing_on", "typing_off"]
+from . import schema
+from .serialization import JSONSerializable
+
+
+class SenderAction(JSONSerializable):
+    SENDER_ACTIONS = schema.SENDER_ACTIONS
 
     def __init__(self, sender_action):
         if sender_action not in self.SENDER_ACTIONS:
@@ -0,0 +1,152 @@
+from __future__ import absolute_import
+
+from operator import attrgetter
+
+from .encoding import dumps, dumps_into
+
+
+class JSONSerializable(object):
+    """Adds JSON bytes output to payload objects with a `to_dict` method."""
+
+    __slots__ = ()
+
+    def to_json_bytes(self):
+        return dumps(self.to_dict())
+
+    def write_json(self, buffer):
+        """Appends the JSON encoding to the `bytearray` `buffer`."""
+        return dumps_into(self.to_dict(), buffer)
+
+
+# Bumped whenever a rendered payload object is modified, which drops the
+# cached output of all of them, as a parent's output includes its children's.
+_generation = 0
+
+
+def invalidate_caches():
+    """Drops the cached `to_dict` output of all payload objects."""
+    global _generation
+    _generation += 1
+
+
+def cached_field(name):
+    """
+    Property for the field `name` of a `CachedSerializable`, stored in the
+    attribute `_<name>`, whose setter invalidates the cached output.
+    """
+    attr = "_" + name
+
+    def setter(self, value):
+        setattr(self, attr, value)
+        self._invalidate()
+
+    return property(attrgetter(attr), setter)
+
+
+def _frozen_setattr(self, name, value):
+    raise AttributeError("Cannot modify a frozen {}.".format(type(self).__name__))
+
+
+def _frozen_delattr(self, name):
+    raise AttributeError("Cannot modify a frozen {}.".format(type(self).__name__))
+
+
+class _Frozen(object):
+    """Methods of frozen payload objects, which return their cached output."""
+
+    __slots__ = ()
+
+    frozen = True
+    __setattr__ = _frozen_setattr
+    __delattr__ = _frozen_delattr
+
+    def to_dict(self):
+        return self._cache
+
+    def to_json_bytes(self):
+        try:
+            return self._json
+        except AttributeError:
+            encoded = dumps(self._cache)
+            object.__setattr__(self, "_json", encoded)
+            return encoded
+
+
+_frozen_classes = {}
+
+
+def _frozen_class(cls):
+    try:
+        return _frozen_classes[cls]
+    except KeyError:
+        frozen = type(
+            cls.__name__,
+            (_Frozen, cls),
+            {"__slots__": (), "__module__": cls.__module__},
+        )
+        return _frozen_classes.setdefault(cls, frozen)
+
+
+class CachedSerializable(JSONSerializable):
+    """
+    Base class for payload objects which cache their output.
+
+    Subclasses build their dict in `_render`, list the payload objects
+    embedded in it in `_children`, and set `_rendered_at = None` in
+    `__init__`. Their fields are `cached_field` properties, or properties
+    whose setters call `_invalidate`, so `to_dict` returns the cached dict
+    until a rendered object is modified. Lists of children have to be
+    reassigned rather than modified in place for the change to show.
+
+    `freeze` makes an object and its children immutable, with their lists
+    of children turned into tuples, after which `to_dict` and
+    `to_json_bytes` return the cached output without any checks. The
+    returned dict is shared between calls and must not be mutated.
+    """
+
+    # `_json` is only set once frozen
+    __slots__ = ("_cache", "_rendered_at", "_json")
+
+    frozen = False
+    # attributes holding lists of children, made tuples by `freeze`
+    _child_lists = ()
+
+    def _render(self):
+        raise NotImplementedError
+
+    def _children(self):
+        return ()
+
+    def _invalidate(self):
+        # Only objects which were rendered can be part of a cached output
+        if self._rendered_at is not None:
+            invalidate_caches()
+
+    def to_dict(self):
+        if self._rendered_at == _generation:
+            return self._cache
+        generation = _generation
+        d = self._render()
+        self._cache = d
+        self._rendered_at = generation
+        return d
+
+    def write_json(self, buffer):
+        encoded = self.to_json_bytes()
+        buffer += encoded
+        return len(encoded)
+
+    def freeze(self):
+        """Makes this object and its children immutable and renders it once."""
+        if not self.frozen:
+            for child in self._children():
+                if isinstance(child, CachedSerializable):
+                    child.freeze()
+            for name in self._child_lists:
+                value = getattr(self, name)
+                if value is not None:
+                    object.__setattr__(self, name, tuple(value))
+            self._rendered_at = None
+            self.to_dict()
+            object.__setattr__(self, "__class__", _frozen_class(type(self)))
+        return self
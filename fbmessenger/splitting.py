@@ -0,0 +1,169 @@
+"""
+Size estimates for payloads, and splitting of messages which are over the
+Messenger limits into several messages which are not.
+"""
+
+from __future__ import absolute_import
+
+import unicodedata
+
+from . import schema
+from .encoding import dumps
+from .templates import GenericTemplate
+
+# Break points for text, in order of preference. CJK sentence punctuation is
+# kept at the end of the chunk, whitespace is dropped.
+LINE_BREAKS = ("\n",)
+SPACES = (" ", "\t", "　")
+CJK_PUNCTUATION = ("。", "！", "？", "；", "，", "、")
+ZERO_WIDTH_JOINER = "\u200d"
+VARIATION_SELECTORS = ("\ufe0e", "\ufe0f")
+# Emoji skin tone modifiers
+MODIFIERS = ("\U0001f3fb", "\U0001f3ff")
+
+
+def text_size(text):
+    """
+    Returns the length of `text` in characters, which the Messenger limits
+    are counted in, and in UTF-8 bytes, which are 3 per CJK character.
+    """
+    return len(text), len(text.encode("utf8"))
+
+
+def payload_size(payload):
+    """Returns the size of the encoded JSON of a payload object or dict in bytes."""
+    if hasattr(payload, "to_json_bytes"):
+        return len(payload.to_json_bytes())
+    if hasattr(payload, "to_dict"):
+        payload = payload.to_dict()
+    return len(dumps(payload))
+
+
+def _inside_grapheme(text, index):
+    """Returns whether cutting `text` at `index` splits a character."""
+    char = text[index]
+    return (
+        text[index - 1] == ZERO_WIDTH_JOINER
+        or char == ZERO_WIDTH_JOINER
+        or char in VARIATION_SELECTORS
+        or MODIFIERS[0] <= char <= MODIFIERS[1]
+        or unicodedata.combining(char) != 0
+    )
+
+
+def _break_point(text, start, end):
+    """Returns the ends of the chunk `text[start:end]` and of its separator."""
+    for separators, keep in (
+        (LINE_BREAKS, False),
+        (CJK_PUNCTUATION, True),
+        (SPACES, False),
+    ):
+        # A dropped separator may sit right after the chunk, a kept one
+        # must fit in it
+        stop = end if keep else end + 1
+        index = max(text.rfind(sep, start + 1, stop) for sep in separators)
+        if index > start:
+            return (index + 1, index + 1) if keep else (index, index + 1)
+    # No break point, cut before the character which does not fit, unless
+    # the chunk is a single character
+    cut = end
+    while cut > start and _inside_grapheme(text, cut):
+        cut -= 1
+    if cut == start:
+        cut = end
+    return cut, cut
+
+
+def split_text(text, limit=schema.TEXT_MAX_LENGTH):
+    """
+    Splits `text` into chunks of at most `limit` characters, breaking at
+    line breaks, then CJK punctuation, then spaces where possible. The
+    whitespace around each break is dropped.
+    """
+    if limit < 1:
+        raise ValueError("limit must be greater than 0.")
+    chunks = []
+    start = 0
+    while len(text) - start > limit:
+        end, start_next = _break_point(text, start, start + limit)
+        chunk = text[start:end].rstrip()
+        if chunk:
+            chunks.append(chunk)
+        start = start_next
+        while start < len(text) and text[start].isspace():
+            start += 1
+    if text[start:].strip() or not chunks:
+        chunks.append(text[start:])
+    return chunks
+
+
+def _template_elements(message):
+    attachment = message.get("attachment") or {}
+    if attachment.get("type") != "template":
+        return None
+    payload = attachment["payload"]
+    limit = schema.TEMPLATE_MAX_ELEMENTS.get(payload.get("template_type"))
+    elements = payload.get("elements")
+    if limit is None or not elements or len(elements) <= limit:
+        return None
+    return payload, limit
+
+
+def split_message(message, text_limit=schema.TEXT_MAX_LENGTH):
+    """
+    Returns a list of message dicts within the Messenger limits for a payload
+    object or message dict. Long texts are split into several text messages
+    and templates with too many elements into several templates. Quick
+    replies are kept on the last message only. Messages within the limits
+    are returned as the only item of the list.
+    """
+    if hasattr(message, "to_dict"):
+        message = message.to_dict()
+
+    text = message.get("text")
+    if text is not None and len(text) > text_limit:
+        messages = [{"text": chunk} for chunk in split_text(text, text_limit)]
+    else:
+        template = _template_elements(message)
+        if template is None:
+            return [message]
+        payload, limit = template
+        elements = payload["elements"]
+        messages = [
+            {
+                "attachment": {
+                    "type": "template",
+                    "payload": dict(payload, elements=elements[i : i + limit]),
+                }
+            }
+            for i in range(0, len(elements), limit)
+        ]
+
+    quick_replies = message.get("quick_replies")
+    if quick_replies:
+        messages[-1]["quick_replies"] = quick_replies
+    return messages
+
+
+def split_carousel(
+    elements, page_size=GenericTemplate.MAX_ELEMENTS, quick_replies=None, **kwargs
+):
+    """
+    Returns `GenericTemplate`s of at most `page_size` elements each for a
+    list of any number of elements, with the quick replies on the last one.
+    Accepts the same keyword arguments as `GenericTemplate`.
+    """
+    if not 0 < page_size <= GenericTemplate.MAX_ELEMENTS:
+        raise ValueError(
+            "page_size must be between 1 and {}.".format(GenericTemplate.MAX_ELEMENTS)
+        )
+    elements = list(elements)
+    starts = range(0, len(elements), page_size)
+    return [
+        GenericTemplate(
+            elements[start : start + page_size],
+            quick_replies=quick_replies if start == starts[-1] else None,
+            **kwargs
+        )
+        for start in starts
+    ]
@@ -1,6 +1,7 @@
 from __future__ import absolute_import
 
 from .quick_replies import QuickReplies
+from .serialization import CachedSerializable, cached_field
 
 try:
     from collections.abc import Iterable
@@ -8,36 +9,59 @@ except ImportError:
     from collections import Iterable
 
 
-class BaseTemplate(object):
+def _as_list(items):
+    if items:
+        if isinstance(items, Iterable):
+            return list(items)
+        return [items]
+    return items
+
+
+class BaseTemplate(CachedSerializable):
+    """
+    Templates never modify a dict once rendered, so one template can be
+    rendered once and sent to many users concurrently.
+    Subclasses and mixins add their fields in `_payload`.
+    """
+
     TEMPLATE_TYPE = "base"
 
+    quick_replies = cached_field("quick_replies")
+
     def __init__(self, quick_replies=None):
         if quick_replies and not isinstance(quick_replies, QuickReplies):
             raise ValueError("quick_replies must be an instance of QuickReplies.")
-        self.quick_replies = quick_replies
+        self._quick_replies = quick_replies
+        self._rendered_at = None
+
+    def _children(self):
+        return [self._quick_replies] if self._quick_replies else []
 
-        self._d = {
+    def _payload(self):
+        return {"template_type": self.TEMPLATE_TYPE}
+
+    def _render(self):
+        d = {
             "attachment": {
                 "type": "template",
-                "payload": {
-                    "template_type": self.TEMPLATE_TYPE,
-                },
+                "payload": self._payload(),
             },
         }
 
-    def to_dict(self):
-        if self.quick_replies:
-            self._d["quick_replies"] = self.quick_replies.to_dict()
+        if self._quick_replies:
+            d["quick_replies"] = self._quick_replies.to_dict()
 
-        return self._d
+        return d
 
 
 class ElementMixin(object):
     MIN_ELEMENTS = 0
     MAX_ELEMENTS = 0
 
+    _child_lists = ("_elements",)
+
     def __init__(self, elements=None, *args, **kwargs):
-        self.elements = elements
+        self._elements = _as_list(elements)
 
         super(ElementMixin, self).__init__(*args, **kwargs)
 
@@ -47,43 +71,44 @@ class ElementMixin(object):
 
     @elements.setter
     def elements(self, elements):
-        if elements:
-            if isinstance(elements, Iterable):
-                elements = list(elements)
-            else:
-                elements = [elements]
+        self._elements = _as_list(elements)
+        self._invalidate()
 
-        self._elements = elements
+    def _children(self):
+        children = super(ElementMixin, self)._children()
+        return children + list(self._elements or [])
 
-    def to_dict(self):
+    def _payload(self):
         if self.MIN_ELEMENTS and (
-            not self.elements or len(self.elements) < self.MIN_ELEMENTS
+            not self._elements or len(self._elements) < self.MIN_ELEMENTS
         ):
             raise ValueError(
                 "At least {} elements are required.".format(self.MIN_ELEMENTS)
             )
 
-        if self.elements:
-            if len(self.elements) > self.MAX_ELEMENTS:
+        if self._elements:
+            if len(self._elements) > self.MAX_ELEMENTS:
                 raise ValueError(
                     "You cannot have more than {} elements in the template.".format(
                         self.MAX_ELEMENTS
                     )
                 )
 
-            self._d["attachment"]["payload"]["elements"] = [
-                element.to_dict() for element in self.elements
-            ]
+        payload = super(ElementMixin, self)._payload()
+        if self._elements:
+            payload["elements"] = [element.to_dict() for element in self._elements]
 
-        return super(ElementMixin, self).to_dict()
+        return payload
 
 
 class ButtonMixin(object):
     MIN_BUTTONS = 0
     MAX_BUTTONS = 0
 
+    _child_lists = ("_buttons",)
+
     def __init__(self, buttons=None, *args, **kwargs):
-        self.buttons = buttons
+        self._buttons = _as_list(buttons)
 
         super(ButtonMixin, self).__init__(*args, **kwargs)
 
@@ -93,47 +118,49 @@ class ButtonMixin(object):
 
     @buttons.setter
     def buttons(self, buttons):
-        if buttons:
-            if isinstance(buttons, Iterable):
-                buttons = list(buttons)
-            else:
-                buttons = [buttons]
+        self._buttons = _as_list(buttons)
+        self._invalidate()
 
-        self._buttons = buttons
+    def _children(self):
+        children = super(ButtonMixin, self)._children()
+        return children + list(self._buttons or [])
 
-    def to_dict(self):
+    def _payload(self):
         if self.MIN_BUTTONS and (
-            not self.buttons or len(self.buttons) < self.MIN_BUTTONS
+            not self._buttons or len(self._buttons) < self.MIN_BUTTONS
         ):
             raise ValueError(
                 "At least {} buttons are required.".format(self.MIN_BUTTONS)
             )
 
-        if self.buttons:
-            if len(self.buttons) > self.MAX_BUTTONS:
+        if self._buttons:
+            if len(self._buttons) > self.MAX_BUTTONS:
                 raise ValueError(
                     "You cannot have more than {} buttons in the template.".format(
                         self.MAX_BUTTONS
                     )
                 )
 
-            self._d["attachment"]["payload"]["buttons"] = [
-                button.to_dict() for button in self.buttons
-            ]
+        payload = super(ButtonMixin, self)._payload()
+        if self._buttons:
+            payload["buttons"] = [button.to_dict() for button in self._buttons]
 
-        return super(ButtonMixin, self).to_dict()
+        return payload
 
 
 class SharableMixin(object):
+    sharable = cached_field("sharable")
+
     def __init__(self, sharable=False, *args, **kwargs):
-        self.sharable = bool(sharable)
+        self._sharable = bool(sharable)
 
         super(SharableMixin, self).__init__(*args, **kwargs)
 
-    def to_dict(self):
-        self._d["attachment"]["payload"]["sharable"] = self.sharable
+    def _payload(self):
+        payload = super(SharableMixin, self)._payload()
+        payload["sharable"] = self._sharable
 
-        return super(SharableMixin, self).to_dict()
+        return payload
 
 
 class GenericTemplate(ElementMixin, SharableMixin, BaseTemplate):
@@ -142,20 +169,21 @@ class GenericTemplate(ElementMixin, SharableMixin, BaseTemplate):
     MIN_ELEMENTS = 1
     MAX_ELEMENTS = 10
 
+    image_aspect_ratio = cached_field("image_aspect_ratio")
+
     def __init__(self, elements, quick_replies=None, image_aspect_ratio=None, **kwargs):
-        self.image_aspect_ratio = image_aspect_ratio
+        self._image_aspect_ratio = image_aspect_ratio
 
         super(GenericTemplate, self).__init__(
             elements=elements, quick_replies=quick_replies, **kwargs
         )
 
-    def to_dict(self):
-        if self.image_aspect_ratio:
-            self._d["attachment"]["payload"][
-                "image_aspect_ratio"
-            ] = self.image_aspect_ratio
+    def _payload(self):
+        payload = super(GenericTemplate, self)._payload()
+        if self._image_aspect_ratio:
+            payload["image_aspect_ratio"] = self._image_aspect_ratio
 
-        return super(GenericTemplate, self).to_dict()
+        return payload
 
 
 class MediaTemplate(BaseTemplate):
@@ -163,22 +191,36 @@ class MediaTemplate(BaseTemplate):
 
     VALID_MEDIA_TYPES = ("image", "video")
 
+    _child_lists = ("_buttons",)
+
+    media = cached_field("media")
+    buttons = cached_field("buttons")
+
     def __init__(self, media, buttons=None):
         if media.attachment_type not in self.VALID_MEDIA_TYPES:
             raise ValueError("Only image and video types are supported")
-        self.media = media
-        self.buttons = buttons
+        self._media = media
+        self._buttons = buttons
         super(MediaTemplate, self).__init__()
 
     def to_dict(self):
+        # The media attachment has no cache to invalidate when it changes
+        return self._render()
+
+    def _children(self):
+        children = super(MediaTemplate, self)._children() + [self._media]
+        return children + list(self._buttons or [])
+
+    def _payload(self):
         # Media's dict has an extra layer of structure we don't need
-        media_dict = self.media.to_dict()
-        element = media_dict["attachment"]["payload"]
-        element["media_type"] = self.media.attachment_type
-        if self.buttons:
-            element["buttons"] = [b.to_dict() for b in self.buttons]
-        self._d["attachment"]["payload"]["elements"] = [element]
-        return super(MediaTemplate, self).to_dict()
+        media_dict = self._media.to_dict()
+        element = dict(media_dict["attachment"]["payload"])
+        element["media_type"] = self._media.attachment_type
+        if self._buttons:
+            element["buttons"] = [b.to_dict() for b in self._buttons]
+        payload = super(MediaTemplate, self)._payload()
+        payload["elements"] = [element]
+        return payload
 
 
 class ButtonTemplate(ButtonMixin, BaseTemplate):
@@ -187,16 +229,19 @@ class ButtonTemplate(ButtonMixin, BaseTemplate):
     MIN_BUTTONS = 1
     MAX_BUTTONS = 3
 
+    text = cached_field("text")
+
     def __init__(self, text, buttons, quick_replies=None, **kwargs):
-        self.text = text
+        self._text = text
 
         super(ButtonTemplate, self).__init__(
             buttons=buttons, quick_replies=quick_replies, **kwargs
         )
 
-    def to_dict(self):
-        self._d["attachment"]["payload"]["text"] = self.text
-        return super(ButtonTemplate, self).to_dict()
+    def _payload(self):
+        payload = super(ButtonTemplate, self)._payload()
+        payload["text"] = self._text
+        return payload
 
 
 class ListTemplate(ButtonMixin, ElementMixin, BaseTemplate):
@@ -208,18 +253,21 @@ class ListTemplate(ButtonMixin, ElementMixin, BaseTemplate):
     MIN_ELEMENTS = 2
     MAX_ELEMENTS = 4
 
+    _child_lists = ("_buttons", "_elements")
+
+    top_element_style = cached_field("top_element_style")
+
     def __init__(self, elements, top_element_style=None, **kwargs):
-        self.top_element_style = top_element_style
+        self._top_element_style = top_element_style
 
         super(ListTemplate, self).__init__(elements=elements, **kwargs)
 
-    def to_dict(self):
-        if self.top_element_style:
-            self._d["attachment"]["payload"][
-                "top_element_style"
-            ] = self.top_element_style
+    def _payload(self):
+        payload = super(ListTemplate, self)._payload()
+        if self._top_element_style:
+            payload["top_element_style"] = self._top_element_style
 
-        return super(ListTemplate, self).to_dict()
+        return payload
 
 
 class ReceiptTemplate(ElementMixin, SharableMixin, BaseTemplate):
@@ -228,6 +276,18 @@ class ReceiptTemplate(ElementMixin, SharableMixin, BaseTemplate):
     MIN_ELEMENTS = 0
     MAX_ELEMENTS = 100
 
+    _child_lists = ("_elements", "_adjustments")
+
+    recipient_name = cached_field("recipient_name")
+    order_number = cached_field("order_number")
+    currency = cached_field("currency")
+    payment_method = cached_field("payment_method")
+    summary = cached_field("summary")
+    order_url = cached_field("order_url")
+    timestamp = cached_field("timestamp")
+    address = cached_field("address")
+    adjustments = cached_field("adjustments")
+
     def __init__(
         self,
         recipient_name,
@@ -244,40 +304,50 @@ class ReceiptTemplate(ElementMixin, SharableMixin, BaseTemplate):
         **kwargs
     ):
 
-        self.recipient_name = recipient_name
-        self.order_number = order_number
-        self.currency = currency
-        self.payment_method = payment_method
-        self.summary = summary.to_dict()
-        self.order_url = order_url
-        self.timestamp = timestamp
-        self.address = address
-        self.adjustments = adjustments
-        self.quick_replies = quick_replies
+        self._recipient_name = recipient_name
+        self._order_number = order_number
+        self._currency = currency
+        self._payment_method = payment_method
+        self._summary = summary.to_dict()
+        self._order_url = order_url
+        self._timestamp = timestamp
+        self._address = address
+        self._adjustments = adjustments
 
         super(ReceiptTemplate, self).__init__(
             elements=elements, quick_replies=quick_replies, **kwargs
         )
 
     def to_dict(self):
-        payload = {
-            "recipient_name": self.recipient_name,
-            "order_number": self.order_number,
-            "order_url": self.order_url,
-            "currency": self.currency,
-            "timestamp": self.timestamp,
-            "payment_method": self.payment_method,
-            "summary": self.summary,
-        }
+        # The address and adjustments have no cache to invalidate when they change
+        return self._render()
+
+    def _children(self):
+        children = super(ReceiptTemplate, self)._children()
+        if self._address:
+            children.append(self._address)
+        return children + list(self._adjustments or [])
+
+    def _payload(self):
+        payload = super(ReceiptTemplate, self)._payload()
+        payload.update(
+            {
+                "recipient_name": self._recipient_name,
+                "order_number": self._order_number,
+                "order_url": self._order_url,
+                "currency": self._currency,
+                "timestamp": self._timestamp,
+                "payment_method": self._payment_method,
+                "summary": self._summary,
+            }
+        )
 
-        if self.address:
-            payload["address"] = self.address.to_dict()
+        if self._address:
+            payload["address"] = self._address.to_dict()
 
-        if self.adjustments:
+        if self._adjustments:
             payload["adjustments"] = [
-                adjustment.to_dict() for adjustment in self.adjustments
+                adjustment.to_dict() for adjustment in self._adjustments
             ]
 
-        self._d["attachment"]["payload"].update(payload)
-
-        return super(ReceiptTemplate, self).to_dict()
+        return payload
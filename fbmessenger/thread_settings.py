@@ -1,13 +1,18 @@
 from __future__ import absolute_import
 
+from . import schema
 from .elements import WEBVIEW_HEIGHT_RATIOS
+from .serialization import JSONSerializable
 
 DEFAULT_LOCALE = "default"
 
 
-class GreetingText(object):
+class GreetingText(JSONSerializable):
+
+    __slots__ = ("text", "locale")
+
     def __init__(self, text, locale=None):
-        if len(text) > 160:
+        if not schema.trusted() and len(text) > schema.GREETING_MAX_LENGTH:
             raise ValueError("Text cannot be longer 160 characters.")
         self.text = text
         self.locale = locale or DEFAULT_LOCALE
@@ -19,7 +24,10 @@ class GreetingText(object):
         }
 
 
-class GetStartedButton(object):
+class GetStartedButton(JSONSerializable):
+
+    __slots__ = ("payload",)
+
     def __init__(self, payload):
         self.payload = payload
 
@@ -29,8 +37,21 @@ class GetStartedButton(object):
         }
 
 
-class PersistentMenuItem(object):
-    ITEM_TYPES = ["nested", "web_url", "postback"]
+class PersistentMenuItem(JSONSerializable):
+
+    __slots__ = (
+        "item_type",
+        "title",
+        "nested_items",
+        "url",
+        "fallback_url",
+        "messenger_extensions",
+        "webview_share_button",
+        "webview_height_ratio",
+        "payload",
+    )
+
+    ITEM_TYPES = schema.MENU_ITEM_TYPES
 
     def __init__(
         self,
@@ -44,47 +65,48 @@ class PersistentMenuItem(object):
         webview_share_button=None,
         webview_height_ratio=None,
     ):
-        if item_type not in self.ITEM_TYPES:
-            raise ValueError("Invalid item_type provided.")
-        if len(title) > 30:
-            raise ValueError("Title cannot be longer 30 characters.")
-        if payload and len(payload) > 1000:
-            raise ValueError("Payload cannot be longer 1000 characters.")
-        if item_type == "nested":
-            if not nested_items:
-                raise ValueError(
-                    "`nested_items` must be supplied for `nested` type menu items."
-                )
-            if len(nested_items) > 5:
-                raise ValueError("Cannot have more than 5 nested_items")
-        if item_type == "web_url":
-            if url is None:
-                raise ValueError(
-                    "`url` must be supplied for `web_url` type menu items."
-                )
-            if (
-                webview_height_ratio
-                and not webview_height_ratio in WEBVIEW_HEIGHT_RATIOS
-            ):
-                raise ValueError("Invalid webview_height_ratio provided.")
-        else:
-            if messenger_extensions is not None:
-                raise ValueError(
-                    "`messenger_extensions` is only valid for item type `web_url`"
-                )
-            if webview_share_button is not None:
+        if not schema.trusted():
+            if item_type not in self.ITEM_TYPES:
+                raise ValueError("Invalid item_type provided.")
+            if len(title) > schema.MENU_ITEM_TITLE_MAX_LENGTH:
+                raise ValueError("Title cannot be longer 30 characters.")
+            if payload and len(payload) > schema.PAYLOAD_MAX_LENGTH:
+                raise ValueError("Payload cannot be longer 1000 characters.")
+            if item_type == "nested":
+                if not nested_items:
+                    raise ValueError(
+                        "`nested_items` must be supplied for `nested` type menu items."
+                    )
+                if len(nested_items) > schema.MAX_NESTED_MENU_ITEMS:
+                    raise ValueError("Cannot have more than 5 nested_items")
+            if item_type == "web_url":
+                if url is None:
+                    raise ValueError(
+                        "`url` must be supplied for `web_url` type menu items."
+                    )
+                if (
+                    webview_height_ratio
+                    and not webview_height_ratio in WEBVIEW_HEIGHT_RATIOS
+                ):
+                    raise ValueError("Invalid webview_height_ratio provided.")
+            else:
+                if messenger_extensions is not None:
+                    raise ValueError(
+                        "`messenger_extensions` is only valid for item type `web_url`"
+                    )
+                if webview_share_button is not None:
+                    raise ValueError(
+                        "`webview_share_button` is only valid for item type `web_url`"
+                    )
+                if webview_height_ratio is not None:
+                    raise ValueError(
+                        "`webview_height_ratio` is only valid for item type `web_url`"
+                    )
+
+            if item_type == "postback" and payload is None:
                 raise ValueError(
-                    "`webview_share_button` is only valid for item type `web_url`"
+                    "`payload` must be supplied for `postback` type menu items."
                 )
-            if webview_height_ratio is not None:
-                raise ValueError(
-                    "`webview_height_ratio` is only valid for item type `web_url`"
-                )
-
-        if item_type == "postback" and payload is None:
-            raise ValueError(
-                "`payload` must be supplied for `postback` type menu items."
-            )
 
         self.item_type = item_type
         self.title = title
@@ -119,13 +141,16 @@ class PersistentMenuItem(object):
         return res
 
 
-class PersistentMenu(object):
+class PersistentMenu(JSONSerializable):
+
+    __slots__ = ("menu_items", "locale", "composer_input_disabled")
+
     def __init__(self, menu_items=None, locale=None, composer_input_disabled=None):
-        if composer_input_disabled != False:
+        if composer_input_disabled != False and not schema.trusted():
             if not menu_items:
                 raise ValueError("You must supply at least one menu_item.")
 
-            elif len(menu_items) > 3:
+            elif len(menu_items) > schema.MAX_MENU_ITEMS:
                 raise ValueError("You cannot have more than 3 menu_items in top level.")
 
         self.menu_items = menu_items
@@ -146,11 +171,21 @@ class PersistentMenu(object):
         return res
 
 
-class MessengerProfile(object):
-    def __init__(self, greetings=None, get_started=None, persistent_menus=None):
+class MessengerProfile(JSONSerializable):
+
+    __slots__ = ("greetings", "get_started", "persistent_menus", "whitelisted_domains")
+
+    def __init__(
+        self,
+        greetings=None,
+        get_started=None,
+        persistent_menus=None,
+        whitelisted_domains=None,
+    ):
         self.greetings = greetings
         self.get_started = get_started
         self.persistent_menus = persistent_menus
+        self.whitelisted_domains = whitelisted_domains
 
     def to_dict(self):
         res = {}
@@ -164,4 +199,7 @@ class MessengerProfile(object):
         if self.persistent_menus:
             res["persistent_menu"] = [item.to_dict() for item in self.persistent_menus]
 
+        if self.whitelisted_domains:
+            res["whitelisted_domains"] = list(self.whitelisted_domains)
+
         return res
@@ -0,0 +1,85 @@
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Text
+
+import numpy as np
+
+from recommendation_system.candidate_layer.base import BaseCandidateModel
+from recommendation_system.candidate_layer.ivf import DEFAULT_N_PROBE, IVFIndex
+
+DEFAULT_TOP_N = 50
+ITEMS_PATH = os.getenv("ITEMS_PATH")
+ITEM_EMBEDDINGS_PATH = os.getenv("ITEM_EMBEDDINGS_PATH")
+
+
+class ANNCandidateModel(BaseCandidateModel):
+    """
+    Returns the `top_n` items whose embeddings have the largest inner product
+    with the user's `vectors` feature, from an `IVFIndex`, with the inner
+    product as their `score`.
+
+    Items are dicts identified by `id_key`. By default they are loaded from
+    the JSON list at `ITEMS_PATH` and the embeddings from the .npz at
+    `ITEM_EMBEDDINGS_PATH`, with `ids` and `embeddings` arrays.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[Dict] = (),
+        embeddings: Optional[np.ndarray] = None,
+        top_n: int = DEFAULT_TOP_N,
+        n_lists: Optional[int] = None,
+        n_probe: int = DEFAULT_N_PROBE,
+        id_key: Text = "url",
+        items_path: Optional[Text] = ITEMS_PATH,
+        embeddings_path: Optional[Text] = ITEM_EMBEDDINGS_PATH,
+    ):
+        super().__init__()
+        self.top_n = top_n
+        self.id_key = id_key
+        if embeddings is None and items_path and embeddings_path:
+            items, embeddings = self._load(items_path, embeddings_path)
+        self._items: Dict[Text, Dict] = {item[id_key]: item for item in items}
+        self.index: Optional[IVFIndex] = None
+        if embeddings is not None and len(items):
+            self.index = IVFIndex.build(
+                [item[id_key] for item in items],
+                embeddings,
+                n_lists=n_lists,
+                n_probe=n_probe,
+            )
+
+    def _load(self, items_path: Text, embeddings_path: Text):
+        with open(items_path, encoding="utf8") as f:
+            items = {item[self.id_key]: item for item in json.load(f)}
+        with np.load(embeddings_path) as data:
+            ids, embeddings = data["ids"].tolist(), data["embeddings"]
+        # Only the items which have an embedding can be retrieved
+        rows = [row for row, item_id in enumerate(ids) if item_id in items]
+        return [items[ids[row]] for row in rows], embeddings[rows]
+
+    def add_items(self, items: Sequence[Dict], embeddings: np.ndarray) -> None:
+        """Adds newly published items, they are returned by the next searches."""
+        ids = [item[self.id_key] for item in items]
+        for item_id, item in zip(ids, items):
+            self._items[item_id] = item
+        if self.index is None:
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+            self.index = IVFIndex(embeddings.shape[1])
+        self.index.add(ids, embeddings)
+
+    def get_candidates(self, user_features: Dict) -> List[Dict]:
+        vector = user_features.get("vectors")
+        if vector is None or self.index is None:
+            return []
+        vector = np.asarray(vector, dtype=np.float32)
+        if vector.shape != (self.index.dimensions,):
+            raise ValueError(
+                f"User vectors have shape {vector.shape}, "
+                f"item embeddings have {self.index.dimensions} dimensions."
+            )
+        items = self._items
+        return [
+            dict(items[item_id], score=score)
+            for item_id, score in self.index.search(vector, self.top_n)
+        ]
@@ -6,3 +6,12 @@ class BaseCandidateModel(abc.ABC):
     @abc.abstractmethod
     def get_candidates(user_features: Dict) -> List[Dict]:
         pass
+
+    def get_candidates_batch(self, user_features_list: List[Dict]) -> List[List[Dict]]:
+        """
+        Returns the candidates of each user, override it to serve a batch of
+        users with one query or one matrix operation
+        """
+        return [
+            self.get_candidates(user_features) for user_features in user_features_list
+        ]
@@ -1,13 +1,24 @@
-from recommendation_system.candidate_layer.demo import DemoCandidateModel
 from recommendation_system.candidate_layer.base import BaseCandidateModel
+from recommendation_system.plugins import ModelPlugins
 from typing import Text
 
+candidate_model_plugins = ModelPlugins(
+    "Candidate", group="recommendation_system.candidate_models"
+)
+register_candidate_model = candidate_model_plugins.register
+
+candidate_model_plugins.register_lazy(
+    "demo", "recommendation_system.candidate_layer.demo:DemoCandidateModel"
+)
+candidate_model_plugins.register_lazy(
+    "ann", "recommendation_system.candidate_layer.ann:ANNCandidateModel"
+)
+candidate_model_plugins.register_lazy(
+    "tags", "recommendation_system.candidate_layer.tags:TagCandidateModel"
+)
+
 
 class CandidateFactory:
     @staticmethod
     def create(candidate_model_name: Text) -> BaseCandidateModel:
-        if candidate_model_name == "demo":
-            return DemoCandidateModel()
-        raise NotImplementedError(
-            f"Candidate model {candidate_model_name} is not implemented."
-        )
+        return candidate_model_plugins.create(candidate_model_name)
@@ -0,0 +1,172 @@
+import math
+import threading
+from typing import Dict, List, Optional, Sequence, Text, Tuple
+
+import numpy as np
+
+DEFAULT_N_PROBE = 8
+KMEANS_ITERATIONS = 10
+# k-means is trained on at most this many points per list
+TRAINING_POINTS_PER_LIST = 64
+
+
+class _InvertedList:
+    """
+    Vectors assigned to one centroid, in a preallocated array which doubles
+    when full. Rows are written before `size` is increased, so a search
+    reading `size` first only sees complete rows.
+    """
+
+    __slots__ = ("vectors", "positions", "size")
+
+    def __init__(self, dimensions: int, capacity: int = 16):
+        self.vectors = np.empty((capacity, dimensions), dtype=np.float32)
+        self.positions = np.empty(capacity, dtype=np.intp)
+        self.size = 0
+
+    def append(self, vectors: np.ndarray, positions: np.ndarray) -> None:
+        size, count = self.size, len(vectors)
+        if size + count > len(self.vectors):
+            capacity = max(2 * len(self.vectors), size + count)
+            grown = np.empty((capacity, self.vectors.shape[1]), dtype=np.float32)
+            grown[:size] = self.vectors[:size]
+            grown_positions = np.empty(capacity, dtype=np.intp)
+            grown_positions[:size] = self.positions[:size]
+            self.vectors, self.positions = grown, grown_positions
+        self.vectors[size : size + count] = vectors
+        self.positions[size : size + count] = positions
+        self.size = size + count
+
+
+def kmeans(
+    vectors: np.ndarray, n_clusters: int, iterations: int = KMEANS_ITERATIONS, seed=0
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = assign(vectors, centroids)
+        for cluster in range(n_clusters):
+            members = vectors[assignments == cluster]
+            if len(members):
+                centroids[cluster] = members.mean(axis=0)
+    return centroids
+
+
+def assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Returns the index of the nearest centroid of each vector."""
+    # |x - c|^2 without the |x|^2 term, which is the same for every centroid
+    distances = (centroids * centroids).sum(axis=1) - 2 * vectors @ centroids.T
+    return distances.argmin(axis=1)
+
+
+class IVFIndex:
+    """
+    Inverted file index for maximum inner product search.
+
+    Vectors are clustered with k-means, and a search only scores the vectors
+    of the `n_probe` clusters nearest to the query, so it reads roughly
+    `n_probe / n_lists` of the index. Vectors can be added at any time,
+    including while searching; they go to the nearest existing cluster. A
+    vector added with an id already in the index replaces the previous one.
+    """
+
+    def __init__(self, dimensions: int, n_probe: int = DEFAULT_N_PROBE):
+        self.dimensions = dimensions
+        self.n_probe = n_probe
+        self._set_centroids(np.zeros((1, dimensions), dtype=np.float32))
+        self._ids: List[Text] = []
+        self._positions: Dict[Text, int] = {}
+        # positions of replaced vectors, swapped for a new array on each add
+        self._removed = np.empty(0, dtype=np.intp)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(
+        cls,
+        ids: Sequence[Text],
+        vectors: np.ndarray,
+        n_lists: Optional[int] = None,
+        n_probe: int = DEFAULT_N_PROBE,
+        seed=0,
+    ) -> "IVFIndex":
+        """
+        Builds an index with `n_lists` clusters, by default the square root
+        of the number of vectors.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        index = cls(vectors.shape[1], n_probe=n_probe)
+        n_lists = n_lists or max(1, int(math.sqrt(len(vectors))))
+        if n_lists > 1:
+            rng = np.random.default_rng(seed)
+            sample_size = min(len(vectors), n_lists * TRAINING_POINTS_PER_LIST)
+            sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+            index._set_centroids(kmeans(sample, n_lists, seed=seed))
+        index.add(ids, vectors)
+        return index
+
+    def _set_centroids(self, centroids: np.ndarray) -> None:
+        self.centroids = centroids
+        self._centroid_norms = (centroids * centroids).sum(axis=1)
+        self._lists = [_InvertedList(self.dimensions) for _ in centroids]
+
+    def add(self, ids: Sequence[Text], vectors: np.ndarray) -> None:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(
+            -1, self.dimensions
+        )
+        if len(vectors) != len(ids):
+            raise ValueError("There must be one vector per id.")
+        with self._lock:
+            start = len(self._ids)
+            removed = []
+            for position, item_id in enumerate(ids, start):
+                previous = self._positions.get(item_id)
+                if previous is not None:
+                    removed.append(previous)
+                self._positions[item_id] = position
+            self._ids.extend(ids)
+            # Removed before the new vectors are added, so a concurrent
+            # search never returns an id twice
+            if removed:
+                self._removed = np.union1d(self._removed, removed)
+            positions = np.arange(start, start + len(ids))
+            assignments = assign(vectors, self.centroids)
+            for cluster in np.unique(assignments):
+                members = assignments == cluster
+                self._lists[cluster].append(vectors[members], positions[members])
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[Text, float]]:
+        """Returns up to `k` `(id, inner product)` pairs, best first."""
+        query = np.asarray(query, dtype=np.float32)
+        centroids = self.centroids
+        n_probe = min(self.n_probe, len(centroids))
+        distances = self._centroid_norms - 2 * centroids @ query
+        if n_probe < len(centroids):
+            probed = np.argpartition(distances, n_probe - 1)[:n_probe]
+        else:
+            probed = range(len(centroids))
+
+        scores, positions = [], []
+        for cluster in probed:
+            inverted_list = self._lists[cluster]
+            size = inverted_list.size
+            if size:
+                scores.append(inverted_list.vectors[:size] @ query)
+                positions.append(inverted_list.positions[:size])
+        if not scores:
+            return []
+        scores = np.concatenate(scores)
+        positions = np.concatenate(positions)
+        removed = self._removed
+        if len(removed):
+            live = ~np.isin(positions, removed)
+            scores, positions = scores[live], positions[live]
+            if not len(scores):
+                return []
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        ids = self._ids
+        return [(ids[positions[i]], float(scores[i])) for i in top]
@@ -0,0 +1,61 @@
+from itertools import zip_longest
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+DEFAULT_MAX_CANDIDATES = 1000
+# keys identifying an item, in order of preference
+ITEM_ID_KEYS = ("id", "url")
+
+
+def item_id(candidate: Dict) -> Optional[Hashable]:
+    for key in ITEM_ID_KEYS:
+        value = candidate.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def merge_candidates(
+    model_candidates: Sequence[Tuple[str, List[Dict]]],
+    max_candidates: Optional[int] = DEFAULT_MAX_CANDIDATES,
+) -> List[Dict]:
+    """
+    Merges the candidates of several models into one list with each item
+    once, identified by `item_id`.
+
+    Each merged item is a copy of the first candidate for it, with `sources`,
+    the names of all the models which returned it, and `source_scores`, the
+    `score` each model gave it, as features for the ranking models.
+
+    Models take turns contributing their next best candidate, so when the
+    list is capped at `max_candidates` every model is represented. Candidates
+    without an id are passed through unchanged.
+    """
+    merged: Dict[Hashable, Dict] = {}
+    result: List[Dict] = []
+    candidate_lists = [
+        [(name, candidate) for candidate in candidates]
+        for name, candidates in model_candidates
+    ]
+    for rank in zip_longest(*candidate_lists):
+        for entry in rank:
+            if entry is None:
+                continue
+            name, candidate = entry
+            key = item_id(candidate)
+            item = merged.get(key) if key is not None else None
+            if item is None:
+                if max_candidates is not None and len(result) >= max_candidates:
+                    continue
+                if key is None:
+                    result.append(candidate)
+                    continue
+                item = dict(candidate, sources=[], source_scores={})
+                item.pop("score", None)
+                merged[key] = item
+                result.append(item)
+            if name not in item["sources"]:
+                item["sources"].append(name)
+            score = candidate.get("score")
+            if score is not None:
+                item["source_scores"][name] = score
+    return result
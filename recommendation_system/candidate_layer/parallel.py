@@ -0,0 +1,152 @@
+import logging
+import time
+from concurrent.futures import TimeoutError
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Text,
+    Tuple,
+)
+
+from recommendation_system.candidate_layer.base import BaseCandidateModel
+from recommendation_system.concurrency import BoundedExecutor, ModelBusyError
+
+logger = logging.getLogger(__name__)
+
+CANDIDATE_WORKERS = 16
+# calls of one model still running past their deadline, after which the
+# model is skipped until they finish
+CANDIDATE_LATE_CALLS_PER_MODEL = 4
+DEFAULT_CANDIDATE_DEADLINE = 0.5
+
+_executor = BoundedExecutor(
+    CANDIDATE_WORKERS, CANDIDATE_LATE_CALLS_PER_MODEL, thread_name_prefix="candidates"
+)
+
+
+class CandidateResult(NamedTuple):
+    model_name: Text
+    # for batches, one list of candidates per user
+    candidates: List
+    # seconds spent in `get_candidates`, or the deadline if it was missed
+    elapsed: float
+    timed_out: bool = False
+    error: Optional[BaseException] = None
+
+
+def _timed(call: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = call()
+    return result, time.perf_counter() - start
+
+
+def get_candidates_batch(
+    model: BaseCandidateModel, user_features_list: List[Dict]
+) -> List[List[Dict]]:
+    """Calls `model.get_candidates_batch`, or `get_candidates` per user."""
+    if hasattr(model, "get_candidates_batch"):
+        return model.get_candidates_batch(user_features_list)
+    return [model.get_candidates(user_features) for user_features in user_features_list]
+
+
+def _fan_out(
+    calls: List[Tuple[Text, Callable[[], Any]]],
+    empty: Callable[[], Any],
+    deadline: float,
+    deadlines: Optional[Dict[Text, float]],
+) -> List[CandidateResult]:
+    deadlines = deadlines or {}
+    start = time.perf_counter()
+    results: Dict[int, CandidateResult] = {}
+    futures = []
+    for i, (name, call) in enumerate(calls):
+        try:
+            futures.append((name, _executor.submit(name, _timed, call)))
+        except ModelBusyError as e:
+            logger.warning("Candidate model %s skipped: %s", name, e)
+            results[i] = CandidateResult(name, empty(), 0.0, error=e)
+            futures.append((name, None))
+
+    # Waiting on the shortest deadlines first means no model is waited on
+    # past its own deadline
+    order = sorted(
+        (i for i in range(len(futures)) if futures[i][1] is not None),
+        key=lambda i: deadlines.get(futures[i][0], deadline),
+    )
+    for i in order:
+        name, future = futures[i]
+        model_deadline = deadlines.get(name, deadline)
+        remaining = max(0.0, start + model_deadline - time.perf_counter())
+        try:
+            candidates, elapsed = future.result(timeout=remaining)
+            results[i] = CandidateResult(name, candidates, elapsed)
+        except TimeoutError:
+            _executor.abandon(name, future)
+            logger.warning(
+                "Candidate model %s missed its %.3fs deadline.", name, model_deadline
+            )
+            results[i] = CandidateResult(name, empty(), model_deadline, timed_out=True)
+        except Exception as e:
+            logger.exception("Candidate model %s failed.", name)
+            results[i] = CandidateResult(
+                name, empty(), time.perf_counter() - start, error=e
+            )
+    return [results[i] for i in range(len(futures))]
+
+
+def generate_candidates(
+    models: Iterable[Tuple[Text, BaseCandidateModel]],
+    user_features: Dict,
+    deadline: float = DEFAULT_CANDIDATE_DEADLINE,
+    deadlines: Optional[Dict[Text, float]] = None,
+) -> List[CandidateResult]:
+    """
+    Calls `get_candidates` of every model concurrently and returns one result
+    per model, in the order of `models`.
+
+    A model which does not return within its deadline, `deadlines[name]` or
+    else `deadline` seconds, or which raises, gets an empty result instead of
+    holding up the others. Its call is cancelled if it has not started, and
+    otherwise keeps running on the pool with its result discarded. A model
+    with `CANDIDATE_LATE_CALLS_PER_MODEL` such calls still running is
+    skipped.
+    """
+    return _fan_out(
+        [
+            (name, lambda model=model: model.get_candidates(user_features))
+            for name, model in models
+        ],
+        list,
+        deadline,
+        deadlines,
+    )
+
+
+def generate_candidates_batch(
+    models: Iterable[Tuple[Text, BaseCandidateModel]],
+    user_features_list: List[Dict],
+    deadline: float = DEFAULT_CANDIDATE_DEADLINE,
+    deadlines: Optional[Dict[Text, float]] = None,
+) -> List[CandidateResult]:
+    """
+    Same as `generate_candidates` for a batch of users, with one call per
+    model for the whole batch. The candidates of each result are a list per
+    user, in the order of `user_features_list`.
+    """
+    return _fan_out(
+        [
+            (
+                name,
+                lambda model=model: get_candidates_batch(model, user_features_list),
+            )
+            for name, model in models
+        ],
+        lambda: [[] for _ in user_features_list],
+        deadline,
+        deadlines,
+    )
@@ -0,0 +1,211 @@
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Text, Tuple, Union
+
+import numpy as np
+
+# Postings are scored this many at a time per tag, doubling each round
+FIRST_BLOCK_SIZE = 64
+
+TagWeights = Union[Sequence[Text], Dict[Text, float]]
+
+
+def tag_weights(tags: Optional[TagWeights]) -> Dict[Text, float]:
+    """Returns `{tag: weight}` for a list of tags, which all weigh 1."""
+    if not tags:
+        return {}
+    if isinstance(tags, dict):
+        return {tag: float(weight) for tag, weight in tags.items()}
+    return {tag: 1.0 for tag in tags}
+
+
+class TagIndex:
+    """
+    Inverted index from tag to the positions of the items with the tag,
+    sorted by the tag's weight on the item, heaviest first.
+
+    The postings of all the tags are stored in two flat arrays, which `load`
+    memory-maps from the files written by `save`. Items added afterwards go
+    into a small in-memory index until `compact` merges them in.
+    """
+
+    def __init__(
+        self,
+        items: List[Dict],
+        offsets: Dict[Text, Tuple[int, int]],
+        positions: np.ndarray,
+        weights: np.ndarray,
+        id_key: Text = "url",
+    ):
+        self.id_key = id_key
+        self.items = items
+        self._base_size = len(items)
+        self._offsets = offsets
+        self._positions = positions
+        self._weights = weights
+        self._delta: Dict[Text, List[Tuple[int, float]]] = {}
+        self._removed: List[int] = []
+        self._item_positions = {item[id_key]: i for i, item in enumerate(items)}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, items: Iterable[Dict], id_key: Text = "url") -> "TagIndex":
+        """Builds an index of items with a `tags` list or `{tag: weight}` dict."""
+        items = list(items)
+        postings: Dict[Text, List[Tuple[float, int]]] = {}
+        for position, item in enumerate(items):
+            for tag, weight in tag_weights(item.get("tags")).items():
+                postings.setdefault(tag, []).append((weight, position))
+
+        offsets = {}
+        positions, weights = [], []
+        for tag, posting in postings.items():
+            posting.sort(key=lambda pair: (-pair[0], pair[1]))
+            offsets[tag] = (len(positions), len(posting))
+            weights += [weight for weight, _ in posting]
+            positions += [position for _, position in posting]
+        return cls(
+            items,
+            offsets,
+            np.array(positions, dtype=np.int32),
+            np.array(weights, dtype=np.float32),
+            id_key=id_key,
+        )
+
+    def save(self, directory: Text) -> None:
+        """
+        Writes the index, without the items added since it was built. Files
+        are replaced rather than overwritten, so indexes already loaded from
+        `directory` keep their memory-mapped postings.
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        def replace(name, write):
+            path = os.path.join(directory, name)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path)
+
+        replace("positions.npy", lambda f: np.save(f, self._positions))
+        replace("weights.npy", lambda f: np.save(f, self._weights))
+        replace(
+            "index.json",
+            lambda f: f.write(
+                json.dumps(
+                    {
+                        "id_key": self.id_key,
+                        "offsets": self._offsets,
+                        "items": self.items[: self._base_size],
+                    },
+                    ensure_ascii=False,
+                ).encode("utf8")
+            ),
+        )
+
+    @classmethod
+    def load(cls, directory: Text) -> "TagIndex":
+        with open(os.path.join(directory, "index.json"), encoding="utf8") as f:
+            data = json.load(f)
+        return cls(
+            data["items"],
+            {tag: tuple(offset) for tag, offset in data["offsets"].items()},
+            np.load(os.path.join(directory, "positions.npy"), mmap_mode="r"),
+            np.load(os.path.join(directory, "weights.npy"), mmap_mode="r"),
+            id_key=data["id_key"],
+        )
+
+    def __len__(self) -> int:
+        return len(self._item_positions)
+
+    def add_items(self, items: Iterable[Dict]) -> None:
+        """Adds new items, or replaces the items with the same ids."""
+        with self._lock:
+            for item in items:
+                position = len(self.items)
+                previous = self._item_positions.get(item[self.id_key])
+                if previous is not None:
+                    self._removed.append(previous)
+                for tag, weight in tag_weights(item.get("tags")).items():
+                    self._delta.setdefault(tag, []).append((position, weight))
+                self.items.append(item)
+                self._item_positions[item[self.id_key]] = position
+
+    def compact(self) -> "TagIndex":
+        """Returns a new index of the current items, without the in-memory part."""
+        with self._lock:
+            removed = set(self._removed)
+            items = [item for i, item in enumerate(self.items) if i not in removed]
+        return self.build(items, id_key=self.id_key)
+
+    def search(self, tags: TagWeights, k: int) -> List[Tuple[Dict, float]]:
+        """
+        Returns up to `k` `(item, score)` pairs with the highest sum of the
+        user's tag weight times the item's tag weight, best first.
+
+        Postings are scored in growing blocks, heaviest first, and the search
+        stops as soon as the rest of the postings cannot change which items
+        are in the top `k`.
+        """
+        weights = tag_weights(tags)
+        query = [
+            (weight, self._offsets[tag])
+            for tag, weight in weights.items()
+            if tag in self._offsets and weight > 0
+        ]
+        # Items may be added while searching, only the first n are searched
+        n = len(self.items)
+        scores = np.zeros(n, dtype=np.float32)
+        for tag, weight in weights.items():
+            for position, item_weight in self._delta.get(tag, ()):
+                if position < n:
+                    scores[position] += weight * item_weight
+        scores[self._removed[:]] = -np.inf
+
+        done = [0] * len(query)
+        block = FIRST_BLOCK_SIZE
+        while True:
+            remaining = 0.0
+            for i, (weight, (start, length)) in enumerate(query):
+                end = min(done[i] + block, length)
+                if done[i] < end:
+                    # Positions are unique within a posting list
+                    scores[self._positions[start + done[i] : start + end]] += (
+                        weight * self._weights[start + done[i] : start + end]
+                    )
+                    done[i] = end
+                if end < length:
+                    remaining += weight * float(self._weights[start + end])
+            block *= 2
+            if remaining == 0.0 or self._is_final(scores, k, remaining):
+                break
+
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        # The top k is final, but their scores may still miss postings which
+        # were not reached, so they are scored again from their own tags
+        results = []
+        for i in sorted(top):
+            if scores[i] == -np.inf:
+                continue
+            item = self.items[i]
+            score = sum(
+                weights.get(tag, 0.0) * item_weight
+                for tag, item_weight in tag_weights(item.get("tags")).items()
+            )
+            if score > 0:
+                results.append((item, score))
+        results.sort(key=lambda pair: -pair[1])
+        return results
+
+    @staticmethod
+    def _is_final(scores: np.ndarray, k: int, remaining: float) -> bool:
+        # Any item can gain at most `remaining`, so the top k can't change
+        # once the best item outside it can't catch up with the k-th
+        if k >= len(scores):
+            return False
+        top = np.partition(-scores, k)[: k + 1]
+        return -top[k] + remaining <= -top[:k].max()
@@ -0,0 +1,64 @@
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Text
+
+from recommendation_system.candidate_layer.base import BaseCandidateModel
+from recommendation_system.candidate_layer.tag_index import TagIndex
+
+DEFAULT_TOP_N = 50
+TAG_INDEX_PATH = os.getenv("TAG_INDEX_PATH")
+
+
+class TagCandidateModel(BaseCandidateModel):
+    """
+    Returns the `top_n` items sharing the most, and heaviest, tags with the
+    user's `tags` feature, from a `TagIndex`, with their tag score as
+    `score`.
+
+    The index is memory-mapped from `TAG_INDEX_PATH` when it is set. New
+    items are added with `add_items`, and `refresh` merges them into the
+    index files.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[Dict] = (),
+        top_n: int = DEFAULT_TOP_N,
+        id_key: Text = "url",
+        path: Optional[Text] = TAG_INDEX_PATH,
+    ):
+        super().__init__()
+        self.top_n = top_n
+        self.path = path
+        if not items and path and os.path.exists(os.path.join(path, "index.json")):
+            self.index = TagIndex.load(path)
+        else:
+            self.index = TagIndex.build(items, id_key=id_key)
+        self._refresh_lock = threading.Lock()
+
+    def add_items(self, items: Iterable[Dict]) -> None:
+        """Adds newly published items, or replaces items with the same id."""
+        self.index.add_items(items)
+
+    def refresh(self) -> None:
+        """
+        Rebuilds the index with the added items, and saves and reloads it
+        when it is stored on disk. Searches use the previous index until the
+        new one is swapped in.
+        """
+        with self._refresh_lock:
+            previous = self.index
+            size = len(previous.items)
+            index = previous.compact()
+            if self.path:
+                index.save(self.path)
+                index = TagIndex.load(self.path)
+            self.index = index
+            # Items added while the index was rebuilt
+            index.add_items(previous.items[size:])
+
+    def get_candidates(self, user_features: Dict) -> List[Dict]:
+        return [
+            dict(item, score=score)
+            for item, score in self.index.search(user_features.get("tags"), self.top_n)
+        ]
@@ -0,0 +1,47 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Text, Tuple
+
+from fbmessenger.builders import build_generic_templates
+from fbmessenger.templates import GenericTemplate
+
+CAROUSEL_CACHE_SIZE = 256
+
+CAROUSEL_FIELDS = ("title", "image_url", "subtitle", "url")
+
+CarouselKey = Tuple[Tuple[Text, Optional[Text], Optional[Text], Optional[Text]], ...]
+
+
+def render_carousel(items: List[Dict]) -> Optional[Dict]:
+    """
+    Renders the items returned by `RecommendationSystem.recommend` as a generic
+    template message, or returns None when there are no items. Identical
+    recommendations share one cached rendering, so the returned dict must not
+    be mutated.
+    """
+    if not items:
+        return None
+    return _render_carousel(_carousel_key(items))
+
+
+def _carousel_key(items: List[Dict]) -> CarouselKey:
+    return tuple(
+        tuple(item.get(field) for field in CAROUSEL_FIELDS)
+        for item in items[: GenericTemplate.MAX_ELEMENTS]
+    )
+
+
+@lru_cache(maxsize=CAROUSEL_CACHE_SIZE)
+def _render_carousel(key: CarouselKey) -> Dict:
+    records = [dict(zip(CAROUSEL_FIELDS, row)) for row in key]
+    return build_generic_templates(
+        records, default_action_key="url", buttons=_item_buttons
+    )[0]
+
+
+def _item_buttons(item: Dict) -> Optional[List[Dict]]:
+    if not item["url"]:
+        return None
+    return [
+        {"type": "web_url", "url": item["url"], "title": "View Website"},
+        {"type": "postback", "title": "Like", "payload": item["url"]},
+    ]
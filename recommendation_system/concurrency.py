@@ -0,0 +1,64 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Set, Text
+
+
+class ModelBusyError(RuntimeError):
+    pass
+
+
+class BoundedExecutor:
+    """
+    Thread pool which limits how many of its workers each model can tie up
+    with calls nobody is waiting for any more.
+
+    Calls are queued like on any pool. A caller which gives up on a call,
+    e.g. after its deadline, passes it to `abandon`: the call is cancelled
+    if it has not started, and otherwise counts as late until it finishes.
+    Submitting a call for a model with `max_late_calls_per_model` late calls
+    raises `ModelBusyError`, so a model which hangs holds at most that many
+    workers, while calls of healthy models are never rejected.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_late_calls_per_model: int,
+        thread_name_prefix: Text = "",
+    ):
+        self.max_late_calls_per_model = max_late_calls_per_model
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._late: Dict[Text, Set[Future]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, model_name: Text, fn: Callable, *args: Any) -> Future:
+        late = self.late_calls(model_name)
+        if late >= self.max_late_calls_per_model:
+            raise ModelBusyError(
+                f"Model {model_name} has {late} calls still running past "
+                "their deadline."
+            )
+        return self._executor.submit(fn, *args)
+
+    def abandon(self, model_name: Text, future: Future) -> None:
+        """Cancels a call whose result is not needed any more, or counts it as late."""
+        if future.cancel():
+            return
+        with self._lock:
+            self._late.setdefault(model_name, set()).add(future)
+        # Runs right away if the call finished in the meantime
+        future.add_done_callback(lambda _: self._finished(model_name, future))
+
+    def _finished(self, model_name: Text, future: Future) -> None:
+        with self._lock:
+            late = self._late.get(model_name)
+            if late is not None:
+                late.discard(future)
+                if not late:
+                    del self._late[model_name]
+
+    def late_calls(self, model_name: Text) -> int:
+        """Returns the number of abandoned calls of the model still running."""
+        return len(self._late.get(model_name, ()))
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from bisect import bisect_right
+from typing import Callable, Dict, List, NamedTuple, Optional, Text
+
+from recommendation_system.candidate_layer.merge import DEFAULT_MAX_CANDIDATES
+from recommendation_system.candidate_layer.parallel import DEFAULT_CANDIDATE_DEADLINE
+
+logger = logging.getLogger(__name__)
+
+# users are split into this many buckets, so weights have 0.01% steps
+BUCKETS = 10000
+DEFAULT_REFRESH_INTERVAL = 60
+EXPERIMENTS_PATH = os.getenv("EXPERIMENTS_PATH")
+
+DEFAULT_EXPERIMENT_CONFIG = {
+    "candidate_models": [
+        "demo",
+        # 'other candidate model for you guys to implement'
+    ],
+    "ranking_model": "demo",
+    # TODO: should replace base ranking model with your own!
+    # or a cascade of ranking models, each with a candidate budget
+    # and a latency budget in seconds, e.g.
+    # "ranking_cascade": [
+    #     {"model": "embedding", "candidates": 100, "latency": 0.05},
+    #     {"model": "diversity", "candidates": 10},
+    # ],
+    # seconds, per model overrides go in "candidate_deadlines"
+    "candidate_deadline": DEFAULT_CANDIDATE_DEADLINE,
+    # candidates left after merging the candidate models' results
+    "max_candidates": DEFAULT_MAX_CANDIDATES,
+}
+
+
+def bucket(recipient_id: Text, salt: Text) -> int:
+    """
+    Returns the recipient's bucket in `range(BUCKETS)` for an experiment,
+    the same in every process, unlike `hash`.
+    """
+    digest = hashlib.sha256(f"{salt}:{recipient_id}".encode("utf8")).digest()
+    return int.from_bytes(digest[:8], "big") % BUCKETS
+
+
+class Variant(NamedTuple):
+    name: Text
+    config: Dict
+
+
+class Experiment(NamedTuple):
+    name: Text
+    salt: Text
+    # exclusive upper bucket of each variant, users above the last one
+    # are not in the experiment
+    bounds: List[int]
+    variants: List[Variant]
+
+    @classmethod
+    def from_definition(cls, definition: Dict) -> "Experiment":
+        bounds, variants = [], []
+        total = 0.0
+        for variant in definition["variants"]:
+            total += variant["weight"]
+            bounds.append(round(total * BUCKETS / 100))
+            variants.append(Variant(variant["name"], variant.get("config", {})))
+        if total > 100:
+            raise ValueError(
+                f"Variants of experiment {definition['name']} weigh {total}%."
+            )
+        return cls(
+            definition["name"],
+            definition.get("salt", definition["name"]),
+            bounds,
+            variants,
+        )
+
+    def variant(self, recipient_id: Text) -> Optional[Variant]:
+        i = bisect_right(self.bounds, bucket(recipient_id, self.salt))
+        return self.variants[i] if i < len(self.variants) else None
+
+
+class Experiments(NamedTuple):
+    default: Dict
+    experiments: List[Experiment]
+
+    @classmethod
+    def from_definitions(cls, definitions: Dict) -> "Experiments":
+        return cls(
+            definitions.get("default", DEFAULT_EXPERIMENT_CONFIG),
+            [
+                Experiment.from_definition(definition)
+                for definition in definitions.get("experiments", [])
+            ],
+        )
+
+
+def file_loader(path: Text) -> Callable[[], Dict]:
+    def load() -> Dict:
+        with open(path, encoding="utf8") as f:
+            return json.load(f)
+
+    return load
+
+
+def default_loader() -> Dict:
+    """
+    TODO: load the experiment definitions from the database
+    """
+    if EXPERIMENTS_PATH:
+        return file_loader(EXPERIMENTS_PATH)()
+    return {"default": DEFAULT_EXPERIMENT_CONFIG}
+
+
+class ExperimentStore:
+    """
+    Keeps all the experiment definitions in memory, so resolving a user's
+    experiment config does no I/O.
+
+    Definitions are a dict with the `default` config and a list of
+    `experiments`, each with a `name` and `variants`, e.g.
+    `{"name": "cascade", "variants": [{"name": "control", "weight": 10},
+    {"name": "treatment", "weight": 10, "config": {"ranking_cascade": ...}}]}`.
+    Variant weights are percentages of users. Users are assigned to buckets
+    by hashing their id with the experiment's `salt`, its name by default,
+    and get the default config updated with the config of the variant of
+    each experiment they are in.
+
+    `start` loads the definitions and reloads them every `refresh_interval`
+    seconds in a background thread. A failed reload is logged and the
+    previous definitions are kept.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Dict] = default_loader,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
+        self._loader = loader
+        self.refresh_interval = refresh_interval
+        self._experiments: Optional[Experiments] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self) -> None:
+        experiments = Experiments.from_definitions(self._loader())
+        self._experiments = experiments
+
+    def start(self) -> None:
+        self.load()
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._refresh, name="experiments", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        self._stopped.set()
+        if thread is not None:
+            thread.join()
+
+    def _refresh(self) -> None:
+        while not self._stopped.wait(self.refresh_interval):
+            try:
+                self.load()
+            except Exception:
+                logger.exception("Failed to reload the experiment definitions.")
+
+    def _get_experiments(self) -> Experiments:
+        experiments = self._experiments
+        if experiments is None:
+            # Only when used before `start`, the first caller loads them
+            with self._lock:
+                if self._experiments is None:
+                    self.load()
+                experiments = self._experiments
+        return experiments
+
+    def configs(self) -> List[Dict]:
+        """
+        Returns the default config and the default config updated with each
+        variant's config, e.g. to preload all the models they use.
+        """
+        experiments = self._get_experiments()
+        configs = [dict(experiments.default)]
+        for experiment in experiments.experiments:
+            for variant in experiment.variants:
+                configs.append(dict(experiments.default, **variant.config))
+        return configs
+
+    def variants(self, recipient_id: Text) -> Dict[Text, Text]:
+        """Returns `{experiment: variant}` for the experiments the user is in."""
+        variants = {}
+        for experiment in self._get_experiments().experiments:
+            variant = experiment.variant(recipient_id)
+            if variant is not None:
+                variants[experiment.name] = variant.name
+        return variants
+
+    def config(self, recipient_id: Text) -> Dict:
+        experiments = self._get_experiments()
+        config = dict(experiments.default)
+        for experiment in experiments.experiments:
+            variant = experiment.variant(recipient_id)
+            if variant is not None:
+                config.update(variant.config)
+        return config
+
+
+experiments = ExperimentStore()
@@ -1,6 +1,24 @@
-from typing import Text, List, Dict
-from recommendation_system.candidate_layer.factory import CandidateFactory
-from recommendation_system.ranking_layer.factory import RankingFactory
+import json
+import logging
+from itertools import islice
+from typing import Text, List, Dict, Iterable, Iterator, Tuple
+from recommendation_system.candidate_layer.parallel import (
+    DEFAULT_CANDIDATE_DEADLINE,
+    CandidateResult,
+    generate_candidates,
+    generate_candidates_batch,
+)
+from recommendation_system.candidate_layer.merge import (
+    DEFAULT_MAX_CANDIDATES,
+    merge_candidates,
+)
+from recommendation_system.experiments import experiments
+from recommendation_system.model_registry import candidate_models, ranking_models
+from recommendation_system.ranking_layer.cascade import RankingCascade, rank_batch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
 
 
 class RecommendationSystem(object):
@@ -10,34 +28,118 @@ class RecommendationSystem(object):
         main logic is as follow:
         1. get experiment config
         2. get feature
-        3. use candidate layer to get candidates
-        4. use ranking layer to sort candidates
+        3. use candidate layer to get candidates, with all candidate models
+           running in parallel and any model missing its deadline left out,
+           then merge them so each item is ranked once
+        4. use ranking layer to sort candidates, with one model or a cascade
+           of models each ranking the candidates kept by the previous one
         5. filter out some posts or items according to compliance
         6. return the result
         """
         experiment_config: Dict = cls._load_experiment_config(recipient_id)
         user_features: Dict = cls._get_feature(recipient_id)
-        candidates: List[Dict] = []
-        for cancidate_model in cls._get_candidate_models(experiment_config):
-            candidates += cancidate_model.get_candidates(user_features)
-        # TODO: For now, it only support 1 ranking layer. We should suuport multiple ranking layers to sort at some point.
-        result = cls._get_ranking_model(experiment_config).rank(candidates)
+        candidate_results = generate_candidates(
+            zip(
+                experiment_config["candidate_models"],
+                cls._get_candidate_models(experiment_config),
+            ),
+            user_features,
+            deadline=experiment_config.get(
+                "candidate_deadline", DEFAULT_CANDIDATE_DEADLINE
+            ),
+            deadlines=experiment_config.get("candidate_deadlines"),
+        )
+        cls._record_candidate_timings(recipient_id, candidate_results)
+        candidates: List[Dict] = merge_candidates(
+            [
+                (candidate_result.model_name, candidate_result.candidates)
+                for candidate_result in candidate_results
+            ],
+            max_candidates=experiment_config.get(
+                "max_candidates", DEFAULT_MAX_CANDIDATES
+            ),
+        )
+        result = cls._rank(
+            cls._get_ranking_model(experiment_config), [candidates], [user_features]
+        )[0]
         filtered_result = cls._filter(result)
         return filtered_result
 
+    @classmethod
+    def recommend_batch(
+        cls, recipient_ids: Iterable[Text], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[Tuple[Text, List[Dict]]]:
+        """
+        Yields `(recipient_id, result)` for each recipient, as soon as the
+        batch of recipients it is in has been ranked.
+
+        For each batch of `batch_size` recipients the features are fetched
+        with one call, and the recipients sharing an experiment config go
+        through each candidate and ranking model with one call per model.
+        Within a batch, results are grouped by experiment config rather than
+        in the order of `recipient_ids`.
+        """
+        recipient_ids = iter(recipient_ids)
+        while True:
+            batch = list(islice(recipient_ids, batch_size))
+            if not batch:
+                return
+            yield from cls._recommend_batch(batch)
+
+    @classmethod
+    def _recommend_batch(
+        cls, recipient_ids: List[Text]
+    ) -> Iterator[Tuple[Text, List[Dict]]]:
+        groups: Dict[Text, Tuple[Dict, List[Text]]] = {}
+        for recipient_id in recipient_ids:
+            experiment_config = cls._load_experiment_config(recipient_id)
+            key = json.dumps(experiment_config, sort_keys=True)
+            groups.setdefault(key, (experiment_config, []))[1].append(recipient_id)
+        features: Dict[Text, Dict] = cls._get_features(recipient_ids)
+
+        for experiment_config, group in groups.values():
+            user_features_list = [features[recipient_id] for recipient_id in group]
+            candidate_results = generate_candidates_batch(
+                zip(
+                    experiment_config["candidate_models"],
+                    cls._get_candidate_models(experiment_config),
+                ),
+                user_features_list,
+                deadline=experiment_config.get(
+                    "candidate_deadline", DEFAULT_CANDIDATE_DEADLINE
+                ),
+                deadlines=experiment_config.get("candidate_deadlines"),
+            )
+            cls._record_batch_candidate_timings(group, candidate_results)
+            max_candidates = experiment_config.get(
+                "max_candidates", DEFAULT_MAX_CANDIDATES
+            )
+            candidates_list: List[List[Dict]] = [
+                merge_candidates(
+                    [
+                        (candidate_result.model_name, candidate_result.candidates[i])
+                        for candidate_result in candidate_results
+                    ],
+                    max_candidates=max_candidates,
+                )
+                for i in range(len(group))
+            ]
+
+            results = cls._rank(
+                cls._get_ranking_model(experiment_config),
+                candidates_list,
+                user_features_list,
+            )
+            for recipient_id, result in zip(group, results):
+                yield recipient_id, cls._filter(result)
+
     @staticmethod
-    def _load_experiment_config(recipient_id):
+    def _load_experiment_config(recipient_id: Text) -> Dict:
         """
-        TODO: just an example, we should load experiment config from database
+        Resolves the user's experiment config from the definitions kept in
+        memory by `experiments`, without any I/O
         """
-        return {
-            "candidate_models": [
-                "demo",
-                # 'other candidate model for you guys to implement'
-            ],
-            "ranking_model": "demo",
-            # TODO: should replace base ranking model with your own!
-        }
+        return experiments.config(recipient_id)
 
     @staticmethod
     def _get_feature(recipient_id: Text) -> Dict:
@@ -59,21 +161,86 @@ class RecommendationSystem(object):
             "vectors": [0, 0, 0],
         }
 
-    @staticmethod
-    def _get_candidate_models(experiment_config: Dict):
+    @classmethod
+    def preload_models(cls, experiment_config: Dict) -> None:
         """
-        TODO: should only return candidate models specified in experiment_config
+        Loads the models of an experiment config, so the first requests using
+        them don't pay for loading them
         """
+        candidate_models.preload(experiment_config["candidate_models"])
+        if "ranking_cascade" in experiment_config:
+            ranking_models.preload(
+                stage["model"] for stage in experiment_config["ranking_cascade"]
+            )
+        else:
+            ranking_models.preload([experiment_config["ranking_model"]])
+
+    @classmethod
+    def _get_features(cls, recipient_ids: List[Text]) -> Dict[Text, Dict]:
+        """
+        TODO: Get the features of all the users with one query to BigQuery or Postgres
+        """
+        return {
+            recipient_id: cls._get_feature(recipient_id)
+            for recipient_id in recipient_ids
+        }
+
+    @staticmethod
+    def _get_candidate_models(experiment_config: Dict):
         return [
-            CandidateFactory.create(candidate_model_name=candidate_model_name)
+            candidate_models.get(candidate_model_name)
             for candidate_model_name in experiment_config["candidate_models"]
         ]
 
+    @staticmethod
+    def _record_candidate_timings(
+        recipient_id: Text, candidate_results: List[CandidateResult]
+    ) -> None:
+        """
+        TODO: send the timings to the metrics backend instead of the log
+        """
+        for candidate_result in candidate_results:
+            logger.debug(
+                "Candidate model %s took %.2fms for %s: %d candidates%s",
+                candidate_result.model_name,
+                candidate_result.elapsed * 1000,
+                recipient_id,
+                len(candidate_result.candidates),
+                " (timed out)" if candidate_result.timed_out else "",
+            )
+
+    @staticmethod
+    def _record_batch_candidate_timings(
+        recipient_ids: List[Text], candidate_results: List[CandidateResult]
+    ) -> None:
+        """
+        Same as `_record_candidate_timings` for one call per model for the
+        whole batch, with the total number of candidates
+        """
+        for candidate_result in candidate_results:
+            logger.debug(
+                "Candidate model %s took %.2fms for %d recipients: %d candidates%s",
+                candidate_result.model_name,
+                candidate_result.elapsed * 1000,
+                len(recipient_ids),
+                sum(len(candidates) for candidates in candidate_result.candidates),
+                " (timed out)" if candidate_result.timed_out else "",
+            )
+
     @staticmethod
     def _get_ranking_model(experiment_config: Dict):
-        # TODO: For now, it only return 1 ranking model. We should implement multiple ranking models to sort at some point.
+        if "ranking_cascade" in experiment_config:
+            return RankingCascade.from_config(
+                experiment_config["ranking_cascade"], ranking_models.get
+            )
         ranking_model_name = experiment_config["ranking_model"]
-        return RankingFactory.create(ranking_model_name=ranking_model_name)
+        return ranking_models.get(ranking_model_name)
+
+    @staticmethod
+    def _rank(
+        ranking_model, candidates_list: List[List[Dict]], user_features_list: List[Dict]
+    ) -> List[List[Dict]]:
+        return rank_batch(ranking_model, candidates_list, user_features_list)
 
     @staticmethod
     def _filter(result: List[Dict]) -> List[Dict]:
@@ -86,5 +253,6 @@ class RecommendationSystem(object):
 
 
 if __name__ == "__main__":
+    experiments.start()
     result = RecommendationSystem.recommend(recipient_id="1413683625375061")
     print(result)
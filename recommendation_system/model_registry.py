@@ -0,0 +1,63 @@
+import threading
+from typing import Any, Callable, Dict, Iterable, Text
+
+from recommendation_system.candidate_layer.factory import CandidateFactory
+from recommendation_system.ranking_layer.factory import RankingFactory
+
+
+class ModelRegistry:
+    """
+    Keeps one shared instance of each named model, created with `factory` the
+    first time it is requested or when it is preloaded at startup.
+
+    `reload` builds the new instance before swapping it in, so requests keep
+    being served by the previous instance while a model loads, and requests
+    already holding the previous instance finish with it.
+    """
+
+    def __init__(self, factory: Callable[[Text], Any]):
+        self._factory = factory
+        self._models: Dict[Text, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: Text) -> Any:
+        try:
+            return self._models[name]
+        except KeyError:
+            pass
+        with self._lock:
+            # Another thread may have loaded it while we waited for the lock
+            if name not in self._models:
+                self._models[name] = self._factory(name)
+            return self._models[name]
+
+    def preload(self, names: Iterable[Text]) -> None:
+        for name in names:
+            self.get(name)
+
+    def reload(self, name: Text) -> Any:
+        model = self._factory(name)
+        self._models[name] = model
+        return model
+
+    def set(self, name: Text, model: Any) -> None:
+        """Installs an already loaded model, e.g. a new version of it."""
+        self._models[name] = model
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def __contains__(self, name: Text) -> bool:
+        return name in self._models
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+
+candidate_models = ModelRegistry(
+    lambda name: CandidateFactory.create(candidate_model_name=name)
+)
+ranking_models = ModelRegistry(
+    lambda name: RankingFactory.create(ranking_model_name=name)
+)
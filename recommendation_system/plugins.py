@@ -0,0 +1,82 @@
+import importlib
+import threading
+from typing import Callable, Dict, List, Optional, Text, Type
+
+
+def _entry_points(group: Text) -> Dict[Text, Text]:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return {}
+    try:
+        selected = entry_points(group=group)
+    except TypeError:
+        # Python < 3.10
+        selected = entry_points().get(group, [])
+    return {entry_point.name: entry_point.value for entry_point in selected}
+
+
+class ModelPlugins:
+    """
+    Maps model names to model classes.
+
+    Models are registered with the `register` decorator, or by import path
+    with `register_lazy` or a `group` entry point, in which case their module
+    is only imported the first time the model is created. This keeps heavy
+    dependencies of models no experiment uses from ever being imported.
+    """
+
+    def __init__(self, kind: Text, group: Optional[Text] = None):
+        self.kind = kind
+        self.group = group
+        self._classes: Dict[Text, Type] = {}
+        self._paths: Dict[Text, Text] = {}
+        self._entry_points_loaded = group is None
+        self._lock = threading.Lock()
+
+    def register(self, name: Text) -> Callable[[Type], Type]:
+        def decorator(model_class: Type) -> Type:
+            self._classes[name] = model_class
+            return model_class
+
+        return decorator
+
+    def register_lazy(self, name: Text, path: Text) -> None:
+        """
+        Registers the model class at `path`, `"package.module:ClassName"`,
+        without importing it.
+        """
+        self._paths[name] = path
+
+    def _load_entry_points(self) -> None:
+        with self._lock:
+            if not self._entry_points_loaded:
+                for name, path in _entry_points(self.group).items():
+                    self._paths.setdefault(name, path)
+                self._entry_points_loaded = True
+
+    def get(self, name: Text) -> Type:
+        try:
+            return self._classes[name]
+        except KeyError:
+            pass
+        if name not in self._paths and not self._entry_points_loaded:
+            self._load_entry_points()
+        try:
+            path = self._paths[name]
+        except KeyError:
+            raise NotImplementedError(
+                f"{self.kind} model {name} is not implemented."
+            ) from None
+        module_name, _, attribute = path.partition(":")
+        model_class = getattr(importlib.import_module(module_name), attribute)
+        self._classes[name] = model_class
+        return model_class
+
+    def create(self, name: Text):
+        return self.get(name)()
+
+    def names(self) -> List[Text]:
+        if not self._entry_points_loaded:
+            self._load_entry_points()
+        return sorted(set(self._classes) | set(self._paths))
@@ -6,3 +6,12 @@ class BaseRankingModel(abc.ABC):
     @abc.abstractmethod
     def rank(user_features: Dict) -> List[Dict]:
         pass
+
+    def rank_batch(
+        self, candidates_list: List[List[Dict]], user_features_list: List[Dict]
+    ) -> List[List[Dict]]:
+        """
+        Returns the ranked candidates of each user, override it to score a
+        whole batch at once
+        """
+        return [self.rank(candidates) for candidates in candidates_list]
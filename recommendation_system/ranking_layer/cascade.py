@@ -0,0 +1,129 @@
+import logging
+import time
+from concurrent.futures import TimeoutError
+from typing import Callable, Dict, List, NamedTuple, Optional, Text
+
+from recommendation_system.concurrency import BoundedExecutor, ModelBusyError
+
+logger = logging.getLogger(__name__)
+
+RANKING_WORKERS = 8
+# calls of one stage's model still running past their latency budget, after
+# which the stage is skipped until they finish
+RANKING_LATE_CALLS_PER_MODEL = 2
+
+_executor = BoundedExecutor(
+    RANKING_WORKERS, RANKING_LATE_CALLS_PER_MODEL, thread_name_prefix="ranking"
+)
+
+
+def rank_batch(
+    model, candidates_list: List[List[Dict]], user_features_list: List[Dict]
+) -> List[List[Dict]]:
+    """Calls `model.rank_batch`, or `rank` per user."""
+    if hasattr(model, "rank_batch"):
+        return model.rank_batch(candidates_list, user_features_list)
+    return [model.rank(candidates) for candidates in candidates_list]
+
+
+class RankingStage(NamedTuple):
+    model_name: Text
+    model: object
+    # number of candidates the stage keeps, all of them if None
+    candidates: Optional[int] = None
+    # seconds, after which the stage is skipped and its input passed on
+    latency: Optional[float] = None
+
+
+class RankingCascade:
+    """
+    Ranks candidates with a sequence of models, each ranking only the
+    candidates kept by the previous one, e.g. a cheap pre-ranker cutting
+    thousands of candidates down to hundreds, an expensive ranker for those,
+    and a re-ranker diversifying the final list.
+
+    A stage which runs over its latency budget is skipped: its input, cut
+    down to its candidate budget, goes to the next stage. The stage's call is
+    cancelled if it has not started, and otherwise keeps running on the pool
+    with its result discarded. A stage whose model has
+    `RANKING_LATE_CALLS_PER_MODEL` such calls still running is skipped the
+    same way.
+    """
+
+    def __init__(self, stages: List[RankingStage]):
+        if not stages:
+            raise ValueError("A ranking cascade needs at least one stage.")
+        self.stages = stages
+
+    @classmethod
+    def from_config(
+        cls, stage_configs: List[Dict], get_model: Callable[[Text], object]
+    ) -> "RankingCascade":
+        """
+        Builds a cascade from the `ranking_cascade` list of an experiment
+        config, e.g. `[{"model": "embedding", "candidates": 100,
+        "latency": 0.05}, {"model": "diversity", "candidates": 10}]`.
+        """
+        return cls(
+            [
+                RankingStage(
+                    stage["model"],
+                    get_model(stage["model"]),
+                    candidates=stage.get("candidates"),
+                    latency=stage.get("latency"),
+                )
+                for stage in stage_configs
+            ]
+        )
+
+    def rank(self, candidates: List[Dict], user_features: Optional[Dict] = None):
+        return self.rank_batch([candidates], [user_features])[0]
+
+    def rank_batch(
+        self, candidates_list: List[List[Dict]], user_features_list: List[Dict]
+    ) -> List[List[Dict]]:
+        for stage in self.stages:
+            start = time.perf_counter()
+            candidates_list = self._run_stage(
+                stage, candidates_list, user_features_list
+            )
+            if stage.candidates is not None:
+                candidates_list = [
+                    candidates[: stage.candidates] for candidates in candidates_list
+                ]
+            logger.debug(
+                "Ranking stage %s took %.2fms",
+                stage.model_name,
+                (time.perf_counter() - start) * 1000,
+            )
+        return candidates_list
+
+    @staticmethod
+    def _run_stage(
+        stage: RankingStage,
+        candidates_list: List[List[Dict]],
+        user_features_list: List[Dict],
+    ) -> List[List[Dict]]:
+        if stage.latency is None:
+            return rank_batch(stage.model, candidates_list, user_features_list)
+        try:
+            future = _executor.submit(
+                stage.model_name,
+                rank_batch,
+                stage.model,
+                candidates_list,
+                user_features_list,
+            )
+        except ModelBusyError as e:
+            logger.warning("Ranking stage %s skipped: %s", stage.model_name, e)
+            return candidates_list
+        try:
+            return future.result(timeout=stage.latency)
+        except TimeoutError:
+            _executor.abandon(stage.model_name, future)
+            logger.warning(
+                "Ranking stage %s missed its %.3fs latency budget.",
+                stage.model_name,
+                stage.latency,
+            )
+            return candidates_list
@@ -0,0 +1,60 @@
+from typing import Dict, FrozenSet, List, Text
+
+from recommendation_system.ranking_layer.base import BaseRankingModel
+
+DEFAULT_RELEVANCE_WEIGHT = 0.7
+
+
+class DiversityRankingModel(BaseRankingModel):
+    """
+    Re-ranks candidates with maximal marginal relevance: each next item is
+    the one with the best mix of relevance, taken from its position in the
+    input, and dissimilarity, the Jaccard distance of its `key` values, to
+    the items already picked.
+
+    Meant as the last stage of a `RankingCascade`, as it is quadratic in the
+    number of candidates.
+    """
+
+    def __init__(
+        self, relevance_weight: float = DEFAULT_RELEVANCE_WEIGHT, key: Text = "tags"
+    ):
+        super().__init__()
+        self.relevance_weight = relevance_weight
+        self.key = key
+
+    def _features(self, candidate: Dict) -> FrozenSet:
+        value = candidate.get(self.key)
+        if value is None:
+            return frozenset()
+        if isinstance(value, (str, int)):
+            return frozenset([value])
+        return frozenset(value)
+
+    def rank(self, candidates: List[Dict]) -> List[Dict]:
+        if len(candidates) < 3:
+            return list(candidates)
+        features = [self._features(candidate) for candidate in candidates]
+        relevance = [1 - i / len(candidates) for i in range(len(candidates))]
+        remaining = list(range(len(candidates)))
+        # highest similarity to any picked item, per candidate
+        similarity = [0.0] * len(candidates)
+        picked: List[int] = []
+        while remaining:
+            best = max(
+                remaining,
+                key=lambda i: self.relevance_weight * relevance[i]
+                - (1 - self.relevance_weight) * similarity[i],
+            )
+            remaining.remove(best)
+            picked.append(best)
+            if features[best]:
+                for i in remaining:
+                    if features[i]:
+                        overlap = len(features[i] & features[best])
+                        if overlap:
+                            similarity[i] = max(
+                                similarity[i],
+                                overlap / len(features[i] | features[best]),
+                            )
+        return [candidates[i] for i in picked]
@@ -0,0 +1,137 @@
+import os
+from typing import Dict, List, Optional, Sequence, Text
+
+import numpy as np
+
+from recommendation_system.ranking_layer.base import BaseRankingModel
+
+ITEM_EMBEDDINGS_PATH = os.getenv("ITEM_EMBEDDINGS_PATH")
+
+
+class EmbeddingRankingModel(BaseRankingModel):
+    """
+    Ranks candidates by the dot product of the user's `vectors` feature with
+    the item embeddings, kept as one contiguous float32 matrix with a row
+    per item.
+
+    Candidates are matched to rows by `id_key`. Candidates without an
+    embedding rank after all the others. All candidates are returned unless
+    `top_k` is set, as a cascade stage cuts them to its `candidates` budget.
+    """
+
+    def __init__(
+        self,
+        item_ids: Sequence[Text] = (),
+        embeddings: Optional[np.ndarray] = None,
+        top_k: Optional[int] = None,
+        id_key: Text = "url",
+        path: Optional[Text] = ITEM_EMBEDDINGS_PATH,
+    ):
+        super().__init__()
+        self.top_k = top_k
+        self.id_key = id_key
+        if embeddings is None and path:
+            with np.load(path) as data:
+                item_ids, embeddings = data["ids"].tolist(), data["embeddings"]
+        self.set_items(item_ids, embeddings)
+
+    def set_items(
+        self, item_ids: Sequence[Text], embeddings: Optional[np.ndarray]
+    ) -> None:
+        if embeddings is None:
+            embeddings = np.zeros((0, 0), dtype=np.float32)
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or len(embeddings) != len(item_ids):
+            raise ValueError("embeddings must have one row per item id.")
+        self._rows: Dict[Text, int] = {
+            item_id: row for row, item_id in enumerate(item_ids)
+        }
+        self._embeddings = embeddings
+
+    def _rows_of(self, candidates: List[Dict]) -> np.ndarray:
+        rows, id_key = self._rows, self.id_key
+        return np.array(
+            [rows.get(candidate.get(id_key), -1) for candidate in candidates],
+            dtype=np.intp,
+        )
+
+    def _user_vector(self, user_features: Optional[Dict]) -> Optional[np.ndarray]:
+        vector = (user_features or {}).get("vectors")
+        if vector is None or not len(self._embeddings):
+            return None
+        vector = np.asarray(vector, dtype=np.float32)
+        if vector.shape != (self._embeddings.shape[1],):
+            raise ValueError(
+                f"User vectors have shape {vector.shape}, "
+                f"item embeddings have {self._embeddings.shape[1]} dimensions."
+            )
+        return vector
+
+    def _top_k(self, candidates: List[Dict], scores: np.ndarray) -> List[Dict]:
+        k = len(candidates)
+        if self.top_k is not None:
+            k = min(self.top_k, k)
+        if k == 0:
+            return []
+        if k < len(candidates):
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            top = np.argsort(-scores, kind="stable")
+        return [candidates[i] for i in top]
+
+    def _score(self, rows: np.ndarray, scored_rows: np.ndarray) -> np.ndarray:
+        scores = np.full(len(rows), -np.inf, dtype=np.float32)
+        known = rows >= 0
+        scores[known] = scored_rows
+        return scores
+
+    def rank(self, candidates: List[Dict], user_features: Optional[Dict] = None):
+        return self.rank_batch([candidates], [user_features])[0]
+
+    def rank_batch(
+        self,
+        candidates_list: List[List[Dict]],
+        user_features_list: List[Optional[Dict]],
+    ) -> List[List[Dict]]:
+        """
+        Scores the union of the batch's candidates against all the users with
+        one matrix product, then sorts each user's candidates, keeping the
+        top k if `top_k` is set.
+        """
+        users = [
+            (i, vector)
+            for i, vector in enumerate(map(self._user_vector, user_features_list))
+            if vector is not None
+        ]
+        results = [candidates[: self.top_k] for candidates in candidates_list]
+        if not users:
+            return results
+
+        rows_list = [self._rows_of(candidates_list[i]) for i, _ in users]
+        known = [rows[rows >= 0] for rows in rows_list]
+        if len(users) == 1:
+            (i, vector), rows = users[0], rows_list[0]
+            if len(known[0]) * 4 > len(self._embeddings):
+                # Scoring every item reads the matrix sequentially, which is
+                # cheaper than gathering most of its rows
+                scores = (self._embeddings @ vector)[known[0]]
+            else:
+                scores = self._embeddings[known[0]] @ vector
+            results[i] = self._top_k(candidates_list[i], self._score(rows, scores))
+            return results
+
+        union, inverse = np.unique(np.concatenate(known), return_inverse=True)
+        # (items in the batch, users) scores
+        scores = self._embeddings[union] @ np.stack([vector for _, vector in users]).T
+
+        offset = 0
+        for column, ((i, _), rows, user_known) in enumerate(
+            zip(users, rows_list, known)
+        ):
+            positions = inverse[offset : offset + len(user_known)]
+            offset += len(user_known)
+            results[i] = self._top_k(
+                candidates_list[i], self._score(rows, scores[positions, column])
+            )
+        return results
@@ -1,13 +1,24 @@
-from recommendation_system.ranking_layer.demo import DemoRankingModel
 from recommendation_system.ranking_layer.base import BaseRankingModel
+from recommendation_system.plugins import ModelPlugins
 from typing import Text
 
+ranking_model_plugins = ModelPlugins(
+    "Ranking", group="recommendation_system.ranking_models"
+)
+register_ranking_model = ranking_model_plugins.register
+
+ranking_model_plugins.register_lazy(
+    "demo", "recommendation_system.ranking_layer.demo:DemoRankingModel"
+)
+ranking_model_plugins.register_lazy(
+    "embedding", "recommendation_system.ranking_layer.embedding:EmbeddingRankingModel"
+)
+ranking_model_plugins.register_lazy(
+    "diversity", "recommendation_system.ranking_layer.diversity:DiversityRankingModel"
+)
+
 
 class RankingFactory:
     @staticmethod
     def create(ranking_model_name: Text) -> BaseRankingModel:
-        if ranking_model_name == "demo":
-            return DemoRankingModel()
-        raise NotImplementedError(
-            f"Ranking model {ranking_model_name} is not implemented."
-        )
+        return ranking_model_plugins.create(ranking_model_name)
@@ -0,0 +1,12 @@
+import pytest
+
+from recommendation_system.model_registry import candidate_models, ranking_models
+
+
+@pytest.fixture(autouse=True)
+def clear_model_registries():
+    candidate_models.clear()
+    ranking_models.clear()
+    yield
+    candidate_models.clear()
+    ranking_models.clear()
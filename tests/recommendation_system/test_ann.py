@@ -0,0 +1,124 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from recommendation_system.candidate_layer.ann import ANNCandidateModel
+from recommendation_system.candidate_layer.factory import CandidateFactory
+from recommendation_system.candidate_layer.ivf import IVFIndex
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((2000, 8), dtype=np.float32)
+
+
+def exact_top(vectors, query, k):
+    return [str(i) for i in np.argsort(-(vectors @ query))[:k]]
+
+
+def test_search_with_all_lists_probed_is_exact(vectors):
+    index = IVFIndex.build([str(i) for i in range(len(vectors))], vectors, n_lists=16)
+    index.n_probe = 16
+    query = vectors[3]
+    result = index.search(query, 5)
+    assert [item_id for item_id, _ in result] == exact_top(vectors, query, 5)
+    assert [score for _, score in result] == sorted(
+        (score for _, score in result), reverse=True
+    )
+
+
+def test_search_recall(vectors):
+    index = IVFIndex.build([str(i) for i in range(len(vectors))], vectors)
+    queries = vectors[:50]
+    recall = np.mean(
+        [
+            len(
+                {item_id for item_id, _ in index.search(q, 10)}
+                & set(exact_top(vectors, q, 10))
+            )
+            / 10
+            for q in queries
+        ]
+    )
+    assert recall > 0.5
+
+
+def test_incremental_add(vectors):
+    index = IVFIndex.build([str(i) for i in range(100)], vectors[:100], n_lists=4)
+    index.n_probe = 4
+    index.add(["new"], vectors[100] * 100)
+    assert len(index) == 101
+    assert index.search(vectors[100], 1)[0][0] == "new"
+
+
+def test_add_while_searching(vectors):
+    index = IVFIndex.build([str(i) for i in range(100)], vectors[:100], n_lists=4)
+
+    def add(i):
+        index.add([f"new {i}"], vectors[100 + i])
+
+    with ThreadPoolExecutor(4) as pool:
+        searches = [pool.submit(index.search, vectors[i], 10) for i in range(200)]
+        list(pool.map(add, range(500)))
+        assert all(len(search.result()) == 10 for search in searches)
+    assert len(index) == 600
+
+
+def items(n):
+    return [
+        {"title": f"Talk {i}", "url": f"https://tw.pycon.org/{i}"} for i in range(n)
+    ]
+
+
+def test_ann_candidate_model(vectors):
+    model = ANNCandidateModel(items(2000), vectors, top_n=3, n_probe=64)
+    candidates = model.get_candidates({"vectors": vectors[7]})
+    assert [c["url"] for c in candidates] == [
+        f"https://tw.pycon.org/{i}" for i in exact_top(vectors, vectors[7], 3)
+    ]
+    assert model.get_candidates({}) == []
+    with pytest.raises(ValueError):
+        model.get_candidates({"vectors": [0, 0, 0]})
+
+
+def test_ann_candidate_model_add_items():
+    model = ANNCandidateModel(top_n=1)
+    assert model.get_candidates({"vectors": [1, 0]}) == []
+    model.add_items([{"title": "New talk", "url": "u"}], [[1, 0]])
+    assert model.get_candidates({"vectors": [1, 0]}) == [
+        {"title": "New talk", "url": "u", "score": 1.0}
+    ]
+
+
+def test_ann_candidate_model_replaces_items():
+    model = ANNCandidateModel(items(3), np.eye(3), top_n=3)
+    model.add_items(
+        [{"title": "Updated", "url": "https://tw.pycon.org/0"}], [[1, 0, 0]]
+    )
+    candidates = model.get_candidates({"vectors": [1, 0.5, 0.1]})
+    assert [c["title"] for c in candidates] == ["Updated", "Talk 1", "Talk 2"]
+    assert len(model.index) == 3
+
+
+def test_ann_candidate_model_from_files(tmp_path, vectors):
+    items_path = tmp_path / "items.json"
+    items_path.write_text(json.dumps(items(10)))
+    embeddings_path = str(tmp_path / "embeddings.npz")
+    ids = [item["url"] for item in items(12)]
+    np.savez(embeddings_path, ids=np.array(ids), embeddings=vectors[:12])
+
+    model = ANNCandidateModel(
+        top_n=1, items_path=str(items_path), embeddings_path=embeddings_path
+    )
+    assert len(model.index) == 10
+    (candidate,) = model.get_candidates({"vectors": vectors[2] * 10})
+    assert candidate == dict(items(10)[2], score=candidate["score"])
+    assert candidate["score"] == pytest.approx(vectors[2] @ vectors[2] * 10)
+
+
+def test_registered():
+    assert isinstance(CandidateFactory.create("ann"), ANNCandidateModel)
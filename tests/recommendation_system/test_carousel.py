@@ -0,0 +1,63 @@
+from recommendation_system.carousel import render_carousel
+
+items = [
+    {
+        "title": "2021 PyCon TW x PyHug Meetup",
+        "image_url": "https://pbs.twimg.com/media/E_Skh8MVQAUmPHm.jpg",
+        "subtitle": "PyHug",
+        "url": "https://www.youtube.com/watch?v=S_1WBzXFyBs",
+    },
+    {"title": "No link", "subtitle": "Subtitle"},
+]
+
+
+def test_render_carousel():
+    assert render_carousel(items) == {
+        "attachment": {
+            "type": "template",
+            "payload": {
+                "template_type": "generic",
+                "sharable": False,
+                "elements": [
+                    {
+                        "title": "2021 PyCon TW x PyHug Meetup",
+                        "image_url": "https://pbs.twimg.com/media/E_Skh8MVQAUmPHm.jpg",
+                        "subtitle": "PyHug",
+                        "default_action": {
+                            "type": "web_url",
+                            "url": "https://www.youtube.com/watch?v=S_1WBzXFyBs",
+                            "webview_height_ratio": "tall",
+                        },
+                        "buttons": [
+                            {
+                                "type": "web_url",
+                                "title": "View Website",
+                                "url": "https://www.youtube.com/watch?v=S_1WBzXFyBs",
+                            },
+                            {
+                                "type": "postback",
+                                "title": "Like",
+                                "payload": "https://www.youtube.com/watch?v=S_1WBzXFyBs",
+                            },
+                        ],
+                    },
+                    {"title": "No link", "subtitle": "Subtitle"},
+                ],
+            },
+        }
+    }
+
+
+def test_render_carousel_is_cached():
+    assert render_carousel(items) is render_carousel([dict(item) for item in items])
+    assert render_carousel(items) is not render_carousel(items[:1])
+
+
+def test_render_carousel_max_elements():
+    many = [{"title": "title {}".format(i)} for i in range(12)]
+    elements = render_carousel(many)["attachment"]["payload"]["elements"]
+    assert len(elements) == 10
+
+
+def test_render_carousel_without_items():
+    assert render_carousel([]) is None
@@ -0,0 +1,137 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from recommendation_system.main import RecommendationSystem
+from recommendation_system.ranking_layer.cascade import (
+    RANKING_LATE_CALLS_PER_MODEL,
+    RankingCascade,
+    RankingStage,
+)
+from recommendation_system.ranking_layer.diversity import DiversityRankingModel
+from recommendation_system.ranking_layer.factory import RankingFactory
+
+
+class ReverseModel:
+    def __init__(self):
+        self.sizes = []
+
+    def rank(self, candidates):
+        self.sizes.append(len(candidates))
+        return candidates[::-1]
+
+
+class BlockedModel:
+    def __init__(self):
+        self.release = threading.Event()
+
+        self.calls = 0
+
+    def rank(self, candidates):
+        self.calls += 1
+        self.release.wait(5)
+        return []
+
+
+def items(n):
+    return [{"id": i} for i in range(n)]
+
+
+def test_each_stage_ranks_the_survivors_of_the_previous_one():
+    pre, ranker = ReverseModel(), ReverseModel()
+    cascade = RankingCascade(
+        [RankingStage("pre", pre, candidates=50), RankingStage("ranker", ranker, 5)]
+    )
+    assert cascade.rank(items(1000)) == [{"id": i} for i in range(950, 955)]
+    assert pre.sizes == [1000]
+    assert ranker.sizes == [50]
+
+
+def test_stage_over_latency_budget_is_skipped():
+    blocked = BlockedModel()
+    cascade = RankingCascade(
+        [
+            RankingStage("slow", blocked, candidates=3, latency=0.05),
+            RankingStage("reverse", ReverseModel()),
+        ]
+    )
+    try:
+        assert cascade.rank_batch([items(10)], [{}]) == [
+            [{"id": 2}, {"id": 1}, {"id": 0}]
+        ]
+    finally:
+        blocked.release.set()
+
+
+def test_stage_at_its_call_limit_is_skipped():
+    blocked = BlockedModel()
+    cascade = RankingCascade([RankingStage("hanging", blocked, latency=0.05)])
+    try:
+        for _ in range(RANKING_LATE_CALLS_PER_MODEL + 1):
+            assert cascade.rank(items(3)) == items(3)
+    finally:
+        blocked.release.set()
+    assert blocked.calls == RANKING_LATE_CALLS_PER_MODEL
+
+
+class SlowReverseModel:
+    def rank(self, candidates):
+        time.sleep(0.05)
+        return candidates[::-1]
+
+
+def test_concurrent_requests_to_a_healthy_stage():
+    cascade = RankingCascade([RankingStage("healthy", SlowReverseModel(), latency=1)])
+    with ThreadPoolExecutor(max_workers=8) as requests:
+        results = list(requests.map(lambda _: cascade.rank(items(3)), range(8)))
+    assert results == [items(3)[::-1]] * 8
+
+
+def test_from_config():
+    models = {"pre": ReverseModel(), "final": ReverseModel()}
+    cascade = RankingCascade.from_config(
+        [{"model": "pre", "candidates": 10, "latency": 0.1}, {"model": "final"}],
+        models.__getitem__,
+    )
+    assert cascade.stages == [
+        RankingStage("pre", models["pre"], 10, 0.1),
+        RankingStage("final", models["final"], None, None),
+    ]
+    with pytest.raises(ValueError):
+        RankingCascade([])
+
+
+def test_diversity_ranking_model():
+    candidates = [
+        {"id": 0, "tags": ["ML"]},
+        {"id": 1, "tags": ["ML"]},
+        {"id": 2, "tags": ["web"]},
+        {"id": 3},
+    ]
+    ranked = DiversityRankingModel(relevance_weight=0.5).rank(candidates)
+    assert [c["id"] for c in ranked] == [0, 2, 3, 1]
+    assert DiversityRankingModel(relevance_weight=1).rank(candidates) == candidates
+    assert isinstance(RankingFactory.create("diversity"), DiversityRankingModel)
+
+
+def test_recommend_with_ranking_cascade(monkeypatch):
+    monkeypatch.setattr(
+        RecommendationSystem,
+        "_load_experiment_config",
+        staticmethod(
+            lambda v: {
+                "candidate_models": ["demo"],
+                "ranking_cascade": [
+                    {"model": "demo", "candidates": 3},
+                    {"model": "diversity", "candidates": 2},
+                ],
+            }
+        ),
+    )
+    result = RecommendationSystem.recommend("1234")
+    assert [item["title"] for item in result] == [
+        "2021 PyCon TW x PyHug Meetup",
+        "#7 | FAANG 工作環境跟外面有什麼不一樣？想進入 FAANG 就要聽這集！- Kir Chou",
+    ]
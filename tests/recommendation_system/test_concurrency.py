@@ -0,0 +1,46 @@
+import threading
+import time
+
+import pytest
+
+from recommendation_system.concurrency import BoundedExecutor, ModelBusyError
+
+
+def test_bounded_executor_queues_healthy_calls():
+    executor = BoundedExecutor(max_workers=2, max_late_calls_per_model=1)
+    futures = [executor.submit("healthy", time.sleep, 0.01) for _ in range(8)]
+    for future in futures:
+        future.result(1)
+    assert executor.late_calls("healthy") == 0
+
+
+def test_bounded_executor_limits_late_calls_per_model():
+    executor = BoundedExecutor(max_workers=4, max_late_calls_per_model=2)
+    release = threading.Event()
+    futures = [executor.submit("slow", release.wait, 5) for _ in range(2)]
+    # Running calls only count once they are abandoned
+    executor.submit("slow", lambda: 0).result(1)
+    for future in futures:
+        executor.abandon("slow", future)
+    assert executor.late_calls("slow") == 2
+    with pytest.raises(ModelBusyError):
+        executor.submit("slow", release.wait, 5)
+    assert executor.submit("fast", lambda: 1).result(1) == 1
+
+    release.set()
+    for future in futures:
+        future.result(1)
+    assert executor.late_calls("slow") == 0
+    assert executor.submit("slow", lambda: 2).result(1) == 2
+
+
+def test_bounded_executor_cancels_abandoned_queued_calls():
+    executor = BoundedExecutor(max_workers=1, max_late_calls_per_model=1)
+    release = threading.Event()
+    running = executor.submit("a", release.wait, 5)
+    queued = executor.submit("b", lambda: 1)
+    executor.abandon("b", queued)
+    assert queued.cancelled()
+    assert executor.late_calls("b") == 0
+    release.set()
+    running.result(1)
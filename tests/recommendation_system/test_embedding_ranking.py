@@ -0,0 +1,79 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from recommendation_system.ranking_layer.cascade import RankingCascade
+from recommendation_system.ranking_layer.embedding import EmbeddingRankingModel
+from recommendation_system.ranking_layer.factory import RankingFactory
+
+ids = ["a", "b", "c", "d"]
+embeddings = [[1, 0], [0, 1], [1, 1], [-1, 0]]
+
+
+@pytest.fixture
+def model():
+    return EmbeddingRankingModel(ids, embeddings, top_k=3)
+
+
+def candidates(*names):
+    return [{"url": name} for name in names]
+
+
+def test_rank(model):
+    ranked = model.rank(candidates("a", "b", "c", "d"), {"vectors": [1, 0.5]})
+    assert ranked == candidates("c", "a", "b")
+
+
+def test_unknown_items_rank_last(model):
+    ranked = model.rank(candidates("x", "d", "b"), {"vectors": [1, 0]})
+    assert ranked == candidates("b", "d", "x")
+
+
+def test_without_user_vector(model):
+    assert model.rank(candidates("d", "a", "b", "c"), {}) == candidates("d", "a", "b")
+
+
+def test_ranks_all_candidates_without_top_k():
+    many_ids = [str(i) for i in range(12)]
+    model = EmbeddingRankingModel(many_ids, [[i] for i in range(12)])
+    ranked = model.rank(candidates(*many_ids), {"vectors": [1]})
+    assert ranked == candidates(*reversed(many_ids))
+
+
+def test_cascade_stage_budget():
+    many_ids = [str(i) for i in range(12)]
+    model = EmbeddingRankingModel(many_ids, [[i] for i in range(12)])
+    cascade = RankingCascade.from_config(
+        [{"model": "embedding", "candidates": 11}], lambda name: model
+    )
+    ranked = cascade.rank(candidates(*many_ids), {"vectors": [-1]})
+    assert ranked == candidates(*many_ids[:11])
+
+
+def test_vector_dimensions_must_match(model):
+    with pytest.raises(ValueError):
+        model.rank(candidates("a"), {"vectors": [0, 0, 0]})
+
+
+def test_rank_batch_matches_rank(model):
+    candidates_list = [candidates("a", "b", "c"), candidates("b", "d", "x"), []]
+    features_list = [{"vectors": [0, 1]}, {"vectors": [-1, 0]}, {"vectors": [1, 1]}]
+    assert model.rank_batch(candidates_list, features_list) == [
+        model.rank(c, f) for c, f in zip(candidates_list, features_list)
+    ]
+
+
+def test_embeddings_are_contiguous_float32(model):
+    assert model._embeddings.dtype == np.float32
+    assert model._embeddings.flags.c_contiguous
+
+
+def test_load_from_file(tmp_path):
+    path = str(tmp_path / "items.npz")
+    np.savez(path, ids=np.array(ids), embeddings=np.array(embeddings))
+    model = EmbeddingRankingModel(path=path, top_k=1)
+    assert model.rank(candidates("a", "b"), {"vectors": [0, 1]}) == candidates("b")
+
+
+def test_registered():
+    assert isinstance(RankingFactory.create("embedding"), EmbeddingRankingModel)
@@ -0,0 +1,140 @@
+import json
+import threading
+
+import mock
+import pytest
+
+from recommendation_system.experiments import (
+    BUCKETS,
+    ExperimentStore,
+    bucket,
+    file_loader,
+)
+from recommendation_system.main import RecommendationSystem
+
+DEFINITIONS = {
+    "default": {"candidate_models": ["demo"], "ranking_model": "demo"},
+    "experiments": [
+        {
+            "name": "ranking",
+            "variants": [
+                {"name": "control", "weight": 25},
+                {
+                    "name": "embedding",
+                    "weight": 25,
+                    "config": {"ranking_model": "embedding"},
+                },
+            ],
+        },
+        {
+            "name": "candidates",
+            "variants": [
+                {
+                    "name": "tags",
+                    "weight": 100,
+                    "config": {"candidate_models": ["tags"]},
+                }
+            ],
+        },
+    ],
+}
+
+
+def test_bucket():
+    assert bucket("1234", "ranking") == bucket("1234", "ranking")
+    assert 0 <= bucket("1234", "ranking") < BUCKETS
+    buckets = {bucket(str(i), "ranking") for i in range(1000)}
+    assert len(buckets) > 900
+
+
+def test_experiment_store_config():
+    loader = mock.Mock(return_value=DEFINITIONS)
+    store = ExperimentStore(loader)
+    configs = [store.config(str(i)) for i in range(2000)]
+    loader.assert_called_once_with()
+
+    assert all(config["candidate_models"] == ["tags"] for config in configs)
+    embedding = sum(config["ranking_model"] == "embedding" for config in configs)
+    assert 400 < embedding < 600
+    for i, config in enumerate(configs[:100]):
+        variants = store.variants(str(i))
+        assert variants["candidates"] == "tags"
+        assert (variants.get("ranking") == "embedding") == (
+            config["ranking_model"] == "embedding"
+        )
+    assert DEFINITIONS["default"]["ranking_model"] == "demo"
+
+
+def test_experiment_store_configs():
+    store = ExperimentStore(lambda: DEFINITIONS)
+    default = DEFINITIONS["default"]
+    assert store.configs() == [
+        default,
+        default,
+        dict(default, ranking_model="embedding"),
+        dict(default, candidate_models=["tags"]),
+    ]
+
+
+def test_experiment_store_salt_reshuffles_users():
+    def definitions(salt):
+        return {
+            "experiments": [
+                {"name": "e", "salt": salt, "variants": [{"name": "v", "weight": 50}]}
+            ]
+        }
+
+    a = ExperimentStore(lambda: definitions("a"))
+    b = ExperimentStore(lambda: definitions("b"))
+    ids = [str(i) for i in range(100)]
+    assert [a.variants(i) for i in ids] != [b.variants(i) for i in ids]
+
+
+def test_experiment_store_rejects_weights_over_100():
+    store = ExperimentStore(
+        lambda: {
+            "experiments": [{"name": "e", "variants": [{"name": "v", "weight": 101}]}]
+        }
+    )
+    with pytest.raises(ValueError):
+        store.load()
+
+
+def test_experiment_store_refreshes_in_background(tmp_path):
+    path = tmp_path / "experiments.json"
+    path.write_text(json.dumps({"default": {"ranking_model": "a"}}))
+    loaded = threading.Event()
+    load = file_loader(str(path))
+
+    def loader():
+        try:
+            return load()
+        finally:
+            loaded.set()
+
+    store = ExperimentStore(loader, refresh_interval=0.01)
+    store.start()
+    try:
+        assert store.config("1") == {"ranking_model": "a"}
+
+        path.write_text("{")
+        loaded.clear()
+        assert loaded.wait(1)
+        # A failed reload keeps the previous definitions
+        assert store.config("1") == {"ranking_model": "a"}
+
+        path.write_text(json.dumps({"default": {"ranking_model": "b"}}))
+        for _ in range(100):
+            loaded.clear()
+            assert loaded.wait(1)
+            if store.config("1") == {"ranking_model": "b"}:
+                break
+        assert store.config("1") == {"ranking_model": "b"}
+    finally:
+        store.stop()
+
+
+def test_load_experiment_config_uses_store(monkeypatch):
+    store = ExperimentStore(lambda: DEFINITIONS)
+    monkeypatch.setattr("recommendation_system.main.experiments", store)
+    assert RecommendationSystem._load_experiment_config("1") == store.config("1")
@@ -0,0 +1,49 @@
+from recommendation_system.candidate_layer.merge import item_id, merge_candidates
+
+
+def test_item_id():
+    assert item_id({"id": 1, "url": "a"}) == 1
+    assert item_id({"url": "a"}) == "a"
+    assert item_id({"title": "a"}) is None
+
+
+def test_merge_candidates_dedupes_with_provenance():
+    merged = merge_candidates(
+        [
+            ("ann", [{"url": "a", "score": 0.9}, {"url": "b", "score": 0.5}]),
+            ("tags", [{"url": "b", "score": 3.0}, {"url": "c"}]),
+        ]
+    )
+    assert merged == [
+        {"url": "a", "sources": ["ann"], "source_scores": {"ann": 0.9}},
+        {
+            "url": "b",
+            "sources": ["tags", "ann"],
+            "source_scores": {"tags": 3.0, "ann": 0.5},
+        },
+        {"url": "c", "sources": ["tags"], "source_scores": {}},
+    ]
+
+
+def test_merge_candidates_does_not_modify_candidates():
+    candidate = {"url": "a", "score": 1.0}
+    merge_candidates([("ann", [candidate]), ("tags", [candidate])])
+    assert candidate == {"url": "a", "score": 1.0}
+
+
+def test_merge_candidates_cap_interleaves_models():
+    merged = merge_candidates(
+        [
+            ("ann", [{"url": f"ann {i}"} for i in range(5)]),
+            ("tags", [{"url": f"tags {i}"} for i in range(5)] + [{"url": "ann 0"}]),
+        ],
+        max_candidates=4,
+    )
+    assert [c["url"] for c in merged] == ["ann 0", "tags 0", "ann 1", "tags 1"]
+    # items over the cap still add provenance to the merged items
+    assert merged[0]["sources"] == ["ann", "tags"]
+
+
+def test_merge_candidates_without_id():
+    candidates = [{"title": "title 0"}, {"title": "title 0"}]
+    assert merge_candidates([("demo", candidates)]) == candidates
@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from recommendation_system.candidate_layer.demo import DemoCandidateModel
+from recommendation_system.main import RecommendationSystem
+from recommendation_system.model_registry import ModelRegistry, candidate_models
+
+
+class Model:
+    def __init__(self, name, version):
+        self.name = name
+        self.version = version
+
+
+def counting_factory():
+    calls = []
+
+    def factory(name):
+        calls.append(name)
+        return Model(name, len(calls))
+
+    return factory, calls
+
+
+def test_get_creates_each_model_once():
+    factory, calls = counting_factory()
+    registry = ModelRegistry(factory)
+    with ThreadPoolExecutor(8) as pool:
+        models = list(pool.map(registry.get, ["a"] * 50 + ["b"] * 50))
+    assert sorted(calls) == ["a", "b"]
+    assert all(model is registry.get(model.name) for model in models)
+
+
+def test_reload_swaps_instance():
+    factory, calls = counting_factory()
+    registry = ModelRegistry(factory)
+    old = registry.get("a")
+    new = registry.reload("a")
+    assert new is not old
+    assert new.version == 2
+    assert registry.get("a") is new
+
+
+def test_set_and_clear():
+    registry = ModelRegistry(lambda name: Model(name, 1))
+    model = Model("a", 3)
+    registry.set("a", model)
+    assert registry.get("a") is model
+    registry.clear()
+    assert "a" not in registry
+    assert len(registry) == 0
+
+
+def test_recommend_reuses_models():
+    RecommendationSystem.preload_models(
+        {"candidate_models": ["demo"], "ranking_model": "demo"}
+    )
+    model = candidate_models.get("demo")
+    assert isinstance(model, DemoCandidateModel)
+    assert RecommendationSystem._get_candidate_models(
+        {"candidate_models": ["demo"]}
+    ) == [model]
@@ -0,0 +1,100 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from recommendation_system.candidate_layer.parallel import (
+    CANDIDATE_LATE_CALLS_PER_MODEL,
+    generate_candidates,
+)
+from recommendation_system.concurrency import ModelBusyError
+
+
+class StaticModel:
+    def __init__(self, title):
+        self.title = title
+
+    def get_candidates(self, features):
+        return [{"title": self.title}]
+
+
+class BlockedModel:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def get_candidates(self, features):
+        self.release.wait(5)
+        return [{"title": "late"}]
+
+
+class SlowModel:
+    def get_candidates(self, features):
+        time.sleep(0.05)
+        return [{"title": "slow"}]
+
+
+class FailingModel:
+    def get_candidates(self, features):
+        raise RuntimeError("boom")
+
+
+def test_generate_candidates_keeps_model_order():
+    results = generate_candidates(
+        [("a", StaticModel("a")), ("b", StaticModel("b"))], {}, deadline=1
+    )
+    assert [r.model_name for r in results] == ["a", "b"]
+    assert [r.candidates for r in results] == [[{"title": "a"}], [{"title": "b"}]]
+    assert all(r.elapsed >= 0 and not r.timed_out for r in results)
+
+
+def test_slow_model_is_dropped():
+    blocked = BlockedModel()
+    try:
+        results = generate_candidates(
+            [("slow", blocked), ("fast", StaticModel("fast"))],
+            {},
+            deadline=1,
+            deadlines={"slow": 0.05},
+        )
+    finally:
+        blocked.release.set()
+    assert results[0].timed_out
+    assert results[0].candidates == []
+    assert results[0].elapsed == 0.05
+    assert results[1].candidates == [{"title": "fast"}]
+
+
+def test_failing_model_is_dropped():
+    results = generate_candidates(
+        [("failing", FailingModel()), ("ok", StaticModel("ok"))], {}, deadline=1
+    )
+    assert isinstance(results[0].error, RuntimeError)
+    assert results[0].candidates == []
+    assert results[1].candidates == [{"title": "ok"}]
+
+
+def test_hanging_model_is_skipped_at_its_call_limit():
+    blocked = BlockedModel()
+    try:
+        for _ in range(CANDIDATE_LATE_CALLS_PER_MODEL):
+            (result,) = generate_candidates([("slow", blocked)], {}, deadline=0.05)
+            assert result.timed_out
+        results = generate_candidates(
+            [("slow", blocked), ("fast", StaticModel("fast"))], {}, deadline=1
+        )
+    finally:
+        blocked.release.set()
+    assert isinstance(results[0].error, ModelBusyError)
+    assert results[0].candidates == []
+    assert results[1].candidates == [{"title": "fast"}]
+
+
+def test_concurrent_requests_to_a_healthy_model():
+    model = SlowModel()
+    with ThreadPoolExecutor(max_workers=8) as requests:
+        results = list(
+            requests.map(
+                lambda _: generate_candidates([("healthy", model)], {}, deadline=1),
+                range(8),
+            )
+        )
+    assert [result.candidates for (result,) in results] == [[{"title": "slow"}]] * 8
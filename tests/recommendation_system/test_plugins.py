@@ -0,0 +1,53 @@
+import sys
+
+import mock
+import pytest
+
+from recommendation_system.candidate_layer.demo import DemoCandidateModel
+from recommendation_system.candidate_layer.factory import CandidateFactory
+from recommendation_system.plugins import ModelPlugins
+from recommendation_system.ranking_layer.demo import DemoRankingModel
+from recommendation_system.ranking_layer.factory import RankingFactory
+
+
+def test_factories_create_demo_models():
+    assert isinstance(CandidateFactory.create("demo"), DemoCandidateModel)
+    assert isinstance(RankingFactory.create("demo"), DemoRankingModel)
+
+
+def test_unknown_model():
+    with pytest.raises(NotImplementedError, match="Candidate model unknown"):
+        CandidateFactory.create("unknown")
+
+
+def test_register_decorator():
+    plugins = ModelPlugins("Test")
+
+    @plugins.register("mine")
+    class MyModel:
+        pass
+
+    assert isinstance(plugins.create("mine"), MyModel)
+    assert plugins.names() == ["mine"]
+
+
+def test_register_lazy_imports_on_first_use(monkeypatch, tmp_path):
+    tmp_path.joinpath("lazy_test_model.py").write_text("class LazyModel:\n    pass\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_test_model", raising=False)
+    plugins = ModelPlugins("Test")
+    plugins.register_lazy("lazy", "lazy_test_model:LazyModel")
+    assert "lazy_test_model" not in sys.modules
+    assert type(plugins.create("lazy")).__name__ == "LazyModel"
+    assert "lazy_test_model" in sys.modules
+
+
+def test_entry_points():
+    with mock.patch(
+        "recommendation_system.plugins._entry_points",
+        return_value={"fraction": "fractions:Fraction"},
+    ) as entry_points:
+        plugins = ModelPlugins("Test", group="test.models")
+        assert plugins.create("fraction") == 0
+        assert plugins.names() == ["fraction"]
+    entry_points.assert_called_once_with("test.models")
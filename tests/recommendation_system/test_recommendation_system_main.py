@@ -1,7 +1,10 @@
+import logging
+
 import pytest
 
 import mock
 
+from recommendation_system.candidate_layer.parallel import CandidateResult
 from recommendation_system.main import RecommendationSystem
 
 
@@ -68,3 +71,74 @@ def test_RecommendationSystem_recommend_two_candidate_models_one_ranking_model(
         {"title": "title 0"},
         {"title": "title 0"},
     ]
+
+
+class MockBatchCandidateModel:
+    def __init__(self, candidate_model_name):
+        self.candidate_model_name = candidate_model_name
+        self.batches = []
+
+    def get_candidates_batch(self, features_list):
+        self.batches.append(len(features_list))
+        return [
+            [{"title": f"{self.candidate_model_name} {features['id']}"}]
+            for features in features_list
+        ]
+
+
+def test_RecommendationSystem_recommend_batch(monkeypatch):
+    models = {}
+
+    def create(candidate_model_name):
+        models[candidate_model_name] = MockBatchCandidateModel(candidate_model_name)
+        return models[candidate_model_name]
+
+    monkeypatch.setattr(
+        "recommendation_system.candidate_layer.factory.CandidateFactory.create",
+        create,
+    )
+    monkeypatch.setattr(
+        "recommendation_system.ranking_layer.factory.RankingFactory.create",
+        MockRankingModel,
+    )
+    monkeypatch.setattr(
+        RecommendationSystem,
+        "_load_experiment_config",
+        staticmethod(
+            lambda v: {
+                "candidate_models": ["odd" if int(v) % 2 else "even", "all"],
+                "ranking_model": "a",
+            }
+        ),
+    )
+    get_features = mock.Mock(side_effect=lambda ids: {i: {"id": i} for i in ids})
+    monkeypatch.setattr(RecommendationSystem, "_get_features", get_features)
+
+    results = dict(
+        RecommendationSystem.recommend_batch((str(i) for i in range(5)), batch_size=3)
+    )
+
+    assert results == {
+        str(i): [
+            {"title": f"{'odd' if i % 2 else 'even'} {i}"},
+            {"title": f"all {i}"},
+        ]
+        for i in range(5)
+    }
+    assert get_features.call_count == 2
+    assert models["all"].batches == [2, 1, 1, 1]
+
+
+def test_RecommendationSystem_record_batch_candidate_timings(caplog):
+    results = [
+        CandidateResult(
+            "a", [[{"title": "1"}], [{"title": "2"}, {"title": "3"}]], 0.01
+        ),
+        CandidateResult("b", [[], []], 0.5, timed_out=True),
+    ]
+    with caplog.at_level(logging.DEBUG, logger="recommendation_system.main"):
+        RecommendationSystem._record_batch_candidate_timings(["1", "2"], results)
+    assert [record.getMessage() for record in caplog.records] == [
+        "Candidate model a took 10.00ms for 2 recipients: 3 candidates",
+        "Candidate model b took 500.00ms for 2 recipients: 0 candidates (timed out)",
+    ]
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from recommendation_system.candidate_layer.factory import CandidateFactory
+from recommendation_system.candidate_layer.tag_index import TagIndex
+from recommendation_system.candidate_layer.tags import TagCandidateModel
+
+items = [
+    {"url": "a", "tags": ["youtube", "ML"]},
+    {"url": "b", "tags": {"ML": 0.5}},
+    {"url": "c", "tags": ["web"]},
+    {"url": "d", "tags": {"youtube": 2.0}},
+]
+
+
+def urls(results):
+    return [item["url"] for item, _ in results]
+
+
+def brute_force(items, query, k):
+    scored = [
+        (sum(query.get(tag, 0) * w for tag, w in item["tags"].items()), item["url"])
+        for item in items
+    ]
+    scored.sort(key=lambda pair: -pair[0])
+    return [(url, score) for score, url in scored[:k] if score > 0]
+
+
+def test_search():
+    index = TagIndex.build(items)
+    assert urls(index.search(["youtube", "ML"], 10)) == ["a", "d", "b"]
+    assert index.search({"youtube": 1, "ML": 2}, 2) == [
+        (items[0], 3.0),
+        (items[3], 2.0),
+    ]
+    assert index.search(["unknown"], 10) == []
+    assert index.search(None, 10) == []
+
+
+def test_early_termination_matches_brute_force():
+    rng = random.Random(0)
+    tags = [f"tag {i}" for i in range(20)]
+    many = [
+        {"url": str(i), "tags": {t: rng.random() for t in rng.sample(tags, 3)}}
+        for i in range(3000)
+    ]
+    index = TagIndex.build(many)
+    for _ in range(20):
+        query = {t: rng.random() for t in rng.sample(tags, 3)}
+        result = [(item["url"], score) for item, score in index.search(query, 10)]
+        expected = brute_force(many, query, 10)
+        assert [score for _, score in result] == pytest.approx(
+            [score for _, score in expected], rel=1e-5
+        )
+
+
+def test_add_items_and_compact():
+    index = TagIndex.build(items)
+    index.add_items([{"url": "e", "tags": {"ML": 5.0}}, {"url": "a", "tags": ["web"]}])
+    assert urls(index.search(["ML"], 10)) == ["e", "b"]
+    assert urls(index.search(["web"], 10)) == ["c", "a"]
+    assert len(index) == 5
+
+    compacted = index.compact()
+    assert urls(compacted.search(["ML"], 10)) == ["e", "b"]
+    assert len(compacted.items) == 5
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "index")
+    TagIndex.build(items).save(path)
+    index = TagIndex.load(path)
+    assert isinstance(index._positions, np.memmap)
+    assert urls(index.search(["youtube"], 10)) == ["d", "a"]
+
+
+def test_tag_candidate_model_refresh(tmp_path):
+    path = str(tmp_path / "index")
+    model = TagCandidateModel(items, top_n=2, path=path)
+    model.refresh()
+
+    loaded = TagCandidateModel(top_n=2, path=path)
+    assert [c["url"] for c in loaded.get_candidates({"tags": ["ML"]})] == ["a", "b"]
+
+    loaded.add_items([{"url": "e", "tags": {"ML": 5.0}}])
+    assert [c["url"] for c in loaded.get_candidates({"tags": ["ML"]})] == ["e", "a"]
+    loaded.refresh()
+    assert isinstance(loaded.index._positions, np.memmap)
+    assert [c["url"] for c in loaded.get_candidates({"tags": ["ML"]})] == ["e", "a"]
+    assert loaded.get_candidates({}) == []
+
+
+def test_registered():
+    assert isinstance(CandidateFactory.create("tags"), TagCandidateModel)
@@ -0,0 +1,151 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import threading
+
+import pytest
+from mock import Mock
+
+from fbmessenger.asgi import WebhookApp
+
+
+payload = {
+    "object": "page",
+    "entry": [
+        {
+            "id": 1234,
+            "time": 1457764198246,
+            "messaging": [
+                {
+                    "sender": {"id": 1234},
+                    "recipient": {"id": 1234},
+                    "message": {"text": "hello, world!"},
+                }
+            ],
+        }
+    ],
+}
+
+
+def run(app, method, path="/webhook", query=b"", body=b"", headers=None):
+    async def call():
+        sent = []
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "method": method,
+            "path": path,
+            "query_string": query,
+            "headers": headers or [],
+        }
+        app.startup()
+        await app(scope, receive, send)
+        await app.shutdown()
+        return sent[0]["status"], sent[1]["body"]
+
+    return asyncio.run(call())
+
+
+@pytest.fixture
+def messenger():
+    messenger = Mock()
+    messenger.app_secret = None
+    return messenger
+
+
+def sign(body, secret="secret"):
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return [(b"x-hub-signature-256", b"sha256=" + digest.encode())]
+
+
+def test_verify(messenger):
+    app = WebhookApp(messenger, verify_token="token")
+    query = b"hub.mode=subscribe&hub.verify_token=token&hub.challenge=42"
+    assert run(app, "GET", query=query) == (200, b"42")
+
+
+def test_verify_invalid_token(messenger):
+    app = WebhookApp(messenger, verify_token="token")
+    query = b"hub.mode=subscribe&hub.verify_token=wrong&hub.challenge=42"
+    assert run(app, "GET", query=query)[0] == 403
+
+
+def test_unknown_path(messenger):
+    app = WebhookApp(messenger, verify_token="token")
+    assert run(app, "GET", path="/other")[0] == 404
+
+
+def test_dispatch(messenger):
+    app = WebhookApp(messenger, verify_token="token")
+    status, _ = run(app, "POST", body=json.dumps(payload).encode())
+    assert status == 200
+    messenger.handle.assert_called_once_with(payload)
+
+
+def test_invalid_json(messenger):
+    app = WebhookApp(messenger, verify_token="token")
+    assert run(app, "POST", body=b"{not json")[0] == 400
+    assert not messenger.handle.called
+
+
+def test_body_too_large(messenger):
+    app = WebhookApp(messenger, verify_token="token", max_body_size=10)
+    assert run(app, "POST", body=json.dumps(payload).encode())[0] == 413
+
+
+def test_signature(messenger):
+    app = WebhookApp(messenger, verify_token="token", app_secret="secret")
+    body = json.dumps(payload).encode()
+    assert run(app, "POST", body=body, headers=sign(body))[0] == 200
+    assert run(app, "POST", body=body, headers=sign(body, "wrong"))[0] == 400
+    assert run(app, "POST", body=body)[0] == 400
+    assert messenger.handle.call_count == 1
+
+
+def test_handler_errors_are_logged(messenger, caplog):
+    messenger.handle.side_effect = RuntimeError("boom")
+    app = WebhookApp(messenger, verify_token="token")
+    assert run(app, "POST", body=json.dumps(payload).encode())[0] == 200
+    assert "Failed to handle webhook event." in caplog.text
+
+
+def test_shutdown_drains_pending_events(messenger):
+    started = threading.Event()
+    release = threading.Event()
+
+    def handle(payload):
+        started.set()
+        release.wait(5)
+
+    messenger.handle.side_effect = handle
+    app = WebhookApp(messenger, verify_token="token")
+
+    async def call():
+        events = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return events.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        app.startup()
+        future = app.dispatch(asyncio.get_running_loop(), payload)
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        threading.Timer(0.05, release.set).start()
+        await app({"type": "lifespan"}, receive, send)
+        return future, sent
+
+    future, sent = asyncio.run(call())
+    assert future.done()
+    assert sent[-1] == {"type": "lifespan.shutdown.complete"}
+    assert app.draining
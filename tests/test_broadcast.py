@@ -0,0 +1,118 @@
+import json
+
+import mock
+import pytest
+
+from fbmessenger import MessengerClient, elements
+from fbmessenger.broadcast import Broadcast, FileCheckpoint, read_recipients
+
+
+@pytest.fixture
+def client():
+    return MessengerClient(page_access_token=12345678)
+
+
+@pytest.fixture
+def mock_post(monkeypatch):
+    mock_post = mock.Mock()
+    mock_post.return_value.status_code = 200
+    monkeypatch.setattr("requests.Session.post", mock_post)
+    return mock_post
+
+
+def sent_to(mock_post):
+    return sorted(
+        json.loads(c[1]["data"])["recipient"]["id"] for c in mock_post.call_args_list
+    )
+
+
+def test_broadcast(client, mock_post):
+    reports = []
+    result = Broadcast(
+        client, elements.Text("Hello"), batch_size=2, on_batch=reports.append
+    ).run(iter(["1", "2", "3"]))
+
+    assert result.sent == 3
+    assert result.failed == 0
+    assert result.offset == 3
+    assert sent_to(mock_post) == ["1", "2", "3"]
+    assert json.loads(mock_post.call_args[1]["data"]) == {
+        "messaging_type": "UPDATE",
+        "notification_type": "REGULAR",
+        "message": {"text": "Hello"},
+        "recipient": {"id": "3"},
+    }
+    assert [(r.batch, r.offset, r.sent) for r in reports] == [(0, 2, 2), (1, 3, 1)]
+
+
+def test_broadcast_db_rows(client, mock_post):
+    Broadcast(client, {"text": "Hello"}).run([("1", "Alice"), ("2", "Bob")])
+    assert sent_to(mock_post) == ["1", "2"]
+
+
+def test_broadcast_invalid_messaging_type(client):
+    with pytest.raises(ValueError):
+        Broadcast(client, {"text": "Hello"}, messaging_type="INVALID")
+
+
+def test_broadcast_failures(client, monkeypatch):
+    def send_prepared(prepared, recipient_id, **kwargs):
+        if recipient_id == "2":
+            raise IOError("connection reset")
+        response = mock.Mock(status_code=200)
+        if recipient_id == "3":
+            response.status_code = 400
+            response.text = "bad request"
+        return response
+
+    monkeypatch.setattr(client, "send_prepared", send_prepared)
+    reports = []
+    result = Broadcast(client, {"text": "Hello"}, on_batch=reports.append).run(
+        ["1", "2", "3"]
+    )
+    assert result.sent == 1
+    assert result.failed == 2
+    assert reports[0].failures == [("2", "connection reset"), ("3", "bad request")]
+    assert result.failed_ids == ["2", "3"]
+
+
+def test_broadcast_resumes_from_checkpoint(client, mock_post, tmpdir):
+    path = str(tmpdir.join("broadcast.json"))
+    checkpoint = FileCheckpoint(path)
+    checkpoint.save(2, failed=["1"])
+
+    result = Broadcast(client, {"text": "Hello"}, checkpoint=path).run(
+        ["1", "2", "3", "4"]
+    )
+    assert result.offset == 4
+    assert result.failed_ids == ["1"]
+    assert sent_to(mock_post) == ["3", "4"]
+    # A finished broadcast clears its checkpoint, so it can be run again
+    assert checkpoint.load() == 0
+    assert checkpoint.load_failed() == []
+
+    Broadcast(client, {"text": "Hello"}, checkpoint=path).run(["1", "2"])
+    assert sent_to(mock_post) == ["1", "2", "3", "4"]
+
+
+def test_broadcast_checkpoints_failures(client, monkeypatch, tmpdir):
+    def send_prepared(prepared, recipient_id, **kwargs):
+        if recipient_id == "3":
+            raise KeyboardInterrupt
+        return mock.Mock(status_code=400 if recipient_id == "2" else 200)
+
+    monkeypatch.setattr(client, "send_prepared", send_prepared)
+    path = str(tmpdir.join("broadcast.json"))
+    with pytest.raises(KeyboardInterrupt):
+        Broadcast(client, {"text": "Hello"}, batch_size=2, checkpoint=path).run(
+            ["1", "2", "3"]
+        )
+    checkpoint = FileCheckpoint(path)
+    assert checkpoint.load() == 2
+    assert checkpoint.load_failed() == ["2"]
+
+
+def test_read_recipients(tmpdir):
+    path = tmpdir.join("recipients.txt")
+    path.write("1\n2\n\n3\n")
+    assert list(read_recipients(str(path))) == ["1", "2", "3"]
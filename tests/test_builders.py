@@ -0,0 +1,113 @@
+import logging
+
+import pytest
+
+from fbmessenger import elements, schema
+from fbmessenger.builders import build_elements, build_generic_templates, paginate
+from fbmessenger.error_messages import CHARACTER_LIMIT_MESSAGE
+from fbmessenger.templates import GenericTemplate
+
+records = [
+    {
+        "title": "Talk {}".format(i),
+        "subtitle": "R{}".format(i % 3),
+        "image_url": "https://example.com/{}.png".format(i),
+        "url": "https://tw.pycon.org/talks/{}".format(i),
+    }
+    for i in range(25)
+]
+
+
+def test_build_elements_matches_element():
+    button = elements.Button(button_type="web_url", title="Open", url="https://a.b")
+    expected = elements.Element(
+        title="Talk 0",
+        subtitle="R0",
+        image_url="https://example.com/0.png",
+        buttons=[button],
+    ).to_dict()
+    assert build_elements(records[:1], buttons=lambda record: [button]) == [expected]
+
+
+def test_build_elements_from_columns():
+    columns = {"title": ["a", "b"], "subtitle": ["A", None]}
+    assert build_elements(columns=columns) == [
+        {"title": "a", "subtitle": "A"},
+        {"title": "b"},
+    ]
+
+
+def test_build_elements_default_action():
+    element = build_elements(records[:1], default_action_key="url")[0]
+    assert element["default_action"] == {
+        "type": "web_url",
+        "url": "https://tw.pycon.org/talks/0",
+        "webview_height_ratio": "tall",
+    }
+
+
+def test_build_elements_requires_title():
+    with pytest.raises(ValueError):
+        build_elements([{"title": "a"}, {"subtitle": "b"}])
+
+
+def test_build_elements_warns_once_per_field(caplog):
+    rows = [{"title": "t" * 81, "subtitle": "s" * 81}] * 3
+    with caplog.at_level(logging.WARNING, logger="fbmessenger.builders"):
+        build_elements(rows)
+    assert caplog.record_tuples == [
+        (
+            "fbmessenger.builders",
+            logging.WARNING,
+            "3 elements: " + CHARACTER_LIMIT_MESSAGE.format(field="Title", maxsize=80),
+        ),
+        (
+            "fbmessenger.builders",
+            logging.WARNING,
+            "3 elements: "
+            + CHARACTER_LIMIT_MESSAGE.format(field="Subtitle", maxsize=80),
+        ),
+    ]
+
+
+def test_paginate():
+    assert [len(page) for page in paginate(list(range(25)))] == [10, 10, 5]
+    assert paginate([]) == []
+
+
+def test_build_generic_templates():
+    messages = build_generic_templates(records, image_aspect_ratio="square")
+    assert len(messages) == 3
+    expected = GenericTemplate(
+        elements=[
+            elements.Element(
+                title=r["title"], subtitle=r["subtitle"], image_url=r["image_url"]
+            )
+            for r in records[:10]
+        ],
+        image_aspect_ratio="square",
+    ).to_dict()
+    assert messages[0] == expected
+    assert len(messages[2]["attachment"]["payload"]["elements"]) == 5
+
+
+def test_build_generic_templates_page_size():
+    assert len(build_generic_templates(records, page_size=5)) == 5
+    with pytest.raises(ValueError):
+        build_generic_templates(records, page_size=11)
+
+
+def test_build_elements_strict():
+    with pytest.raises(schema.ValidationError):
+        build_elements([{"title": "t" * 81}], mode=schema.STRICT)
+
+
+def test_build_elements_lenient():
+    element = build_elements([{"title": "t" * 81}], mode=schema.LENIENT)[0]
+    assert element["title"] == "t" * 80
+
+
+def test_build_elements_trusted(caplog):
+    with caplog.at_level(logging.WARNING, logger="fbmessenger.builders"):
+        build_elements([{"title": "t" * 81}], mode=schema.TRUSTED)
+    assert caplog.records == []
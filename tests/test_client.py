@@ -1,3 +1,5 @@
+import json
+
 import requests
 import mock
 import pytest
@@ -5,7 +7,10 @@ import pytest
 from fbmessenger import (
     MessengerClient,
     attachments,
+    elements,
     quick_replies,
+    schema,
+    templates,
     thread_settings,
 )
 
@@ -305,6 +310,23 @@ def test_set_greeting_text(client, monkeypatch, default_params):
     )
 
 
+def test_get_messenger_profile(client, monkeypatch, default_params):
+    mock_get = mock.Mock()
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = {"data": []}
+    monkeypatch.setattr("requests.Session.get", mock_get)
+    resp = client.get_messenger_profile(["greeting", "get_started"])
+
+    assert resp == {"data": []}
+    mock_get.assert_called_with(
+        "https://graph.facebook.com/v{api_version}/me/messenger_profile".format(
+            api_version=client.api_version
+        ),
+        params=dict(default_params, fields="greeting,get_started"),
+        timeout=None,
+    )
+
+
 def test_set_greeting_text_too_long(monkeypatch):
     mock_post = mock.Mock()
     mock_post.return_value.status_code = 200
@@ -556,3 +578,91 @@ def test_auth_args_with_app_secret():
         "access_token": "1595920652850039|OxHxLwLVJkTZhEjwlHqPgxKgzRVU",
         "appsecret_proof": "577b294b975cde92b75ef73c1469c7355bd7fb5e568d522f534dc539dec65b38",
     }
+
+
+def test_send_prepared(client, monkeypatch, recipient_id, default_params):
+    mock_post = mock.Mock()
+    mock_post.return_value.status_code = 200
+    monkeypatch.setattr("requests.Session.post", mock_post)
+    prepared = client.prepare({"text": "Test message"}, "UPDATE")
+    client.send_prepared(prepared, recipient_id)
+
+    mock_post.assert_called_with(
+        "https://graph.facebook.com/v{api_version}/me/messages".format(
+            api_version=client.api_version
+        ),
+        params=default_params,
+        data=(
+            b'{"messaging_type":"UPDATE","notification_type":"REGULAR",'
+            b'"message":{"text":"Test message"},"recipient":{"id":987654321}}'
+        ),
+        headers={"Content-Type": "application/json"},
+        timeout=None,
+    )
+
+
+def test_send_payload_object(client, monkeypatch, recipient_id, default_params):
+    mock_post = mock.Mock()
+    mock_post.return_value.status_code = 200
+    monkeypatch.setattr("requests.Session.post", mock_post)
+    client.send(elements.Text("Test message"), recipient_id)
+
+    mock_post.assert_called_with(
+        "https://graph.facebook.com/v{api_version}/me/messages".format(
+            api_version=client.api_version
+        ),
+        params=default_params,
+        data=(
+            b'{"messaging_type":"RESPONSE","notification_type":"REGULAR",'
+            b'"message":{"text":"Test message"},"recipient":{"id":987654321}}'
+        ),
+        headers={"Content-Type": "application/json"},
+        timeout=None,
+    )
+
+
+def test_send_json_bytes(client, monkeypatch, recipient_id):
+    mock_post = mock.Mock()
+    mock_post.return_value.status_code = 200
+    monkeypatch.setattr("requests.Session.post", mock_post)
+    client.send(b'{"text":"Test message"}', recipient_id, "UPDATE")
+
+    body = json.loads(mock_post.call_args[1]["data"])
+    assert body["message"] == {"text": "Test message"}
+    assert body["messaging_type"] == "UPDATE"
+    assert body["recipient"] == {"id": recipient_id}
+
+
+def test_prepare_invalid_messaging_type(client):
+    with pytest.raises(ValueError):
+        client.prepare({"text": "Test message"}, "INVALID")
+
+
+def test_send_generic_template(client, monkeypatch, recipient_id, default_params):
+    mock_post = mock.Mock()
+    mock_post.return_value.status_code = 200
+    mock_post.return_value.json.return_value = {"recipient_id": recipient_id}
+    monkeypatch.setattr("requests.Session.post", mock_post)
+    element = elements.Element(title="Element", subtitle="Subtitle")
+    template = templates.GenericTemplate(elements=[element])
+    resp = client.send_generic_template(template, recipient_id, timeout=3)
+
+    assert resp == {"recipient_id": recipient_id}
+    mock_post.assert_called_with(
+        "https://graph.facebook.com/v{api_version}/me/messages".format(
+            api_version=client.api_version
+        ),
+        params=default_params,
+        json={
+            "recipient": {"id": recipient_id},
+            "message": template.to_dict(),
+        },
+        timeout=3,
+    )
+
+
+def test_prepare_validation(client):
+    with pytest.raises(schema.ValidationError):
+        client.prepare({"text": "a" * 2001}, validation=schema.STRICT)
+    prepared = client.prepare({"text": "a" * 2001}, validation=schema.LENIENT)
+    assert prepared.message == b'{"text":"' + b"a" * 2000 + b'"}'
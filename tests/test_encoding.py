@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+import json
+
+from fbmessenger import elements
+from fbmessenger.encoding import PreparedMessage, dumps, encode_recipient_id
+
+
+def test_dumps():
+    assert dumps({"text": "哈囉", "n": 1}) == '{"text":"哈囉","n":1}'.encode("utf8")
+
+
+def test_prepared_message_body():
+    prepared = PreparedMessage(elements.Text("Hello"), "UPDATE", "REGULAR")
+    assert json.loads(prepared.body("1234")) == {
+        "messaging_type": "UPDATE",
+        "notification_type": "REGULAR",
+        "message": {"text": "Hello"},
+        "recipient": {"id": "1234"},
+    }
+    assert json.loads(prepared.body(1234))["recipient"] == {"id": 1234}
+    assert json.loads(prepared.body('a"b'))["recipient"] == {"id": 'a"b'}
+
+
+def test_encode_recipient_id():
+    assert encode_recipient_id("1234") == b'"1234"'
+    assert encode_recipient_id(1234) == b"1234"
+    assert json.loads(encode_recipient_id("１２３")) == "１２３"
+    assert json.loads(encode_recipient_id(True)) is True
+    assert json.loads(encode_recipient_id("12\n")) == "12\n"
+
+
+def test_prepared_message_with_tag():
+    prepared = PreparedMessage(
+        b'{"text":"Hello"}', "MESSAGE_TAG", "REGULAR", tag="CONFIRMED_EVENT_UPDATE"
+    )
+    body = json.loads(prepared.body("1"))
+    assert body["tag"] == "CONFIRMED_EVENT_UPDATE"
+    assert body["message"] == {"text": "Hello"}
@@ -0,0 +1,91 @@
+import json
+
+import mock
+import pytest
+
+from fbmessenger.elements import Text
+from fbmessenger.localization import LocaleRegistry, UserLocaleCache
+from fbmessenger.thread_settings import GreetingText, PersistentMenu, PersistentMenuItem
+
+
+@pytest.fixture
+def registry():
+    registry = LocaleRegistry()
+    registry.add_greeting(GreetingText("Welcome!"))
+    registry.add_greeting(GreetingText("歡迎!", locale="zh_TW"))
+    registry.add_menu(
+        PersistentMenu(
+            menu_items=[
+                PersistentMenuItem(item_type="postback", title="說明", payload="help")
+            ],
+            locale="zh_TW",
+        )
+    )
+    registry.add_message("help", Text("How can I help?"))
+    registry.add_message("help", Text("需要什麼幫忙嗎?"), locale="zh_TW")
+    return registry
+
+
+def test_greeting(registry):
+    assert registry.greeting("zh_TW") == {"locale": "zh_TW", "text": "歡迎!"}
+    assert registry.greeting("en_US") == {"locale": "default", "text": "Welcome!"}
+    assert registry.greeting() == {"locale": "default", "text": "Welcome!"}
+
+
+def test_same_language_fallback(registry):
+    assert registry.greeting("zh_HK")["locale"] == "zh_TW"
+    assert json.loads(registry.message("help", "zh_CN").decode("utf8")) == {
+        "text": "需要什麼幫忙嗎?"
+    }
+
+
+def test_menu_without_default(registry):
+    assert registry.menu("zh_TW")["call_to_actions"][0]["title"] == "說明"
+    assert registry.menu("en_US") is None
+
+
+def test_messages_are_rendered_once(registry):
+    assert registry.message("help", "en_US") is registry.message("help", "en_GB")
+    with pytest.raises(KeyError):
+        registry.message("unknown", "en_US")
+
+
+def test_adding_clears_resolved_locales(registry):
+    assert registry.greeting("en_US")["locale"] == "default"
+    registry.add_greeting(GreetingText("Hi!", locale="en_US"))
+    assert registry.greeting("en_US")["locale"] == "en_US"
+    assert registry.locales == ["default", "en_US", "zh_TW"]
+
+
+def test_to_profile_dict(registry):
+    profile = registry.to_profile_dict()
+    assert [g["locale"] for g in profile["greeting"]] == ["default", "zh_TW"]
+    assert [m["locale"] for m in profile["persistent_menu"]] == ["zh_TW"]
+
+
+def test_user_locale_cache():
+    client = mock.Mock()
+    client.get_user_data.return_value = {"locale": "zh_TW", "id": "1"}
+    cache = UserLocaleCache(client, maxsize=2)
+
+    assert cache.get("1") == "zh_TW"
+    assert cache.get("1") == "zh_TW"
+    client.get_user_data.assert_called_once_with("1", fields="locale", timeout=None)
+
+    cache.set("2", "en_US")
+    cache.set("3", "en_US")
+    assert len(cache) == 2
+    assert cache.get("3") == "en_US"
+    cache.get("1")
+    assert client.get_user_data.call_count == 2
+
+
+def test_user_locale_cache_does_not_cache_errors():
+    client = mock.Mock()
+    client.get_user_data.return_value = {"error": {"message": "Unsupported"}}
+    cache = UserLocaleCache(client)
+
+    assert cache.get("1") == "default"
+    assert len(cache) == 0
+    client.get_user_data.return_value = {"locale": "zh_TW", "id": "1"}
+    assert cache.get("1") == "zh_TW"
@@ -1,4 +1,5 @@
 import copy
+import threading
 import pytest
 from mock import Mock
 
@@ -287,3 +288,22 @@ def test_upload_attachment(messenger, monkeypatch):
     res = messenger.upload_attachment(attachment)
     assert res == mock.return_value
     mock.assert_called_with(attachment, timeout=None)
+
+
+def test_last_message_is_per_thread(messenger, entry):
+    messenger.last_message = entry
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(messenger.last_message))
+    thread.start()
+    thread.join()
+    assert seen == [{}]
+    assert messenger.get_user_id() == entry["sender"]["id"]
+
+
+def test_broadcast(messenger, monkeypatch):
+    mock = Mock()
+    mock.return_value.status_code = 200
+    monkeypatch.setattr(messenger.client, "send_prepared", mock)
+    res = messenger.broadcast({"text": "message"}, ["1", "2"])
+    assert res.sent == 2
+    assert mock.call_count == 2
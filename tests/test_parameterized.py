@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import json
+
+import mock
+import pytest
+
+from fbmessenger import MessengerClient, elements, schema, templates
+from fbmessenger.broadcast import Broadcast
+from fbmessenger.parameterized import ParameterizedMessage
+
+
+@pytest.fixture
+def message():
+    return ParameterizedMessage(
+        elements.Text("Hi {first_name}, your talk in {room} starts in 10 min"),
+        fields=["first_name", "room"],
+    )
+
+
+def test_render(message):
+    res = message.render({"first_name": "小明", "room": "R1"})
+    assert json.loads(res.decode("utf8")) == {
+        "text": "Hi 小明, your talk in R1 starts in 10 min"
+    }
+
+
+def test_render_escapes_values(message):
+    res = message.render({"first_name": 'Bobby "}', "room": "R\n1"})
+    assert json.loads(res.decode("utf8"))["text"].startswith('Hi Bobby "}, ')
+
+
+def test_render_missing_value(message):
+    with pytest.raises(KeyError):
+        message.render({"first_name": "Guido"})
+
+
+def test_nested_placeholders():
+    button = elements.Button(button_type="postback", title="Join", payload="{talk}")
+    message = ParameterizedMessage(
+        templates.ButtonTemplate(text="{talk} is starting", buttons=[button]),
+        fields=["talk"],
+    )
+    res = json.loads(message.render({"talk": "Keynote"}).decode("utf8"))
+    assert res["attachment"]["payload"]["text"] == "Keynote is starting"
+    assert res["attachment"]["payload"]["buttons"][0]["payload"] == "Keynote"
+
+
+def test_dynamic_text_placeholders_are_kept():
+    message = ParameterizedMessage(
+        elements.DynamicText("Hi {{first_name}}, see you in {room}"), fields=["room"]
+    )
+    res = json.loads(message.render({"room": "R1"}).decode("utf8"))
+    assert res["dynamic_text"]["text"] == "Hi {{first_name}}, see you in R1"
+
+
+def test_validated_once():
+    with pytest.raises(schema.ValidationError):
+        ParameterizedMessage(
+            elements.Text("{name}" + "a" * 2000),
+            fields=["name"],
+            validation=schema.STRICT,
+        )
+
+
+def test_lenient_truncation_keeps_placeholders_whole():
+    message = ParameterizedMessage(
+        elements.Text("x" * 1995 + " {name}"),
+        fields=["name"],
+        validation=schema.LENIENT,
+    )
+    assert message.placeholders == ()
+    res = json.loads(message.render({"name": "Guido"}).decode("utf8"))
+    assert res["text"] == "x" * 1995 + " "
+
+
+def test_render_checks_filled_in_length():
+    message = ParameterizedMessage(
+        elements.Text("Hi {name}"), fields=["name"], validation=schema.STRICT
+    )
+    message.render({"name": "a" * 1997})
+    with pytest.raises(schema.ValidationError):
+        message.render({"name": "a" * 3011})
+
+
+def test_render_warns_on_filled_in_length(caplog):
+    message = ParameterizedMessage(elements.Text("Hi {name}"), fields=["name"])
+    message.render({"name": "a" * 3011})
+    assert "message.text is longer than 2000 characters." in caplog.text
+
+
+def test_requires_fields():
+    with pytest.raises(ValueError):
+        ParameterizedMessage(elements.Text("Hello"), fields=[])
+
+
+def test_broadcast(message, monkeypatch):
+    mock_post = mock.Mock()
+    mock_post.return_value.status_code = 200
+    monkeypatch.setattr("requests.Session.post", mock_post)
+    client = MessengerClient(page_access_token=12345678)
+
+    Broadcast(
+        client,
+        message,
+        concurrency=1,
+        values=lambda row: {"first_name": row[1], "room": "R1"},
+    ).run([("1", "Alice"), ("2", "Bob")])
+
+    bodies = [json.loads(c[1]["data"]) for c in mock_post.call_args_list]
+    assert [b["recipient"]["id"] for b in bodies] == ["1", "2"]
+    assert bodies[1]["message"] == {"text": "Hi Bob, your talk in R1 starts in 10 min"}
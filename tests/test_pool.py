@@ -0,0 +1,83 @@
+import mock
+import pytest
+
+from fbmessenger import BaseMessenger
+from fbmessenger.pool import MessengerClientPool, PageRouter
+
+
+@pytest.fixture
+def pool():
+    return MessengerClientPool(rate=10)
+
+
+def test_add_page(pool):
+    main = pool.add_page(1111, "main-token")
+    sponsors = pool.add_page("2222", "sponsors-token", app_secret="secret")
+
+    assert pool.get("1111") is main
+    assert pool[2222] is sponsors
+    assert 1111 in pool
+    assert len(pool) == 2
+    assert sorted(pool) == ["1111", "2222"]
+    assert main.auth_args == {"access_token": "main-token"}
+    assert sponsors.auth_args["access_token"] == "sponsors-token"
+    assert "appsecret_proof" in sponsors.auth_args
+
+
+def test_clients_share_session_but_not_rate_limiter(pool):
+    main = pool.add_page(1111, "main-token")
+    sponsors = pool.add_page(2222, "sponsors-token", rate=1)
+
+    assert main.session is sponsors.session is pool.session
+    assert main.rate_limiter is not sponsors.rate_limiter
+    assert main.rate_limiter.rate == 10
+    assert sponsors.rate_limiter.rate == 1
+
+
+def test_unknown_page(pool):
+    with pytest.raises(KeyError):
+        pool.get(1111)
+
+
+def test_remove_page(pool):
+    pool.add_page(1111, "main-token")
+    pool.remove_page(1111)
+    assert 1111 not in pool
+
+
+def test_send_is_rate_limited(pool, monkeypatch):
+    client = pool.add_page(1111, "main-token")
+    client.rate_limiter = mock.Mock()
+    monkeypatch.setattr("requests.Session.post", mock.Mock())
+    client.send({"text": "hello"}, 1234)
+    assert client.rate_limiter.acquire.call_count == 1
+
+
+def test_router_routes_by_page_id():
+    main = mock.Mock(spec=BaseMessenger)
+    sponsors = mock.Mock(spec=BaseMessenger)
+    router = PageRouter({1111: main, "2222": sponsors})
+    payload = {
+        "object": "page",
+        "entry": [
+            {"id": "1111", "messaging": [{"sender": {"id": 1}}]},
+            {"id": "2222", "messaging": [{"sender": {"id": 2}}]},
+            {"id": "3333", "messaging": [{"sender": {"id": 3}}]},
+        ],
+    }
+    router.handle(payload)
+    main.handle.assert_called_once_with(
+        {"object": "page", "entry": [payload["entry"][0]]}
+    )
+    sponsors.handle.assert_called_once_with(
+        {"object": "page", "entry": [payload["entry"][1]]}
+    )
+
+
+def test_messenger_uses_pooled_client(pool):
+    class Messenger(BaseMessenger):
+        account_linking = delivery = message = optin = postback = read = None
+
+    client = pool.add_page(1111, "main-token")
+    messenger = Messenger("main-token", client=client)
+    assert messenger.client is client
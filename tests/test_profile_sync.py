@@ -0,0 +1,120 @@
+import mock
+import pytest
+
+from fbmessenger import BaseMessenger, MessengerClient
+from fbmessenger.profile_sync import (
+    FileProfileCache,
+    ProfileSync,
+    diff_profile,
+    profile_hash,
+)
+from fbmessenger.thread_settings import (
+    GetStartedButton,
+    GreetingText,
+    MessengerProfile,
+)
+
+
+@pytest.fixture
+def client():
+    client = MessengerClient(page_access_token=12345678)
+    client.get_messenger_profile = mock.Mock(return_value={"data": []})
+    client.set_messenger_profile = mock.Mock(return_value={"result": "success"})
+    return client
+
+
+@pytest.fixture
+def profile():
+    return MessengerProfile(
+        greetings=[GreetingText("Hello"), GreetingText("你好", locale="zh_TW")],
+        get_started=GetStartedButton(payload="start"),
+        whitelisted_domains=["https://facebook.com/"],
+    )
+
+
+def test_diff_profile():
+    current = {
+        "greeting": [
+            {"locale": "zh_TW", "text": "你好"},
+            {"locale": "default", "text": "Hello"},
+        ],
+        "get_started": {"payload": "start"},
+        "whitelisted_domains": ["https://facebook.com/"],
+    }
+    desired = {
+        "greeting": [
+            {"locale": "default", "text": "Hello"},
+            {"locale": "zh_TW", "text": "你好"},
+        ],
+        "get_started": {"payload": "other"},
+        "whitelisted_domains": ["https://facebook.com"],
+    }
+    assert diff_profile(current, desired) == {"get_started": {"payload": "other"}}
+
+
+def test_profile_hash_is_stable():
+    assert profile_hash({"a": 1, "b": [2]}) == profile_hash({"b": [2], "a": 1})
+    assert profile_hash({"a": 1}) != profile_hash({"a": 2})
+
+
+def test_sync_sends_changed_fields_in_one_request(client, profile):
+    client.get_messenger_profile.return_value = {
+        "data": [
+            {
+                "greeting": [
+                    {"locale": "default", "text": "Hello"},
+                    {"locale": "zh_TW", "text": "你好"},
+                ],
+                "whitelisted_domains": ["https://facebook.com/"],
+            }
+        ]
+    }
+    changes = ProfileSync(client).sync(profile)
+
+    assert changes == {"get_started": {"payload": "start"}}
+    client.get_messenger_profile.assert_called_once_with(
+        ["greeting", "get_started", "whitelisted_domains"], timeout=None
+    )
+    client.set_messenger_profile.assert_called_once_with(changes, timeout=None)
+
+
+def test_sync_unchanged_profile_makes_no_requests(client, profile):
+    sync = ProfileSync(client)
+    sync.sync(profile)
+    client.get_messenger_profile.reset_mock()
+    client.set_messenger_profile.reset_mock()
+
+    assert sync.sync(profile) == {}
+    assert not client.get_messenger_profile.called
+    assert not client.set_messenger_profile.called
+
+    sync.sync(profile, force=True)
+    assert client.get_messenger_profile.called
+
+
+def test_sync_failure_is_not_cached(client, profile):
+    client.set_messenger_profile.return_value = {"error": {"message": "Invalid"}}
+    sync = ProfileSync(client)
+    sync.sync(profile)
+    sync.sync(profile)
+    assert client.set_messenger_profile.call_count == 2
+
+
+def test_sync_file_cache(client, profile, tmpdir):
+    path = str(tmpdir.join("profile.json"))
+    ProfileSync(client, cache=path).sync(profile)
+    assert FileProfileCache(path).load() == profile_hash(profile.to_dict())
+
+    client.get_messenger_profile.reset_mock()
+    assert ProfileSync(client, cache=path).sync(profile) == {}
+    assert not client.get_messenger_profile.called
+
+
+def test_sync_invalid_field(client):
+    with pytest.raises(ValueError):
+        ProfileSync(client).sync({"greetings": []})
+
+
+def test_messenger_sync_messenger_profile(client, profile):
+    messenger = BaseMessenger(page_access_token=12345678, client=client)
+    assert messenger.sync_messenger_profile(profile) == profile.to_dict()
@@ -0,0 +1,37 @@
+import pytest
+
+from fbmessenger.rate_limit import RateLimiter
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_burst_does_not_wait():
+    clock = FakeClock()
+    limiter = RateLimiter(10, burst=3, clock=clock, sleep=clock.sleep)
+    assert [limiter.acquire() for _ in range(3)] == [0, 0, 0]
+    assert clock.sleeps == []
+
+
+def test_waits_when_bucket_is_empty():
+    clock = FakeClock()
+    limiter = RateLimiter(10, burst=1, clock=clock, sleep=clock.sleep)
+    limiter.acquire()
+    assert limiter.acquire() == pytest.approx(0.1)
+    clock.now += 1
+    assert limiter.acquire() == 0
+
+
+def test_invalid_rate():
+    with pytest.raises(ValueError):
+        RateLimiter(0)
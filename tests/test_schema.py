@@ -0,0 +1,133 @@
+import logging
+
+import pytest
+
+from fbmessenger import elements, quick_replies, schema, templates, thread_settings
+
+
+@pytest.fixture
+def message():
+    buttons = [elements.Button(button_type="postback", title="b" * 25, payload="p")] * 4
+    element = elements.Element(title="t" * 90, buttons=buttons)
+    qrs = quick_replies.QuickReplies([quick_replies.QuickReply(title="q" * 25)])
+    return templates.GenericTemplate(elements=[element], quick_replies=qrs).to_dict()
+
+
+def test_valid_message_is_returned_unchanged():
+    message = elements.Text("Hello").to_dict()
+    assert schema.validate(message, schema.STRICT) is message
+
+
+def test_strict(message):
+    with pytest.raises(schema.ValidationError) as err:
+        schema.validate(message, schema.STRICT)
+    assert str(err.value) == (
+        "message.attachment.payload.elements[0].title is longer than 80 characters."
+    )
+
+
+def test_strict_text():
+    with pytest.raises(schema.ValidationError):
+        schema.validate({"text": "a" * 2001}, schema.STRICT)
+
+
+@pytest.fixture
+def mode():
+    def set_mode(mode):
+        schema.set_default_mode(mode)
+
+    yield set_mode
+    schema.set_default_mode(schema.WARN)
+
+
+def test_invalid_enum_strict():
+    with pytest.raises(schema.ValidationError):
+        schema.validate(
+            {"text": "a", "quick_replies": [{"content_type": "unknown"}]},
+            schema.STRICT,
+        )
+
+
+@pytest.mark.parametrize("validation", [schema.WARN, schema.LENIENT])
+def test_invalid_enum_warns(validation, caplog):
+    message = {"text": "a", "quick_replies": [{"content_type": "unknown"}]}
+    with caplog.at_level(logging.WARNING, logger="fbmessenger.schema"):
+        assert schema.validate(message, validation) is message
+    assert [record.getMessage() for record in caplog.records] == [
+        "Invalid message.quick_replies[0].content_type `unknown`."
+    ]
+
+
+def test_lenient(message):
+    res = schema.validate(message, schema.LENIENT)
+    element = res["attachment"]["payload"]["elements"][0]
+    assert element["title"] == "t" * 80
+    assert len(element["buttons"]) == 3
+    assert element["buttons"][0]["title"] == "b" * 20
+    assert res["quick_replies"][0]["title"] == "q" * 20
+    # The original message is not modified
+    assert len(message["attachment"]["payload"]["elements"][0]["title"]) == 90
+
+
+def test_warn(message, caplog):
+    with caplog.at_level(logging.WARNING, logger="fbmessenger.schema"):
+        assert schema.validate(message, schema.WARN) is message
+    assert len(caplog.records) == 7
+
+
+def test_trusted(message):
+    assert schema.validate(message, schema.TRUSTED) is message
+
+
+def test_default_mode(message):
+    assert schema.get_default_mode() == schema.WARN
+    schema.set_default_mode(schema.STRICT)
+    try:
+        with pytest.raises(schema.ValidationError):
+            schema.validate(message)
+    finally:
+        schema.set_default_mode(schema.WARN)
+    with pytest.raises(ValueError):
+        schema.set_default_mode("unknown")
+
+
+def test_enums_are_sets():
+    assert isinstance(elements.Button.BUTTON_TYPES, frozenset)
+    assert isinstance(quick_replies.QuickReply.CONTENT_TYPES, frozenset)
+    assert isinstance(elements.WEBVIEW_HEIGHT_RATIOS, frozenset)
+
+
+def test_trusted_constructors_skip_checks(mode, caplog):
+    mode(schema.TRUSTED)
+    with caplog.at_level(logging.WARNING):
+        button = elements.Button(button_type="unknown", title="b" * 25)
+        elements.Element(title="t" * 90, subtitle="s" * 90)
+        quick_replies.QuickReply(title="q" * 25, content_type="unknown")
+        thread_settings.GreetingText(text="g" * 161)
+        thread_settings.PersistentMenuItem(item_type="postback", title="m" * 31)
+    assert button.to_dict() == {"type": "unknown", "title": "b" * 25}
+    assert caplog.records == []
+
+
+def test_strict_constructors_raise(mode):
+    mode(schema.STRICT)
+    with pytest.raises(schema.ValidationError):
+        elements.Button(button_type="postback", title="b" * 25)
+    with pytest.raises(schema.ValidationError):
+        elements.Element(title="t" * 90)
+    with pytest.raises(schema.ValidationError):
+        quick_replies.QuickReply(title="q" * 25)
+    element = elements.Element(title="Title")
+    with pytest.raises(schema.ValidationError):
+        element.subtitle = "s" * 90
+
+
+def test_lenient_constructors_leave_lengths_to_validate(mode, caplog):
+    mode(schema.LENIENT)
+    with caplog.at_level(logging.WARNING):
+        element = elements.Element(title="t" * 90)
+    assert caplog.records == []
+    res = schema.validate(templates.GenericTemplate(elements=[element]).to_dict())
+    assert res["attachment"]["payload"]["elements"][0]["title"] == "t" * 80
+    with pytest.raises(ValueError):
+        elements.Button(button_type="unknown")
@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+from fbmessenger import (
+    attachments,
+    encoding,
+    sender_actions,
+    elements,
+    quick_replies,
+    templates,
+    thread_settings,
+)
+
+
+@pytest.fixture
+def button():
+    return elements.Button(
+        button_type="web_url", title="Web button", url="http://facebook.com"
+    )
+
+
+@pytest.fixture
+def element(button):
+    return elements.Element(title="Title", subtitle="Subtitle", buttons=[button])
+
+
+class TestCachedSerializable:
+    def test_to_dict_is_cached(self, element):
+        assert element.to_dict() is element.to_dict()
+        assert not element.frozen
+
+    def test_setter_changes_dict(self, element):
+        rendered = element.to_dict()
+        element.title = "New title"
+        assert element.to_dict()["title"] == "New title"
+        assert rendered["title"] == "Title"
+
+    @pytest.mark.parametrize(
+        "name, value",
+        [("item_url", "http://facebook.com"), ("subtitle", "New subtitle")],
+    )
+    def test_field_setters_change_dict(self, element, name, value):
+        element.to_dict()
+        setattr(element, name, value)
+        assert element.to_dict()[name] == value
+
+    def test_reassigned_children_change_parent(self, element, button):
+        template = templates.GenericTemplate(elements=[element])
+        template.to_dict()
+        element.buttons = [button, button]
+        rendered = template.to_dict()["attachment"]["payload"]["elements"][0]
+        assert len(rendered["buttons"]) == 2
+
+    def test_child_change_changes_parent(self, element, button):
+        template = templates.GenericTemplate(elements=[element])
+        template.to_dict()
+        button.title = "New title"
+        rendered = template.to_dict()["attachment"]["payload"]["elements"][0]
+        assert rendered["buttons"][0]["title"] == "New title"
+
+    def test_quick_replies_freeze(self):
+        qrs = quick_replies.QuickReplies([quick_replies.QuickReply(title="QR")])
+        text = elements.Text("Hello", quick_replies=qrs).freeze()
+        assert text.to_dict() is text.to_dict()
+        assert qrs.quick_replies[0].frozen
+        assert isinstance(qrs.quick_replies, tuple)
+
+    def test_freeze(self, element, button):
+        template = templates.GenericTemplate(elements=[element]).freeze()
+        assert template.frozen
+        assert element.frozen
+        assert button.frozen
+        with pytest.raises(AttributeError):
+            element.title = "New title"
+        with pytest.raises(AttributeError):
+            button.title = "New title"
+        with pytest.raises(AttributeError):
+            del button.title
+        assert template.to_dict() is template.to_dict()
+        assert template.elements == (element,)
+        assert element.buttons == (button,)
+        with pytest.raises(AttributeError):
+            element.buttons.append(button)
+        assert isinstance(template, templates.GenericTemplate)
+        assert type(template).__name__ == "GenericTemplate"
+
+    def test_to_json_bytes(self, element):
+        assert json.loads(element.to_json_bytes()) == element.to_dict()
+        element.freeze()
+        assert element.to_json_bytes() is element.to_json_bytes()
+
+    def test_write_json_reuses_buffer(self, element):
+        buffer = bytearray()
+        written = element.write_json(buffer)
+        assert written == len(buffer)
+        assert json.loads(bytes(buffer)) == element.to_dict()
+        del buffer[:]
+        element.write_json(buffer)
+        assert json.loads(bytes(buffer)) == element.to_dict()
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        attachments.Image(url="http://facebook.com/image.jpg"),
+        thread_settings.GreetingText(text="Hello"),
+        sender_actions.SenderAction(sender_action="typing_on"),
+        elements.Summary(total_cost=10),
+    ],
+)
+def test_to_json_bytes(obj):
+    assert json.loads(obj.to_json_bytes()) == obj.to_dict()
+    buffer = bytearray(b"[")
+    obj.write_json(buffer)
+    assert json.loads(bytes(buffer[1:])) == obj.to_dict()
+
+
+def test_dumps_without_orjson(monkeypatch):
+    monkeypatch.setattr(encoding, "orjson", None)
+    obj = {"text": "\u4f60\u597d", "n": [1, 2]}
+    assert encoding.dumps(obj) == json.dumps(
+        obj, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf8")
+    buffer = bytearray()
+    assert encoding.dumps_into(obj, buffer) == len(encoding.dumps(obj))
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        elements.Text("Hello"),
+        elements.Button(button_type="postback", payload="payload"),
+        elements.Element(title="Title"),
+        quick_replies.QuickReply(title="QR"),
+        attachments.Image(url="http://facebook.com/image.jpg"),
+        thread_settings.GreetingText(text="Hello"),
+        thread_settings.PersistentMenu(composer_input_disabled=False),
+    ],
+)
+def test_payload_objects_are_slotted(obj):
+    assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        obj.unknown = True
@@ -0,0 +1,126 @@
+import json
+
+import mock
+import pytest
+
+from fbmessenger import MessengerClient, elements, quick_replies, splitting
+
+
+@pytest.fixture
+def qrs():
+    return quick_replies.QuickReplies([quick_replies.QuickReply(title="More")])
+
+
+def test_text_size():
+    assert splitting.text_size("abc") == (3, 3)
+    assert splitting.text_size("你好") == (2, 6)
+
+
+def test_payload_size():
+    text = elements.Text("你好")
+    assert splitting.payload_size(text) == len(
+        json.dumps({"text": "你好"}, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf8"
+        )
+    )
+    assert splitting.payload_size({"text": "你好"}) == splitting.payload_size(text)
+
+
+def test_split_text_at_line_breaks():
+    text = "\n".join(["a" * 6] * 3)
+    assert splitting.split_text(text, limit=10) == ["a" * 6] * 3
+
+
+def test_split_text_at_separator_right_after_limit():
+    text = "a" * 5 + "\n" + "b" * 5
+    assert splitting.split_text(text, limit=5) == ["a" * 5, "b" * 5]
+    assert splitting.split_text("aaaaa bbbbb", limit=5) == ["aaaaa", "bbbbb"]
+
+
+def test_split_text_strips_leading_whitespace():
+    assert splitting.split_text("aaa\n\n  bbb", limit=5) == ["aaa", "bbb"]
+
+
+def test_split_text_at_cjk_punctuation():
+    text = "你好。" * 4
+    chunks = splitting.split_text(text, limit=7)
+    assert chunks == ["你好。你好。", "你好。你好。"]
+    assert all(len(chunk) <= 7 for chunk in chunks)
+
+
+def test_split_text_at_spaces_and_hard_limit():
+    assert splitting.split_text("aaa bbb ccc", limit=8) == ["aaa bbb", "ccc"]
+    assert splitting.split_text("a" * 25, limit=10) == ["a" * 10, "a" * 10, "a" * 5]
+    assert splitting.split_text("short") == ["short"]
+
+
+def test_split_text_hard_limit_keeps_characters_whole():
+    assert (
+        splitting.split_text("\U0001f64f\U0001f3fc" * 3, 3)
+        == ["\U0001f64f\U0001f3fc"] * 3
+    )
+    family = "\U0001f468\u200d\U0001f469\u200d\U0001f467"
+    assert splitting.split_text("ab" + family, 5) == ["ab", family]
+    assert splitting.split_text("cafe\u0301s", 4) == ["caf", "e\u0301s"]
+    # A single character over the limit is cut anyway
+    assert splitting.split_text(family, 2) == [family[:2], family[2:4], family[4:]]
+
+
+def test_split_message_text(qrs):
+    text = elements.Text("字" * 4500, quick_replies=qrs)
+    messages = splitting.split_message(text)
+    assert [len(m["text"]) for m in messages] == [2000, 2000, 500]
+    assert "quick_replies" not in messages[0]
+    assert messages[-1]["quick_replies"] == qrs.to_dict()
+
+
+def test_split_message_template():
+    element = {"title": "Title"}
+    message = {
+        "attachment": {
+            "type": "template",
+            "payload": {
+                "template_type": "generic",
+                "sharable": False,
+                "elements": [element] * 23,
+            },
+        }
+    }
+    messages = splitting.split_message(message)
+    assert [len(m["attachment"]["payload"]["elements"]) for m in messages] == [
+        10,
+        10,
+        3,
+    ]
+    assert all(not m["attachment"]["payload"]["sharable"] for m in messages)
+    assert len(message["attachment"]["payload"]["elements"]) == 23
+
+
+def test_split_message_within_limits():
+    message = {"text": "Hello"}
+    assert splitting.split_message(message) == [message]
+
+
+def test_split_carousel(qrs):
+    items = [elements.Element(title=str(i)) for i in range(12)]
+    templates = splitting.split_carousel(items, quick_replies=qrs, sharable=True)
+    assert [len(t.elements) for t in templates] == [10, 2]
+    assert templates[0].quick_replies is None
+    assert templates[1].quick_replies is qrs
+    assert templates[1].to_dict()["attachment"]["payload"]["sharable"]
+    with pytest.raises(ValueError):
+        splitting.split_carousel(items, page_size=11)
+
+
+def test_send_split(monkeypatch):
+    mock_post = mock.Mock()
+    mock_post.return_value.status_code = 200
+    monkeypatch.setattr("requests.Session.post", mock_post)
+    client = MessengerClient(page_access_token=12345678)
+
+    responses = client.send_split({"text": "a" * 2001}, 1234)
+    assert len(responses) == 2
+    assert [c[1]["json"]["message"]["text"] for c in mock_post.call_args_list] == [
+        "a" * 2000,
+        "a",
+    ]
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from fbmessenger import attachments
@@ -439,3 +441,28 @@ class TestTemplates:
         bad_attachment = attachments.File(url="https://some/file.doc")
         with pytest.raises(ValueError):
             templates.MediaTemplate(bad_attachment)
+
+    def test_template_changes_are_not_kept_between_renders(self):
+        qr = quick_replies.QuickReply(title="QR", payload="QR payload")
+        qrs = quick_replies.QuickReplies(quick_replies=[qr])
+        element = elements.Element(title="Element")
+        res = templates.GenericTemplate(
+            elements=[element], quick_replies=qrs, image_aspect_ratio="square"
+        )
+        first = res.to_dict()
+        res.quick_replies = None
+        res.image_aspect_ratio = None
+        second = res.to_dict()
+
+        assert "quick_replies" in first
+        assert first["attachment"]["payload"]["image_aspect_ratio"] == "square"
+        assert "quick_replies" not in second
+        assert "image_aspect_ratio" not in second["attachment"]["payload"]
+
+    def test_template_can_be_rendered_concurrently(self):
+        element = elements.Element(title="Element")
+        res = templates.GenericTemplate(elements=[element]).freeze()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: res.to_dict(), range(20)))
+        assert all(result is results[0] for result in results)
+        assert results[0]["attachment"]["payload"]["elements"] == [{"title": "Element"}]
@@ -23,6 +23,13 @@ class TestThreadSettings:
         expected = {"get_started": {"payload": "payload"}}
         assert expected == profile.to_dict()
 
+    def test_whitelisted_domains(self):
+        profile = thread_settings.MessengerProfile(
+            whitelisted_domains=["https://facebook.com/"]
+        )
+        expected = {"whitelisted_domains": ["https://facebook.com/"]}
+        assert expected == profile.to_dict()
+
     def test_persistent_menu_item_web_url(self):
         res = thread_settings.PersistentMenuItem(
             item_type="web_url", title="Link", url="https://facebook.com"